@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from perf import PERF
+
+# --- UI Bridge ---
+# Background threads (asyncio loop, glow executor, mouse hook, tray) never
+# touch Tk directly: they post calls here, and the Tk thread runs them in
+# bounded batches. The other direction goes through the loop's own
+# thread-safe entry point with the same latency accounting.
+
+HIGH = 0    # user-visible reactions (rollbacks, hover, tray)
+NORMAL = 1  # media, art and glow updates
+
+
+class UIBridge:
+    """Cross-thread call queue drained on the Tk thread.
+
+    `post` is safe from any thread and only holds a lock for a deque append.
+    Posts with a `key` replace a queued call with the same key (a stale media
+    update is never worth running). `wake` is called once per batch, when the
+    queue goes from empty to non-empty, so the host can schedule a drain. It
+    runs on the posting thread; if it fails, the next drain (e.g. a periodic
+    frame tick) re-arms it.
+    Posts made on `inline_thread` (set when the Tk thread also runs the
+    asyncio loop) are already where they need to be and run immediately.
+    """
+    def __init__(self, wake=None, max_batch=32, budget_ms=4.0, clock=time.perf_counter):
+        self.wake = wake
+        self.max_batch = max_batch
+        self.budget_ms = budget_ms
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._queues = (deque(), deque())
+        self._keyed = {}
+        self._wake_pending = False
+        self.inline_thread = None
+        self.posted = 0
+        self.coalesced = 0
+        self.ran = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self):
+        return len(self._queues[HIGH]) + len(self._queues[NORMAL])
+
+    def post(self, fn, *args, priority=NORMAL, key=None):
+        if self.inline_thread is not None and threading.get_ident() == self.inline_thread:
+            self.posted += 1
+            self.ran += 1
+            fn(*args)
+            return
+        wake = False
+        with self._lock:
+            self.posted += 1
+            if key is not None:
+                queued = self._keyed.get(key)
+                if queued is not None:
+                    # Keep its place in line and its timestamp; latency is the oldest wait
+                    queued[0], queued[1] = fn, args
+                    self.coalesced += 1
+                    return
+            entry = [fn, args, self.clock(), key]
+            if key is not None:
+                self._keyed[key] = entry
+            self._queues[priority].append(entry)
+            depth = self.depth
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if not self._wake_pending:
+                self._wake_pending = wake = True
+        if wake and self.wake:
+            try:
+                self.wake()
+            except Exception:
+                pass # Host not ready (e.g. mainloop not running yet); the frame tick drains
+
+    def drain(self):
+        """Runs up to max_batch queued calls (HIGH first) within budget_ms.
+
+        Call on the Tk thread. Returns True if calls are still queued.
+        """
+        t0 = self.clock()
+        with self._lock:
+            self._wake_pending = False
+        PERF.record("bridge_depth", self.depth)
+        n = 0
+        while n < self.max_batch:
+            with self._lock:
+                q = self._queues[HIGH] or self._queues[NORMAL]
+                if not q:
+                    break
+                fn, args, posted_at, key = q.popleft()
+                if key is not None:
+                    self._keyed.pop(key, None)
+            PERF.record("bridge_latency", (self.clock() - posted_at) * 1000.0)
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"UI bridge call {getattr(fn, '__name__', fn)} failed: {e}")
+            n += 1
+            if (self.clock() - t0) * 1000.0 > self.budget_ms:
+                break
+        self.ran += n
+        if n:
+            PERF.record("bridge_batch", n)
+        return self.depth > 0
+
+    def to_loop(self, loop, coro_func):
+        """Starts coro_func() on `loop` from the Tk thread; records the hop latency."""
+        posted_at = self.clock()
+        async def run():
+            PERF.record("loop_latency", (self.clock() - posted_at) * 1000.0)
+            res = coro_func()
+            if asyncio.iscoroutine(res):
+                return await res
+            return res
+        return asyncio.run_coroutine_threadsafe(run(), loop)
+
+    def report(self):
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "posted": self.posted,
+            "coalesced": self.coalesced,
+            "ran": self.ran,
+        }
@@ -0,0 +1,223 @@
+import asyncio
+import threading
+import time
+
+# --- Optimistic Transport State ---
+# A click shows its expected result on the next frame; the session's real
+# state, read by the media poll up to 500ms later, then either confirms it or
+# rolls it back.
+
+PLAYING = 4  # GlobalSystemMediaTransportControlsSessionPlaybackStatus
+PAUSED = 5
+
+
+class Pending:
+    def __init__(self, kind, before, expected, deadline):
+        self.kind = kind          # "status" (play/pause) or "track" (next/prev)
+        self.before = before      # what to roll back to
+        self.expected = expected  # what we are showing meanwhile (None = "anything but before")
+        self.deadline = deadline
+
+
+class TransportState:
+    """Tracks in-flight transport commands and reconciles them with real state.
+
+    Polls that arrive before `timeout` and still show the old state are
+    assumed to predate the command and are masked; after that the real state
+    wins and the command counts as ignored.
+    """
+    def __init__(self, timeout=1.5, clock=time.perf_counter):
+        self.timeout = timeout
+        self.clock = clock
+        self.pending = {}
+        self.confirms = 0
+        self.rollbacks = 0
+
+    def _begin(self, kind, before, expected):
+        # A second click before the first resolved keeps the original rollback point
+        prev = self.pending.get(kind)
+        if prev is not None:
+            before = prev.before
+        self.pending[kind] = Pending(kind, before, expected, self.clock() + self.timeout)
+
+    def toggle(self, status):
+        """Play/pause pressed while showing `status`. Returns the status to show now."""
+        expected = PAUSED if status == PLAYING else PLAYING
+        prev = self.pending.get("status")
+        if prev is not None and expected == prev.before:
+            # Toggled back to where we started: nothing left to wait for
+            del self.pending["status"]
+            return expected
+        self._begin("status", status, expected)
+        return expected
+
+    def skip(self, track_key):
+        """Next/prev pressed on `track_key`; the text slides out until the new track lands."""
+        self._begin("track", track_key, None)
+
+    def is_pending(self, kind):
+        return kind in self.pending
+
+    def failed(self, kind):
+        """The command errored or the session refused it. Returns the Pending to undo."""
+        p = self.pending.pop(kind, None)
+        if p is not None:
+            self.rollbacks += 1
+        return p
+
+    def reconcile_status(self, real):
+        """Status to display for a polled `real` status."""
+        p = self.pending.get("status")
+        if p is None:
+            return real
+        if real == p.expected:
+            del self.pending["status"]
+            self.confirms += 1
+            return real
+        if self.clock() < p.deadline:
+            return p.expected
+        del self.pending["status"]
+        self.rollbacks += 1
+        return real
+
+    def seek(self, target):
+        """Seek sent: the position clock jumps to `target` until a poll agrees."""
+        self.pending["position"] = Pending("position", None, (target, self.clock()), self.clock() + self.timeout)
+
+    def reconcile_position(self, pos, playing, tolerance=1.5):
+        """Position to display for a polled `pos` (seconds)."""
+        p = self.pending.get("position")
+        if p is None or pos is None:
+            return pos
+        target, t0 = p.expected
+        now = self.clock()
+        expected = target + (now - t0 if playing else 0.0)
+        if abs(pos - expected) <= tolerance:
+            del self.pending["position"]
+            self.confirms += 1
+            return pos
+        if now < p.deadline:
+            return expected
+        del self.pending["position"]
+        self.rollbacks += 1
+        return pos
+
+    def reconcile_track(self, track_key):
+        """None (nothing pending), "pending", "confirmed" or "rolled_back"."""
+        p = self.pending.get("track")
+        if p is None:
+            return None
+        if track_key != p.before:
+            del self.pending["track"]
+            self.confirms += 1
+            return "confirmed"
+        if self.clock() < p.deadline:
+            return "pending"
+        del self.pending["track"]
+        self.rollbacks += 1
+        return "rolled_back"
+
+
+# --- Command Dispatcher ---
+# Transport input from any source (buttons, Shift+wheel, flicks, seek bar) is
+# folded into at most one pending command per kind; one coroutine drains them
+# one at a time, so the session never sees overlapping requests.
+
+class CommandDispatcher:
+    """Coalesces transport commands and sends them one at a time.
+
+    - play_pause: presses within `toggle_window` of each other collapse by
+      parity (a double click sends nothing)
+    - skip: +1/-1 presses sum to one "skip N" (next then prev cancels out)
+    - seek: latest target wins; a later skip drops it. Sends are spaced at
+      least `seek_interval` apart, so a live scrub streams a few seeks per
+      second instead of one per motion event. A target equal to the last one
+      sent is dropped only within the same scrub (seeks less than `scrub_gap`
+      apart); a later seek to the same spot is sent
+
+    submit() is called from the UI thread and returns True when the caller
+    must start drain() on the event loop; otherwise a drain is already
+    running and will pick the command up (back-pressure).
+    """
+    def __init__(self, execute, toggle_window=0.15, seek_interval=0.1, scrub_gap=0.5, clock=time.perf_counter):
+        self.execute = execute  # async (kind, value)
+        self.toggle_window = toggle_window
+        self.seek_interval = seek_interval
+        self.scrub_gap = scrub_gap
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.toggles = 0
+        self.last_toggle = 0.0
+        self.skips = 0
+        self.skip_pressed = False
+        self.seek = None
+        self.last_seek = None  # (target, sent at) within the current scrub
+        self.last_seek_submit = None
+        self.busy = False
+        self.submitted = 0
+        self.sent = {}
+
+    def submit(self, kind, value=None):
+        with self._lock:
+            self.submitted += 1
+            if kind == "play_pause":
+                self.toggles += 1
+                self.last_toggle = self.clock()
+            elif kind == "skip":
+                self.skips += value
+                self.skip_pressed = True
+                self.seek = None  # Position on the old track no longer matters
+                self.last_seek = None
+            elif kind == "seek":
+                now = self.clock()
+                if self.last_seek_submit is None or now - self.last_seek_submit > self.scrub_gap:
+                    self.last_seek = None  # New scrub: earlier targets are not duplicates
+                self.last_seek_submit = now
+                self.seek = value
+            start = not self.busy
+            self.busy = True
+        return start
+
+    def take(self):
+        """Next command to send as (kind, value), a delay in s to wait, or None when idle."""
+        with self._lock:
+            if self.skip_pressed:
+                n, self.skips, self.skip_pressed = self.skips, 0, False
+                return ("skip", n)
+            if self.toggles:
+                wait = self.last_toggle + self.toggle_window - self.clock()
+                if wait > 0:
+                    return wait
+                odd, self.toggles = self.toggles % 2, 0
+                if odd:
+                    return ("play_pause", None)
+            if self.seek is not None:
+                now = self.clock()
+                if self.last_seek is not None:
+                    if self.seek == self.last_seek[0]:
+                        self.seek = None # Release landed where the scrub already was
+                        self.busy = False
+                        return None
+                    wait = self.last_seek[1] + self.seek_interval - now
+                    if wait > 0:
+                        return wait
+                target, self.seek = self.seek, None
+                self.last_seek = (target, now)
+                return ("seek", target)
+            self.busy = False
+            return None
+
+    async def drain(self):
+        while True:
+            cmd = self.take()
+            if cmd is None:
+                return
+            if not isinstance(cmd, tuple):
+                await asyncio.sleep(cmd)
+                continue
+            kind, value = cmd
+            self.sent[kind] = self.sent.get(kind, 0) + 1
+            try:
+                await self.execute(kind, value)
+            except Exception as e:
+                print(f"Command {kind} failed: {e}")
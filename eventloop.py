@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import threading
+import time
+
+from perf import PERF
+
+# --- Integrated Event Loop ---
+# Optional single-threaded mode: the asyncio loop gets no thread of its own and
+# is stepped by the widget's scheduler on the Tk thread, so coroutines and Tk
+# callbacks never run concurrently. Only blocking work (image decode, blur)
+# leaves the thread, through a worker pool.
+
+
+class WakeableEventLoop(asyncio.SelectorEventLoop):
+    """Calls `on_wake` whenever work is scheduled from another thread.
+
+    WinRT completions and executor results arrive through
+    call_soon_threadsafe; without the hook a stepped loop would only notice
+    them at its next timer.
+    """
+    on_wake = None
+
+    def call_soon_threadsafe(self, callback, *args, context=None):
+        handle = super().call_soon_threadsafe(callback, *args, context=context)
+        wake = self.on_wake
+        if wake is not None:
+            wake()
+        return handle
+
+
+class LoopDriver:
+    """Runs `loop` one iteration at a time; `step` is a scheduler task.
+
+    A step runs the ready callbacks and due timers and polls I/O without
+    blocking, then returns the delay in ms until the loop's next timer,
+    capped at `max_delay` so socket readiness is still noticed.
+    """
+    def __init__(self, loop, max_delay=100):
+        self.loop = loop
+        self.max_delay = max_delay
+        self.steps = 0
+
+    def step(self):
+        loop = self.loop
+        if loop.is_closed():
+            return self.max_delay
+        if loop.is_running():
+            return 0 # Re-entered from a nested Tk update; the outer step is still going
+        t0 = time.perf_counter()
+        loop.stop()       # stop() before run_forever() = exactly one iteration,
+        loop.run_forever() # with a zero select timeout
+        PERF.record("loop_step", (time.perf_counter() - t0) * 1000.0)
+        self.steps += 1
+        return self.next_delay()
+
+    def next_delay(self):
+        # Peeks at CPython's loop queues; other loops just poll at max_delay
+        loop = self.loop
+        if getattr(loop, "_ready", None):
+            return 0
+        scheduled = getattr(loop, "_scheduled", None)
+        if scheduled:
+            return max(0, min(self.max_delay, int((scheduled[0].when() - loop.time()) * 1000)))
+        return self.max_delay
+
+    def close(self):
+        loop = self.loop
+        if loop.is_closed() or loop.is_running():
+            return
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        loop.stop()
+        loop.run_forever() # Let the cancellations unwind
+        loop.close()
+
+    def report(self):
+        return {"steps": self.steps}
+
+
+# --- Benchmark: threaded vs integrated ---
+# `python eventloop.py` runs the widget's round trip (Tk thread -> coroutine ->
+# simulated WinRT completion on a foreign thread -> result back on the Tk
+# thread) under a 60 fps frame task, once per design, and prints latency and
+# CPU. No Tk needed: _BenchHost stands in for after()/mainloop().
+
+class _BenchHost:
+    """Thread-safe after()/after_cancel()/mainloop() with Tk's semantics."""
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._cancelled = set()
+        self.running = False
+
+    def after(self, ms, fn, *args):
+        with self._cond:
+            self._seq += 1
+            heapq.heappush(self._heap, (time.perf_counter() + ms / 1000.0, self._seq, fn, args))
+            self._cond.notify()
+            return self._seq
+
+    def after_cancel(self, job):
+        with self._cond:
+            self._cancelled.add(job)
+
+    def mainloop(self, seconds):
+        end = time.perf_counter() + seconds
+        self.running = True
+        while self.running:
+            with self._cond:
+                now = time.perf_counter()
+                if now >= end:
+                    break
+                if not self._heap or self._heap[0][0] > now:
+                    wait = end - now if not self._heap else min(end, self._heap[0][0]) - now
+                    self._cond.wait(wait)
+                    continue
+                _, seq, fn, args = heapq.heappop(self._heap)
+                if seq in self._cancelled:
+                    self._cancelled.discard(seq)
+                    continue
+            fn(*args)
+
+
+class _ForeignCompleter:
+    """Completes futures from its own thread, like a WinRT async operation."""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = []
+        self._running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def complete(self, loop):
+        fut = loop.create_future()
+        with self._cond:
+            self._pending.append(fut)
+            self._cond.notify()
+        return fut
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                fut = self._pending.pop(0)
+            fut.get_loop().call_soon_threadsafe(lambda f=fut: f.done() or f.set_result(None))
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+
+def _bench(integrated, seconds=3.0, interval_ms=20):
+    from bridge import UIBridge, HIGH
+    from scheduler import Scheduler
+    from perf import Histogram
+
+    host = _BenchHost()
+    scheduler = Scheduler(host.after, host.after_cancel)
+    bridge = UIBridge(wake=lambda: host.after(0, bridge.drain))
+    foreign = _ForeignCompleter()
+    latency = Histogram()
+
+    if integrated:
+        loop = WakeableEventLoop()
+        bridge.inline_thread = threading.get_ident()
+        loop.on_wake = lambda: bridge.post(scheduler.poke, "asyncio", priority=HIGH, key="loop_wake")
+        driver = LoopDriver(loop)
+        scheduler.add("asyncio", driver.step, driver.max_delay)
+    else:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+    def done(t0):
+        latency.add((time.perf_counter() - t0) * 1000.0)
+
+    async def poll(t0):
+        await foreign.complete(loop)
+        bridge.post(done, t0)
+
+    def request():
+        t0 = time.perf_counter()
+        bridge.to_loop(loop, lambda: poll(t0))
+
+    def frame():
+        sum(i * i for i in range(200)) # stand-in for a layout pass
+
+    scheduler.add("frame", frame, 16)
+    scheduler.add("request", request, interval_ms)
+    scheduler.start()
+
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    host.mainloop(seconds)
+    cpu = (time.process_time() - cpu0) / (time.perf_counter() - wall0) * 100.0
+    scheduler.stop()
+    foreign.stop()
+    if integrated:
+        driver.close()
+    else:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(1.0)
+        loop.close()
+    return latency.summary(), cpu
+
+
+if __name__ == "__main__":
+    for name, integrated in (("threaded", False), ("integrated", True)):
+        summary, cpu = _bench(integrated)
+        print(f"{name:>10}: round trip p50 {summary['p50']:.3f} p95 {summary['p95']:.3f} "
+              f"p99 {summary['p99']:.3f} ms over {summary['count']} polls, cpu {cpu:.1f}%")
@@ -0,0 +1,156 @@
+from array import array
+
+# --- Gesture Recognition ---
+# Press/move/release samples in, gestures out. No Tk, no clocks of its own:
+# every call carries its timestamp, so synthetic traces replay exactly.
+
+TAP = "tap"
+FLICK = "flick"
+LONG_PRESS = "long_press"
+SCRUB = "scrub"
+
+
+class SampleRing:
+    """Fixed-size ring of (x, y, t) samples in preallocated arrays."""
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.xs = array('d', [0.0]) * capacity
+        self.ys = array('d', [0.0]) * capacity
+        self.ts = array('d', [0.0]) * capacity
+        self.head = 0   # next write slot
+        self.size = 0
+
+    def clear(self):
+        self.head = 0
+        self.size = 0
+
+    def push(self, x, y, t):
+        i = self.head
+        self.xs[i] = x
+        self.ys[i] = y
+        self.ts[i] = t
+        self.head = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def latest(self):
+        i = (self.head - 1) % self.capacity
+        return self.xs[i], self.ys[i], self.ts[i]
+
+    def velocity(self, window):
+        """Least-squares slope of x(t) and y(t) over the last `window` seconds, in px/s."""
+        if self.size < 2:
+            return 0.0, 0.0
+        cap = self.capacity
+        t_end = self.ts[(self.head - 1) % cap]
+        n = 0
+        st = sx = sy = stt = stx = sty = 0.0
+        for k in range(1, self.size + 1):
+            i = (self.head - k) % cap
+            t = self.ts[i] - t_end  # relative time keeps the sums well conditioned
+            if t < -window and n >= 2:
+                break
+            x, y = self.xs[i], self.ys[i]
+            n += 1
+            st += t
+            sx += x
+            sy += y
+            stt += t * t
+            stx += t * x
+            sty += t * y
+        denom = n * stt - st * st
+        if n < 2 or denom <= 1e-12:
+            return 0.0, 0.0
+        return (n * stx - st * sx) / denom, (n * sty - st * sy) / denom
+
+
+class GestureRecognizer:
+    """Recognises taps, horizontal flicks, long presses and scrubs.
+
+    Call press() with the area that was hit ("art" or "seek"), then move(),
+    release() and, while held, poll() from a timer for long presses. Each
+    returns a (kind, value) tuple when a gesture fires, else None:
+
+    - (FLICK, +1/-1): fast horizontal swipe on the art, decided by the
+      regressed velocity, so a flick that starts slowly still counts
+    - (LONG_PRESS, area): held still for `long_press` seconds
+    - (SCRUB, x): horizontal drag on the seek bar, x in press coordinates
+    - (TAP, area): released without moving or holding
+    """
+    def __init__(self, flick_speed=900.0, flick_distance=40.0, long_press=0.5,
+                 slop=8.0, window=0.08, capacity=32):
+        self.flick_speed = flick_speed        # px/s horizontal
+        self.flick_distance = flick_distance  # px travelled since press
+        self.long_press = long_press          # s
+        self.slop = slop                      # px of jitter still counted as "still"
+        self.window = window                  # s of samples used for velocity
+        self.ring = SampleRing(capacity)
+        self.area = None
+        self.origin = (0.0, 0.0, 0.0)
+        self.moved = False
+        self.fired = None  # gesture already recognised for this press
+
+    @property
+    def active(self):
+        return self.area is not None
+
+    def press(self, x, y, t, area):
+        self.ring.clear()
+        self.ring.push(x, y, t)
+        self.area = area
+        self.origin = (x, y, t)
+        self.moved = False
+        self.fired = None
+
+    def move(self, x, y, t):
+        if self.area is None:
+            return None
+        self.ring.push(x, y, t)
+        ox, oy, _ = self.origin
+        if not self.moved and (abs(x - ox) > self.slop or abs(y - oy) > self.slop):
+            self.moved = True
+
+        if self.area == "seek":
+            if self.moved or self.fired == SCRUB:
+                self.fired = SCRUB
+                return (SCRUB, x)
+            return None
+
+        if self.fired is None and self.moved:
+            return self._check_flick(x)
+        return None
+
+    def release(self, x, y, t):
+        if self.area is None:
+            return None
+        self.ring.push(x, y, t)
+        area, fired = self.area, self.fired
+        result = None
+        if fired is None:
+            if area != "seek":
+                result = self._check_flick(x)
+            if result is None and not self.moved and t - self.origin[2] < self.long_press:
+                result = (TAP, area)
+        self.area = None
+        return result
+
+    def poll(self, t):
+        """Long-press check; call periodically while the button is held."""
+        if self.area is None or self.fired is not None or self.moved:
+            return None
+        if t - self.origin[2] >= self.long_press:
+            self.fired = LONG_PRESS
+            return (LONG_PRESS, self.area)
+        return None
+
+    def cancel(self):
+        self.area = None
+
+    def _check_flick(self, x):
+        vx, vy = self.ring.velocity(self.window)
+        dx = x - self.origin[0]
+        if (abs(vx) >= self.flick_speed and abs(dx) >= self.flick_distance
+                and abs(vx) > 2 * abs(vy) and (vx > 0) == (dx > 0)):
+            self.fired = FLICK
+            return (FLICK, 1 if vx > 0 else -1)
+        return None
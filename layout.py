@@ -0,0 +1,235 @@
+import math
+from functools import lru_cache
+
+# --- Layout Math ---
+# Pure arithmetic on the widget's size and toggles. Nothing in here touches Tk,
+# so the canvas, hit-testing and headless renders all agree on where things go.
+
+BASE_HEIGHT = 125.0
+
+
+class Layout:
+    """Resolved positions for one widget size. Treat as read-only (memoized)."""
+
+    def __init__(self, width, height, art_aspect, show_progress, show_controls):
+        self.width = width
+        self.height = height
+        self.scale = height / BASE_HEIGHT
+        self.padding = max(10, height * 0.12)
+
+        # Album Art (square placeholder, or aspect-correct art capped at 45%)
+        self.art_size = int(height - (self.padding * 2.2))
+        art_w, art_h = self.art_size, self.art_size
+        if art_aspect:
+            art_w = self.art_size * art_aspect
+            art_h = self.art_size
+            if art_w > width * 0.45:
+                art_w = width * 0.45
+                art_h = art_w / art_aspect
+        self.art_w, self.art_h = art_w, art_h
+        self.art_x = self.padding + art_w // 2
+        self.art_y = height / 2
+        self.placeholder_box = (self.padding, self.art_y - self.art_size / 2,
+                                self.padding + self.art_size, self.art_y + self.art_size / 2)
+
+        # Text column (centered between art and right border)
+        self.right_margin = 35 * self.scale
+        self.art_end_x = self.padding + art_w + self.right_margin
+        self.text_x = self.art_end_x + (width - self.art_end_x - (25 * self.scale)) // 2
+        self.text_max_w = width - (self.padding + art_w + self.right_margin + 25 * self.scale) - 20
+
+        # Vertical stack center values
+        if show_progress and show_controls:
+            self.title_y, self.artist_y, self.ctrl_y, self.bar_y = height * 0.22, height * 0.40, height * 0.64, height * 0.86
+        elif show_progress:
+            self.title_y, self.artist_y, self.ctrl_y, self.bar_y = height * 0.35, height * 0.52, -100, height * 0.85
+        elif show_controls:
+            self.title_y, self.artist_y, self.ctrl_y, self.bar_y = height * 0.32, height * 0.50, height * 0.75, -100
+        else:
+            self.title_y, self.artist_y, self.ctrl_y, self.bar_y = height * 0.42, height * 0.60, -100, -100
+
+        # Progress bar (75% of the text column)
+        self.bar_w = (width - self.art_end_x - self.right_margin) * 0.75
+        self.bar_x1 = self.text_x - self.bar_w // 2
+        self.bar_x2 = self.text_x + self.bar_w // 2
+        self.bar_thick = int(4 * self.scale)
+        self.dot_r = 5.0 * self.scale
+        self.time_gap = 10 * self.scale
+        self.shadow_offset = 0.8 * self.scale
+
+        # Transport buttons
+        self.btn_offset = 48 * self.scale
+        self.btn_size = 9 * self.scale
+        self.btn_gap = 0.5 * self.scale
+
+    def bar_x_at(self, ratio):
+        return self.bar_x1 + (self.bar_x2 - self.bar_x1) * ratio
+
+    def prev_points(self):
+        x, y, s, g = self.text_x - self.btn_offset, self.ctrl_y, self.btn_size, self.btn_gap
+        return ((x, y - s, x, y + s, x - s, y),
+                (x + s + g, y - s, x + s + g, y + s, x + g, y))
+
+    def next_points(self):
+        x, y, s, g = self.text_x + self.btn_offset, self.ctrl_y, self.btn_size, self.btn_gap
+        return ((x, y - s, x, y + s, x + s, y),
+                (x - s - g, y - s, x - s - g, y + s, x - g, y))
+
+    def play_points(self):
+        s = 9.5 * self.scale
+        x, y = self.text_x, self.ctrl_y
+        return (x - s / 1.5, y - s, x - s / 1.5, y + s, x + s, y)
+
+    def pause_points(self):
+        h = 8.5 * self.scale
+        sep = 6.0 * self.scale
+        x, y = self.text_x, self.ctrl_y
+        return ((x - sep, y - h, x - sep, y + h),
+                (x + sep, y - h, x + sep, y + h))
+
+
+@lru_cache(maxsize=128)
+def compute_layout(width, height, art_aspect=None, show_progress=True, show_controls=True):
+    """Memoized: a settled widget asks for the same size every frame."""
+    return Layout(width, height, art_aspect, show_progress, show_controls)
+
+
+@lru_cache(maxsize=64)
+def get_rounded_rect_points(x1, y1, x2, y2, radius=25):
+    points = []
+    # Increase precision for mathematically round corners
+    steps = 10 # Increase for more smoothness
+    # Top Left
+    for i in range(180, 271, steps):
+        ang = math.radians(i)
+        points.extend([x1+radius + radius*math.cos(ang), y1+radius + radius*math.sin(ang)])
+    # Top Right
+    for i in range(270, 361, steps):
+        ang = math.radians(i)
+        points.extend([x2-radius + radius*math.cos(ang), y1+radius + radius*math.sin(ang)])
+    # Bottom Right
+    for i in range(0, 91, steps):
+        ang = math.radians(i)
+        points.extend([x2-radius + radius*math.cos(ang), y2-radius + radius*math.sin(ang)])
+    # Bottom Left
+    for i in range(90, 181, steps):
+        ang = math.radians(i)
+        points.extend([x1+radius + radius*math.cos(ang), y2-radius + radius*math.sin(ang)])
+
+    return tuple(points)
+
+
+# --- Hit Testing ---
+class HitIndex:
+    """Interactive regions for one layout as (name, x1, y1, x2, y2), in click priority.
+
+    Lookups are plain arithmetic; a handful of boxes behind one bounding
+    check beats any Tk canvas query.
+    """
+    def __init__(self, zones):
+        self.zones = tuple(zones)
+        if self.zones:
+            self.bounds = (min(z[1] for z in self.zones), min(z[2] for z in self.zones),
+                           max(z[3] for z in self.zones), max(z[4] for z in self.zones))
+        else:
+            self.bounds = (0, 0, -1, -1)
+
+    def hit(self, x, y):
+        bx1, by1, bx2, by2 = self.bounds
+        if not (bx1 <= x <= bx2 and by1 <= y <= by2):
+            return None
+        for name, x1, y1, x2, y2 in self.zones:
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                return name
+        return None
+
+
+def _bbox(polys, pad):
+    xs = [v for pts in polys for v in pts[0::2]]
+    ys = [v for pts in polys for v in pts[1::2]]
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+
+@lru_cache(maxsize=32)
+def build_hit_index(L, art=True, progress=True, controls=True, resizable=False):
+    """Memoized per Layout (itself memoized), so a settled widget reuses one index."""
+    zones = []
+    if controls:
+        # Same reach as the old 30x30 click box; scaled so neighbours never overlap
+        pad = 15 * L.scale
+        zones.append(("prev",) + _bbox(L.prev_points(), pad))
+        zones.append(("next",) + _bbox(L.next_points(), pad))
+        zones.append(("play",) + _bbox((L.play_points(),) + L.pause_points(), pad))
+    if art:
+        zones.append(("art", L.art_x - L.art_w / 2, L.art_y - L.art_h / 2,
+                      L.art_x + L.art_w / 2, L.art_y + L.art_h / 2))
+    if resizable:
+        zones.append(("resize", L.width - 30, L.height - 30, L.width, L.height))
+    if progress:
+        zones.append(("seek", L.bar_x1 - 20, L.bar_y - 20, L.bar_x2 + 20, L.bar_y + 20))
+    return HitIndex(zones)
+
+
+# --- Visibility ---
+HIDDEN = "hidden"    # Parked at the dock edge, only the lip showing
+PEEKING = "peeking"  # Sliding in or out
+SHOWN = "shown"      # Fully revealed (or floating in normal mode)
+
+
+class Visibility:
+    """Tracks whether the island is worth drawing.
+
+    `suppressed` is True while parked hidden, minimized to tray or covered by
+    a fullscreen app; `on_reveal` fires once when that stops being true so
+    deferred work can be caught up in a single pass. `warm` lifts the parked
+    suppression early when a reveal is predicted, so the catch-up happens
+    before the island starts to move.
+    """
+    def __init__(self):
+        self.state = SHOWN
+        self.occluded = False
+        self.minimized = False
+        self.warm = False
+        self.on_reveal = None
+
+    @property
+    def suppressed(self):
+        return (self.state == HIDDEN and not self.warm) or self.occluded or self.minimized
+
+    def _set(self, **changes):
+        was = self.suppressed
+        for k, v in changes.items():
+            setattr(self, k, v)
+        if was and not self.suppressed and self.on_reveal:
+            self.on_reveal()
+
+    def set_minimized(self, minimized):
+        if minimized != self.minimized:
+            self._set(minimized=minimized)
+
+    def set_occluded(self, occluded):
+        if occluded != self.occluded:
+            self._set(occluded=occluded)
+
+    def set_warm(self, warm):
+        if warm != self.warm:
+            self._set(warm=warm)
+
+    def update(self, dock_side, x, y, x_hidden, y_hidden, settled):
+        if dock_side == "top":
+            parked = abs(y - y_hidden) < 1
+        elif dock_side in ("left", "right"):
+            parked = abs(x - x_hidden) < 1
+        else:
+            parked = False # Floating windows are never parked
+
+        if parked and settled:
+            state = HIDDEN
+        elif settled:
+            state = SHOWN
+        else:
+            state = PEEKING
+        if state != self.state:
+            # Parking again ends any pre-warm left over from the last reveal
+            self._set(state=state, warm=self.warm and state != HIDDEN)
+        return state
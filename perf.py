@@ -0,0 +1,143 @@
+import json
+import math
+import time
+from functools import wraps
+
+# --- Hot Path Instrumentation ---
+# Cheap enough to leave on in production: a timed call costs two perf_counter
+# reads and a bucket increment.
+
+
+class Histogram:
+    """Log-bucketed histogram (~10% resolution) for values in milliseconds."""
+    GROWTH = 1.1
+    MIN = 0.01  # ms
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value):
+        if value <= self.MIN:
+            return 0
+        return int(math.log(value / self.MIN, self.GROWTH)) + 1
+
+    def add(self, value):
+        b = self._bucket(value)
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                # Upper edge of the bucket, capped by the real max
+                return min(self.MIN * self.GROWTH ** b, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max, 3),
+        }
+
+
+class PerfMonitor:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.histograms = {}
+        self.counters = {}
+        self.frame_interval = 1 / 60.0
+        self.last_frame = None
+        self.dropped_frames = 0
+        self.frames = 0
+        self.started = clock()
+
+    def hist(self, name):
+        h = self.histograms.get(name)
+        if h is None:
+            h = self.histograms[name] = Histogram()
+        return h
+
+    def record(self, name, ms):
+        self.hist(name).add(ms)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, name):
+        """Decorator: records the wrapped call's duration under `name`."""
+        def deco(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                t0 = self.clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.hist(name).add((self.clock() - t0) * 1000.0)
+            return wrapper
+        return deco
+
+    def frame(self, expected=None, now=None):
+        """Marks a frame tick; tracks interval jitter and dropped frames."""
+        now = self.clock() if now is None else now
+        expected = expected or self.frame_interval
+        self.frames += 1
+        if self.last_frame is not None:
+            interval = now - self.last_frame
+            self.hist("frame_interval").add(interval * 1000.0)
+            self.hist("frame_jitter").add(abs(interval - expected) * 1000.0)
+            missed = int(interval / expected + 0.5) - 1
+            if missed > 0:
+                self.dropped_frames += missed
+        self.last_frame = now
+
+    def break_frames(self):
+        """Call when the frame loop pauses on purpose (idle) so the gap isn't counted as drops."""
+        self.last_frame = None
+
+    def snapshot(self, extra=None):
+        data = {
+            "uptime_s": round(self.clock() - self.started, 1),
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "timings_ms": {name: h.summary() for name, h in sorted(self.histograms.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+        if extra:
+            data.update(extra)
+        return data
+
+    def dump(self, path, extra=None):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(extra), f, indent=4)
+        return path
+
+    def overlay_text(self):
+        def p(name, q):
+            h = self.histograms.get(name)
+            return h.percentile(q) if h else 0.0
+        return (f"frame p50 {p('animate_physics', 50):.1f} p95 {p('animate_physics', 95):.1f} p99 {p('animate_physics', 99):.1f} ms\n"
+                f"jitter p95 {p('frame_jitter', 95):.1f} ms  dropped {self.dropped_frames}\n"
+                f"art p95 {p('redraw_art_image', 95):.1f}  media p95 {p('update_media_state', 95):.1f} ms\n"
+                f"tk/frame p95 {p('tk_calls_per_frame', 95):.0f}  bridge p95 {p('bridge_latency', 95):.1f} ms\n"
+                f"lag p95 tk {p('tk_lag', 95):.1f} loop {p('asyncio_lag', 95):.1f} ms  "
+                f"stalls {self.counters.get('tk_stalls', 0) + self.counters.get('asyncio_stalls', 0)}")
+
+
+# Process-wide monitor (the widget is a single instance)
+PERF = PerfMonitor()
+timed = PERF.timed
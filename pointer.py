@@ -0,0 +1,399 @@
+import threading
+import time
+from collections import deque
+
+# --- Pointer Prediction ---
+# Cursor samples in, "about to reveal" out. Pure math on (x, y, t) so it can
+# be fed by polling, a hook, or a recorded trace.
+
+
+class RevealPredictor:
+    """Extrapolates the cursor `lead` seconds ahead from recent samples.
+
+    `likely(inside)` is True when the cursor is not in the hover zone yet but
+    is heading into it fast enough to arrive within `lead`. `inside(x, y)` is
+    the caller's zone test, so the predictor stays dock-side agnostic.
+    """
+    def __init__(self, lead=0.1, window=0.12, min_speed=150.0):
+        self.lead = lead            # s to look ahead
+        self.window = window        # s of history used for velocity
+        self.min_speed = min_speed  # px/s; slower drift is never a reveal
+        self.samples = deque(maxlen=64) # hooks deliver every move, not every 30ms
+        self.predictions = 0
+
+    def add(self, x, y, t):
+        self.samples.append((x, y, t))
+        while len(self.samples) > 2 and t - self.samples[0][2] > self.window:
+            self.samples.popleft()
+
+    def velocity(self):
+        if len(self.samples) < 2:
+            return 0.0, 0.0
+        x0, y0, t0 = self.samples[0]
+        x1, y1, t1 = self.samples[-1]
+        dt = t1 - t0
+        if dt <= 0:
+            return 0.0, 0.0
+        return (x1 - x0) / dt, (y1 - y0) / dt
+
+    def predict(self, lead=None):
+        if not self.samples:
+            return None
+        lead = self.lead if lead is None else lead
+        x, y, _ = self.samples[-1]
+        vx, vy = self.velocity()
+        return x + vx * lead, y + vy * lead
+
+    def likely(self, inside):
+        if len(self.samples) < 2:
+            return False
+        x, y, _ = self.samples[-1]
+        if inside(x, y):
+            return False # Already there; check_mouse handles it directly
+        vx, vy = self.velocity()
+        if (vx * vx + vy * vy) ** 0.5 < self.min_speed:
+            return False
+        px, py = self.predict()
+        if inside(px, py):
+            self.predictions += 1
+            return True
+        return False
+
+    def reset(self):
+        self.samples.clear()
+
+
+# --- Hover Logic ---
+class HoverZone:
+    """Snapshot of where the widget reacts to the cursor.
+
+    Built by the widget on the Tk thread whenever its geometry changes and
+    read from whichever thread delivers pointer samples, so it is never
+    mutated after construction.
+    """
+    def __init__(self, dock_side, x, y, width, height, zone, screen_w, revealed, buffer=10):
+        self.dock_side = dock_side
+        self.x, self.y = x, y
+        self.width, self.height = width, height
+        self.zone = zone          # hover_zone_height, px from the dock edge
+        self.screen_w = screen_w
+        self.revealed = revealed  # island already (partly) out of its parked spot
+        self.buffer = buffer
+
+    def lip(self, mx, my):
+        """Cursor in the trigger strip along the dock edge."""
+        if self.dock_side == "top":
+            return self.x - 15 <= mx <= self.x + self.width + 15 and my <= self.zone
+        elif self.dock_side == "left":
+            return mx <= self.zone and self.y <= my <= self.y + self.height
+        elif self.dock_side == "right":
+            return mx >= self.screen_w - self.zone and self.y <= my <= self.y + self.height
+        return False
+
+    def window(self, mx, my):
+        """Cursor over the window plus a tight buffer."""
+        b = self.buffer
+        return self.x - b <= mx <= self.x + self.width + b and self.y - b <= my <= self.y + self.height + b
+
+    def contains(self, mx, my):
+        # The window area only keeps the island open once it is already showing
+        return self.lip(mx, my) or (self.revealed and self.window(mx, my))
+
+
+class HoverTracker:
+    """Turns pointer samples into hover state and fires on_change when it flips.
+
+    `inside` is the hit result for the latest sample; `likely` is the reveal
+    prediction while the cursor is still outside. Samples may arrive on a
+    hook thread, so state changes happen under a lock and on_change is
+    called from that thread.
+    """
+    def __init__(self, predictor=None, on_change=None):
+        self.predictor = predictor or RevealPredictor()
+        self.on_change = on_change
+        self.zone = None
+        self.pos = None
+        self.inside = False
+        self.likely = False
+        self.samples = 0
+        self.changes = 0
+        self._lock = threading.Lock()
+
+    def set_zone(self, zone):
+        with self._lock:
+            self.zone = zone
+            changed = self._evaluate()
+        if changed and self.on_change:
+            self.on_change(self)
+
+    def feed(self, x, y, t):
+        with self._lock:
+            self.pos = (x, y)
+            self.samples += 1
+            self.predictor.add(x, y, t)
+            changed = self._evaluate()
+        if changed and self.on_change:
+            self.on_change(self)
+
+    def _evaluate(self):
+        if self.zone is None or self.pos is None:
+            return False
+        inside = self.zone.contains(*self.pos)
+        likely = not inside and self.predictor.likely(self.zone.lip)
+        if (inside, likely) == (self.inside, self.likely):
+            return False
+        self.inside, self.likely = inside, likely
+        self.changes += 1
+        return True
+
+
+# --- Pointer Sources ---
+class PointerSource:
+    """Delivers cursor positions to `on_move(x, y, t)`.
+
+    Event-driven sources push samples as the cursor moves; polling sources
+    only sample when poll() is called (from the widget's mouse task).
+    """
+    event_driven = False
+
+    def __init__(self):
+        self.on_move = None
+        self.pos = (0, 0)
+
+    def start(self, on_move):
+        self.on_move = on_move
+        return True
+
+    def stop(self):
+        self.on_move = None
+
+    def position(self):
+        return self.pos
+
+    def poll(self):
+        pass
+
+    def _dispatch(self, x, y, t=None):
+        self.pos = (x, y)
+        if self.on_move:
+            self.on_move(x, y, time.perf_counter() if t is None else t)
+
+
+class PollingPointerSource(PointerSource):
+    """Fallback: samples `get_pos()` (GetCursorPos) whenever poll() runs."""
+    def __init__(self, get_pos):
+        super().__init__()
+        self.get_pos = get_pos
+
+    def poll(self):
+        x, y = self.get_pos()
+        self._dispatch(x, y)
+
+
+class FakePointerSource(PointerSource):
+    """Deterministic source for headless tests and benchmarks."""
+    event_driven = True
+
+    def move(self, x, y, t=None):
+        self._dispatch(x, y, t)
+
+    def play(self, trace):
+        """Replays (x, y, t) samples in order."""
+        for x, y, t in trace:
+            self._dispatch(x, y, t)
+
+
+class LowLevelHookSource(PointerSource):
+    """WH_MOUSE_LL hook on its own message-pump thread (Windows only).
+
+    Windows calls the hook for every mouse event system-wide and silently
+    unhooks a proc that overruns LowLevelHooksTimeout, so the proc only
+    queues the move and returns. A second thread hands queued moves to
+    on_move, and poll() is a GetCursorPos safety net that also notices a
+    dead hook and has that thread reinstall it.
+
+    SetCursorPos (games, remote desktop recentering the cursor) moves the
+    cursor without hook calls too, so reinstalls that don't bring events
+    back are spaced out: `retry` s apart for the first `streak`, then
+    doubling up to `max_backoff`.
+    """
+    event_driven = True
+    WH_MOUSE_LL = 14
+    WM_MOUSEMOVE = 0x0200
+    WM_QUIT = 0x0012
+
+    def __init__(self, get_pos=None, retry=1.0, streak=3, max_backoff=60.0, clock=time.perf_counter):
+        super().__init__()
+        self.get_pos = get_pos
+        self.retry = retry
+        self.streak = streak
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.hook = None
+        self.thread = None
+        self.thread_id = None
+        self._proc = None
+        self.moves = deque(maxlen=256)  # (x, y, t) from the hook, not yet delivered
+        self._moved = threading.Event()
+        self._stopped = False
+        self.events = 0       # hook calls so far; only the hook thread writes it
+        self._events_seen = 0 # events at the last poll
+        self._polled = None   # cursor position at the last poll
+        self.reinstalls = 0
+        self._failed = 0            # reinstalls since the hook last delivered
+        self._next_reinstall = 0.0
+        self._reinstall = False     # requested from poll(), done on the delivery thread
+
+    def start(self, on_move):
+        self.on_move = on_move
+        self._stopped = False
+        threading.Thread(target=self._deliver, name="phonon-pointer", daemon=True).start()
+        return self._install_thread()
+
+    def _install_thread(self):
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(ready,), name="phonon-mouse-hook", daemon=True)
+        self.thread.start()
+        ready.wait(1.0)
+        return bool(self.hook)
+
+    def stop(self):
+        self.on_move = None
+        self._stopped = True
+        self._moved.set()
+        self._quit_pump()
+
+    def _quit_pump(self):
+        if self.thread_id:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self.thread_id, self.WM_QUIT, 0, 0)
+            self.thread_id = None
+
+    def _deliver(self):
+        # Feeds the tracker off the hook thread, so its work never counts against the hook timeout
+        while True:
+            self._moved.wait()
+            self._moved.clear()
+            if self._stopped:
+                return
+            if self._reinstall:
+                self.reinstall() # Blocks this thread, not the caller of poll()
+                self._reinstall = False
+            while self.moves:
+                x, y, t = self.moves.popleft()
+                try:
+                    self._dispatch(x, y, t)
+                except Exception as e:
+                    print(f"Pointer move handler failed: {e}")
+
+    def poll(self):
+        """Safety net on the caller's thread: samples GetCursorPos and checks the hook.
+
+        A cursor that moved since the last poll without a single hook call
+        means Windows probably dropped the hook; the delivery thread is asked
+        to reinstall it, subject to the backoff.
+        """
+        if self.get_pos is None or self._stopped:
+            return
+        x, y = self.get_pos()
+        events = self.events
+        if events != self._events_seen:
+            self._failed = 0 # Delivering
+        elif self._polled is not None and (x, y) != self._polled:
+            self._request_reinstall()
+        self._polled, self._events_seen = (x, y), events
+        self._dispatch(x, y)
+
+    def _request_reinstall(self):
+        now = self.clock()
+        if self._reinstall or now < self._next_reinstall:
+            return
+        self._failed += 1
+        if self._failed < self.streak:
+            delay = self.retry
+        else:
+            delay = min(self.max_backoff, self.retry * 2 ** (self._failed - self.streak + 1))
+        self._next_reinstall = now + delay
+        self._reinstall = True
+        self._moved.set()
+
+    def reinstall(self):
+        print("Pointer: mouse hook stopped delivering, reinstalling")
+        self.reinstalls += 1
+        self._quit_pump()
+        self.hook = None
+        self._install_thread()
+
+    def _run(self, ready):
+        try:
+            self._install()
+        except Exception as e:
+            print(f"Pointer hook install failed: {e}")
+        finally:
+            ready.set()
+        if self.hook:
+            self._pump()
+
+    def _install(self):
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+
+        class MSLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("pt", wintypes.POINT), ("mouseData", wintypes.DWORD),
+                        ("flags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_void_p)]
+
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        call_next = user32.CallNextHookEx
+        call_next.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        call_next.restype = LRESULT
+
+        def proc(code, wparam, lparam):
+            if code == 0 and wparam == self.WM_MOUSEMOVE:
+                # Record and return; _deliver does the rest on its own thread
+                info = ctypes.cast(lparam, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+                self.events += 1
+                self.pos = (info.pt.x, info.pt.y)
+                self.moves.append((info.pt.x, info.pt.y, time.perf_counter()))
+                self._moved.set()
+            return call_next(None, code, wparam, lparam)
+
+        self._proc = HOOKPROC(proc) # Keep a reference or ctypes frees the thunk
+        user32.SetWindowsHookExW.argtypes = (ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD)
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+        self.thread_id = kernel32.GetCurrentThreadId()
+        self.hook = user32.SetWindowsHookExW(self.WH_MOUSE_LL, self._proc, kernel32.GetModuleHandleW(None), 0)
+
+    def _pump(self):
+        # LL hooks are delivered through this thread's message loop
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        hook = self.hook
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWindowsHookEx(hook)
+        if self.hook == hook:
+            self.hook = None # A reinstall may already have replaced it
+
+
+def create_pointer_source(get_pos, on_move):
+    """Low-level hook when available, GetCursorPos polling otherwise. Returns a started source."""
+    try:
+        source = LowLevelHookSource(get_pos)
+        if source.start(on_move):
+            print("Pointer: using low-level mouse hook")
+            return source
+        source.stop()
+    except Exception as e:
+        print(f"Pointer hook unavailable: {e}")
+    source = PollingPointerSource(get_pos)
+    source.start(on_move)
+    print("Pointer: falling back to cursor polling")
+    return source
@@ -0,0 +1,444 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+
+from textfit import fit_text
+
+# --- Helper: Rounded Image ---
+DRAFT_FILTER = Image.Resampling.BILINEAR
+FINAL_FILTER = Image.Resampling.LANCZOS
+
+def make_rounded_image(pil_img, width, height, radius=0, resample=FINAL_FILTER):
+    pil_img = pil_img.resize((int(width), int(height)), resample)
+    mask = Image.new("L", (int(width), int(height)), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.rounded_rectangle((0, 0, int(width), int(height)), radius=radius, fill=255)
+    output = Image.new("RGBA", (int(width), int(height)), (0, 0, 0, 0))
+    output.paste(pil_img, (0, 0), mask)
+    return output
+
+
+# --- Ambilight Glow ---
+def glow_base(img, w, h, intensity):
+    """Album art resized to the widget, heavily blurred and dimmed (no shape yet)."""
+    img_resized = img.resize((w, h), Image.Resampling.LANCZOS)
+    blurred = img_resized.filter(ImageFilter.GaussianBlur(radius=50))
+
+    # Cap maximum brightness at 70% of original so text stays readable at 100%
+    brightness_factor = intensity * 0.7
+    dimmed_glow = ImageEnhance.Brightness(blurred).enhance(brightness_factor)
+
+    base = Image.new("RGB", (w, h), "#000000")
+    return Image.blend(base, dimmed_glow, intensity)
+
+
+def glow_shape(base, w, h, r, key_color="#000001"):
+    """Rounds the glow's corners over the window's transparency key colour."""
+    mask = Image.new("L", (w, h), 0)
+    ImageDraw.Draw(mask).rounded_rectangle([0, 0, w-1, h-1], radius=r, fill=255)
+    final = Image.new("RGB", (w, h), key_color)
+    final.paste(base, (0, 0), mask)
+    return final
+
+
+def render_glow(img, w, h, r, intensity, key_color="#000001"):
+    return glow_shape(glow_base(img, w, h, intensity), w, h, r, key_color)
+
+
+class GlowCache:
+    """Exact glows plus a stretchable blurred base for in-between sizes.
+
+    A 50px blur leaves no detail that resizing could spoil, so the last base,
+    stretched and re-rounded, stands in while a resize or mode switch is in
+    progress; an exact render replaces it once the size settles.
+
+    Exact glows are also kept per shape for the current art, so switching
+    back to a size rendered before (or pre-rendered) costs nothing. Renders
+    run on pool threads and lookups on the Tk thread, hence the lock. The Tk
+    thread names the current art with use(); a render for anything else
+    that lands late is returned but not cached.
+    """
+    def __init__(self, max_shaped=4):
+        self.base = None             # (source image, intensity, blurred base)
+        self.shaped = OrderedDict()  # (w, h, r, key_color) -> exact glow for `owner`
+        self.owner = None            # (source image, intensity) the shaped glows belong to
+        self.max_shaped = max_shaped
+        self._lock = threading.Lock()
+        self.exact_renders = 0
+        self.interim_renders = 0
+        self.hits = 0
+        self.stale = 0
+
+    def use(self, source, intensity):
+        """The art and intensity now showing; glows for anything else are dropped."""
+        with self._lock:
+            owner = self.owner
+            if owner is not None and owner[0] is source and owner[1] == intensity:
+                return
+            self.owner = (source, intensity)
+            self.shaped.clear()
+            base = self.base
+            if base is not None and (base[0] is not source or base[1] != intensity):
+                self.base = None
+
+    def exact(self, img, w, h, r, intensity, key_color="#000001", source=None):
+        """Full render; `source` is the image interim() will be asked about (img may be a copy)."""
+        source = source or img
+        base = glow_base(img, w, h, intensity)
+        glow = glow_shape(base, w, h, r, key_color)
+        with self._lock:
+            self.exact_renders += 1
+            owner = self.owner
+            if owner is None:
+                owner = self.owner = (source, intensity) # No use() yet (benchmarks): first render owns
+            if owner[0] is not source or owner[1] != intensity:
+                self.stale += 1 # Art changed while this rendered; keep the current art's glows
+                return glow
+            self.base = (source, intensity, base)
+            self.shaped[(w, h, r, key_color)] = glow
+            self.shaped.move_to_end((w, h, r, key_color))
+            while len(self.shaped) > self.max_shaped:
+                self.shaped.popitem(last=False)
+        return glow
+
+    def owns(self, source, intensity):
+        """True while `source` at `intensity` is the art use() last named."""
+        owner = self.owner
+        return owner is not None and owner[0] is source and owner[1] == intensity
+
+    def lookup(self, img, w, h, r, intensity, key_color="#000001"):
+        """A finished exact glow for this art and shape, or None."""
+        with self._lock:
+            owner = self.owner
+            if owner is None or owner[0] is not img or owner[1] != intensity:
+                return None
+            glow = self.shaped.get((w, h, r, key_color))
+            if glow is not None:
+                self.shaped.move_to_end((w, h, r, key_color))
+                self.hits += 1
+            return glow
+
+    def interim(self, img, w, h, r, intensity, key_color="#000001"):
+        """Stretched stand-in, or None when no base exists for this art and intensity."""
+        cached = self.base
+        if cached is None or cached[0] is not img or cached[1] != intensity:
+            return None
+        base = cached[2]
+        if base.size != (w, h):
+            base = base.resize((w, h), DRAFT_FILTER)
+        self.interim_renders += 1
+        return glow_shape(base, w, h, r, key_color)
+
+    def report(self):
+        return {"exact": self.exact_renders, "interim": self.interim_renders, "hits": self.hits,
+                "stale": self.stale, "shapes": len(self.shaped)}
+
+
+class ArtQualityPolicy:
+    """Decides how to resample the album art for the current frame.
+
+    While the layout is moving, size changes get a cheap "draft" render.
+    Once the size has held still for `settle_delay` seconds, one "final"
+    LANCZOS render replaces it. on_frame returns None when nothing needs
+    drawing.
+    """
+    def __init__(self, settle_delay=0.12, tolerance=3, clock=time.perf_counter):
+        self.settle_delay = settle_delay
+        self.tolerance = tolerance
+        self.clock = clock
+        self.invalidate()
+
+    def invalidate(self):
+        """New source image: the next frame must redraw."""
+        self.size = None
+        self.quality = None
+        self.settle_since = None
+
+    @property
+    def pending(self):
+        return self.quality == "draft"
+
+    def on_frame(self, w, h, moving):
+        changed = (self.size is None or abs(self.size[0] - w) > self.tolerance
+                   or abs(self.size[1] - h) > self.tolerance)
+        if moving:
+            self.settle_since = None
+            if changed:
+                self.size = (w, h)
+                self.quality = "draft"
+                return "draft"
+            return None
+
+        if self.quality is None or (changed and self.quality == "final"):
+            # Settled from the start (new art, config change): go straight to final
+            self.size = (w, h)
+            self.quality = "final"
+            return "final"
+
+        if self.quality == "draft" or changed:
+            now = self.clock()
+            if self.settle_since is None:
+                self.settle_since = now
+            if now - self.settle_since >= self.settle_delay:
+                self.size = (w, h)
+                self.quality = "final"
+                self.settle_since = None
+                return "final"
+        return None
+
+
+# --- Text Sprites ---
+# Each label is rasterized once together with its drop shadow, so the canvas
+# moves one image per label instead of a text item plus a shadow copy.
+
+FONT_DIR = os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts")
+
+# Label fonts as (family, size in pt at scale 1.0, weight), by MediaWidget attribute
+FONT_SPECS = {
+    "font_title": ("Segoe UI Variable Display", 13, "bold"),
+    "font_artist": ("Segoe UI Variable Text", 9, "normal"),
+    "font_time": ("Segoe UI Variable Text", 9, "bold"),
+}
+
+# Label name -> MediaWidget font attribute
+LABEL_FONTS = {"title": "font_title", "artist": "font_artist", "curr_time": "font_time", "total_time": "font_time"}
+
+# Tk family -> candidate font files (first match wins), per weight
+FONT_FILES = {
+    ("Segoe UI Variable Display", "bold"): ["segoeuib.ttf", "arialbd.ttf"],
+    ("Segoe UI Variable Display", "normal"): ["segoeui.ttf", "arial.ttf"],
+    ("Segoe UI Variable Text", "bold"): ["segoeuib.ttf", "arialbd.ttf"],
+    ("Segoe UI Variable Text", "normal"): ["segoeui.ttf", "arial.ttf"],
+}
+
+
+class TextSpriteCache:
+    """LRU of rendered label sprites keyed by (text, font, color, scale).
+
+    `to_photo` turns the PIL sprite into whatever the caller draws with
+    (ImageTk.PhotoImage in the widget); headless callers can keep PIL images.
+    With `fallback`, fonts missing from `font_dir` (any non-Windows box) use
+    Pillow's built-in font instead of disabling the label.
+    """
+    def __init__(self, to_photo=None, font_dir=FONT_DIR, max_items=96, fallback=False):
+        self.to_photo = to_photo or (lambda img: img)
+        self.font_dir = font_dir
+        self.fallback = fallback
+        self.max_items = max_items
+        self.sprites = OrderedDict()
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load_font(self, family, weight, px):
+        key = (family, weight, px)
+        if key in self.fonts:
+            return self.fonts[key]
+        font = None
+        for name in FONT_FILES.get((family, weight), []) + [family]:
+            try:
+                font = ImageFont.truetype(os.path.join(self.font_dir, name), px)
+                break
+            except (OSError, IOError):
+                continue
+        if font is None and self.fallback:
+            try:
+                font = ImageFont.load_default(size=px)
+            except TypeError:
+                font = ImageFont.load_default() # Pillow < 10.1: fixed size
+        self.fonts[key] = font
+        return font
+
+    def available(self, family="Segoe UI Variable Text", weight="normal"):
+        return self.load_font(family, weight, 12) is not None
+
+    def get(self, text, family, weight, px, color, shadow="#121212", shadow_offset=1):
+        key = (text, family, weight, px, color, shadow, shadow_offset)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        self.misses += 1
+        img = self.render(text, family, weight, px, color, shadow, shadow_offset)
+        if img is None:
+            return None
+        sprite = self.to_photo(img)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_items:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def render(self, text, family, weight, px, color, shadow="#121212", shadow_offset=1):
+        font = self.load_font(family, weight, px)
+        if font is None:
+            return None
+        # Pad by the shadow offset and keep the ascender box so baselines line up
+        x0, y0, x1, y1 = font.getbbox(text or " ")
+        ascent, descent = font.getmetrics()
+        w = max(1, x1 - min(0, x0)) + shadow_offset + 2
+        h = ascent + descent + shadow_offset + 2
+        img = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        if shadow:
+            draw.text((1 + shadow_offset, 1 + shadow_offset), text, font=font, fill=shadow)
+        draw.text((1, 1), text, font=font, fill=color)
+        return img
+
+
+# --- Offscreen Compositor ---
+# The whole widget as one PIL image: same Layout, same glow and art helpers,
+# labels from the sprite renderer. Runs without Tk or a display, so frames
+# can be timed and pixel-diffed on any machine.
+
+class FrameState:
+    """What a frame shows besides its geometry (see MediaWidget.frame_state)."""
+    def __init__(self, title="", artist="", curr_time="0:00", total_time="0:00", ratio=0.0,
+                 playing=False, art=None, glow=None, bg_color="#000000", fg_color="#FFFFFF",
+                 sub_color="#AAAAAA", radius=27, show_art=True, show_progress=True,
+                 show_controls=True, title_dy=0, artist_dy=0, key_color="#000001"):
+        self.title = title
+        self.artist = artist
+        self.curr_time = curr_time
+        self.total_time = total_time
+        self.ratio = ratio
+        self.playing = playing
+        self.art = art          # PIL image, source resolution
+        self.glow = glow        # PIL image from render_glow, or None for a solid background
+        self.bg_color = bg_color
+        self.fg_color = fg_color
+        self.sub_color = sub_color
+        self.radius = radius
+        self.show_art = show_art
+        self.show_progress = show_progress
+        self.show_controls = show_controls
+        self.title_dy = title_dy
+        self.artist_dy = artist_dy
+        self.key_color = key_color  # the window's transparent colour
+
+
+class OffscreenRenderer:
+    """Composites background/glow, art, labels, progress bar and buttons.
+
+    Mirrors build_scene and update_ui_animation item for item. Pixels
+    outside the rounded shape are `key_color`, exactly what Tk shows through.
+    """
+    PX_PER_PT = 96 / 72.0
+
+    def __init__(self, sprites=None, px_per_pt=PX_PER_PT):
+        self.sprites = sprites or TextSpriteCache(fallback=True)
+        self.px_per_pt = px_per_pt
+        self._art = None  # (source id, w, h) -> rounded art, one entry like the canvas slot
+
+    def render(self, L, state):
+        w, h = int(L.width), int(L.height)
+        frame = Image.new("RGB", (w, h), state.key_color)
+        draw = ImageDraw.Draw(frame)
+
+        if state.glow is not None:
+            gw, gh = state.glow.size
+            frame.paste(state.glow, ((w - gw) // 2, (h - gh) // 2))
+        else:
+            draw.rounded_rectangle((0, 0, w - 1, h - 1), radius=state.radius, fill=state.bg_color)
+
+        if state.show_art:
+            if state.art is not None:
+                art = self.rounded_art(state.art, L.art_w, L.art_h)
+                frame.paste(art, (int(L.art_x - art.width / 2), int(L.art_y - art.height / 2)), art)
+            else:
+                draw.rounded_rectangle(L.placeholder_box, radius=int(L.art_size * 0.25), fill="#111111")
+
+        shadow = max(1, round(L.scale))
+        self.label(frame, L, "title", state.title, state.fg_color, L.text_x, L.title_y + state.title_dy, "center", shadow, fit=True)
+        self.label(frame, L, "artist", state.artist, state.sub_color, L.text_x, L.artist_y + state.artist_dy, "center", shadow, fit=True)
+
+        if state.show_progress:
+            t = L.bar_thick
+            x = L.bar_x_at(state.ratio)
+            self.line(draw, (L.bar_x1, L.bar_y, L.bar_x2, L.bar_y), "#222222", t)
+            self.line(draw, (L.bar_x1, L.bar_y, x, L.bar_y), state.fg_color, t)
+            draw.ellipse((x - L.dot_r, L.bar_y - L.dot_r, x + L.dot_r, L.bar_y + L.dot_r), fill=state.fg_color)
+            self.label(frame, L, "curr_time", state.curr_time, state.fg_color, L.bar_x1 - L.time_gap, L.bar_y, "e", shadow)
+            self.label(frame, L, "total_time", state.total_time, state.fg_color, L.bar_x2 + L.time_gap, L.bar_y, "w", shadow)
+
+        if state.show_controls:
+            for pts in L.prev_points() + L.next_points():
+                draw.polygon(pts, fill=state.fg_color, outline=state.fg_color)
+            if state.playing:
+                for pts in L.pause_points():
+                    self.line(draw, pts, state.fg_color, int(5.5 * L.scale))
+            else:
+                pts = L.play_points()
+                draw.polygon(pts, fill=state.fg_color)
+                draw.line(pts + pts[:2], fill=state.fg_color, width=int(2.5 * L.scale), joint="curve")
+        return frame
+
+    def rounded_art(self, img, w, h):
+        key = (id(img), int(w), int(h))
+        if self._art is None or self._art[0] != key:
+            self._art = (key, make_rounded_image(img, w, h, radius=int(min(w, h) * 0.25)))
+        return self._art[1]
+
+    @staticmethod
+    def line(draw, pts, fill, width):
+        """Tk line with capstyle=ROUND: the stroke plus a disc at each end."""
+        x1, y1, x2, y2 = pts
+        draw.line(pts, fill=fill, width=max(1, width))
+        r = width / 2.0
+        for x, y in ((x1, y1), (x2, y2)):
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=fill)
+
+    def label(self, frame, L, name, text, color, x, y, anchor, shadow, fit=False):
+        family, size, weight = FONT_SPECS[LABEL_FONTS[name]]
+        px = max(1, round(int(size * L.scale) * self.px_per_pt))
+        if fit:
+            font = self.sprites.load_font(family, weight, px)
+            if font is not None:
+                text, _ = fit_text(text, L.text_max_w, font.getlength)
+        sprite = self.sprites.get(text, family, weight, px, color, shadow_offset=shadow)
+        if sprite is None:
+            return
+        sw, sh = sprite.size
+        if anchor == "e":
+            left = x - sw
+        elif anchor == "w":
+            left = x
+        else:
+            left = x - sw / 2
+        frame.paste(sprite, (int(left), int(y - sh / 2)), sprite)
+
+
+def diff_frames(a, b):
+    """(pixels that differ, largest channel delta) between two same-size frames."""
+    diff = ImageChops.difference(a.convert("RGB"), b.convert("RGB"))
+    if diff.getbbox() is None:
+        return 0, 0
+    changed = diff.convert("L").point(lambda v: 255 if v else 0).histogram()[255]
+    return changed, max(hi for _, hi in diff.getextrema())
+
+
+if __name__ == "__main__":
+    # Frame benchmark: `python render.py [snapshot.png]`
+    import sys
+    from layout import compute_layout
+    from perf import Histogram
+
+    art = Image.linear_gradient("L").convert("RGB").resize((300, 300))
+    state = FrameState(title="A Rather Long Track Title That Needs Truncating", artist="Some Artist",
+                       curr_time="1:23", total_time="3:45", ratio=0.37, playing=True, art=art)
+    renderer = OffscreenRenderer()
+    for label, glow in (("solid", None), ("glow", render_glow(art, 510, 130, 27, 0.95))):
+        state.glow = glow
+        hist = Histogram()
+        for i in range(200):
+            L = compute_layout(510 - (i % 20), 130, 1.0, True, True)
+            t0 = time.perf_counter()
+            frame = renderer.render(L, state)
+            hist.add((time.perf_counter() - t0) * 1000.0)
+        s = hist.summary()
+        print(f"{label:>6}: p50 {s['p50']:.2f} p95 {s['p95']:.2f} ms over {s['count']} frames")
+    if len(sys.argv) > 1:
+        renderer.render(compute_layout(510, 130, 1.0, True, True), state).save(sys.argv[1])
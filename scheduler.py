@@ -0,0 +1,186 @@
+import time
+
+# --- Central Scheduler ---
+# One Tk timer drives every periodic job in the widget. Jobs that come due
+# within the same slack window share a wakeup, and every wakeup is counted so
+# the idle rate can be checked against a budget.
+
+
+class Task:
+    def __init__(self, name, callback, interval, idle_interval=None):
+        self.name = name
+        self.callback = callback
+        self.interval = interval                      # ms while active
+        self.idle_interval = idle_interval or interval  # ms while idle
+        self.due = 0.0
+        self.runs = 0
+
+
+class Scheduler:
+    """Owns all periodic work.
+
+    `after`/`after_cancel` are the host's timer functions (Tk's in the widget,
+    anything with the same shape in tests). A task callback may return a delay
+    in ms to override its next interval once (e.g. slow polling while a menu
+    is open); returning None uses the task's active or idle interval.
+
+    `heartbeat` (optional, see stalls.Heartbeat) is told when each wakeup is
+    due and when it actually ran, which measures the host loop's lag.
+    """
+    SLACK_MS = 4
+
+    def __init__(self, after, after_cancel, clock=time.perf_counter, idle_budget=20):
+        self._after = after
+        self._after_cancel = after_cancel
+        self.clock = clock
+        self.tasks = {}
+        self.idle = False
+        self.idle_budget = idle_budget  # wakeups/s allowed while idle
+        self.stretch = 1.0              # idle interval multiplier when over budget
+        self._job = None
+        self._job_due = None
+        self.running = False
+        self.heartbeat = None
+
+        # Wakeup accounting (counts per 1s window, last full window kept as rates)
+        self._window_start = clock()
+        self._counts = {}
+        self._wakeups = 0
+        self._idle_window = True
+        self.rates = {}
+        self.wakeup_rate = 0
+        self.total_wakeups = 0
+
+    # --- Registration ---
+    def add(self, name, callback, interval, idle_interval=None, delay=0):
+        task = Task(name, callback, interval, idle_interval)
+        task.due = self.clock() + delay / 1000.0
+        self.tasks[name] = task
+        self._arm()
+        return task
+
+    def remove(self, name):
+        self.tasks.pop(name, None)
+        self._arm()
+
+    def poke(self, name):
+        """Makes a task due now (e.g. wake the frame loop when a target changes)."""
+        task = self.tasks.get(name)
+        if task is None:
+            return
+        now = self.clock()
+        if task.due > now:
+            task.due = now
+            self._arm()
+
+    def set_idle(self, idle):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if not idle:
+            # Leaving idle: pull long idle deadlines back to the active cadence
+            now = self.clock()
+            for task in self.tasks.values():
+                task.due = min(task.due, now + task.interval / 1000.0)
+            self._idle_window = False
+        self._arm()
+
+    # --- Loop ---
+    def start(self):
+        self.running = True
+        self._arm()
+
+    def stop(self):
+        self.running = False
+        if self.heartbeat is not None:
+            self.heartbeat.expect(None)
+        if self._job is not None:
+            try:
+                self._after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _arm(self):
+        if not self.running or not self.tasks:
+            if self.heartbeat is not None and self._job is None:
+                self.heartbeat.expect(None) # Nothing armed: nothing to be late for
+            return
+        due = min(t.due for t in self.tasks.values())
+        if self._job is not None:
+            if self._job_due is not None and self._job_due <= due:
+                return
+            try:
+                self._after_cancel(self._job)
+            except Exception:
+                pass
+        delay = max(0, int((due - self.clock()) * 1000))
+        self._job_due = due
+        self._job = self._after(delay, self._wakeup)
+        if self.heartbeat is not None:
+            self.heartbeat.expect(due)
+
+    def _wakeup(self):
+        due = self._job_due
+        self._job = None
+        self._job_due = None
+        if not self.running:
+            return
+        now = self.clock()
+        if self.heartbeat is not None:
+            self.heartbeat.arrive(now, due)
+        self._account_wakeup(now)
+
+        horizon = now + self.SLACK_MS / 1000.0
+        for task in list(self.tasks.values()):
+            if task.due > horizon or self.tasks.get(task.name) is not task:
+                continue
+            task.runs += 1
+            self._counts[task.name] = self._counts.get(task.name, 0) + 1
+            try:
+                delay = task.callback()
+            except Exception as e:
+                print(f"Scheduler task '{task.name}' failed: {e}")
+                delay = None
+            if delay is None:
+                delay = task.idle_interval * self.stretch if self.idle else task.interval
+            task.due = self.clock() + delay / 1000.0
+        self._arm()
+
+    # --- Accounting ---
+    def _account_wakeup(self, now):
+        self._wakeups += 1
+        self.total_wakeups += 1
+        if not self.idle:
+            self._idle_window = False
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.rates = {k: v / elapsed for k, v in self._counts.items()}
+            self.wakeup_rate = self._wakeups / elapsed
+            if self._idle_window:
+                self._enforce_budget()
+            self._counts = {}
+            self._wakeups = 0
+            self._window_start = now
+            self._idle_window = self.idle
+
+    def _enforce_budget(self):
+        # Only windows spent entirely idle count against the budget
+        if self.wakeup_rate > self.idle_budget:
+            self.stretch = min(self.stretch * 1.5, 8.0)
+            print(f"Scheduler: {self.wakeup_rate:.1f} idle wakeups/s over budget {self.idle_budget}, stretching x{self.stretch:.2f}")
+        elif self.wakeup_rate < self.idle_budget * 0.5 and self.stretch > 1.0:
+            self.stretch = max(1.0, self.stretch / 1.5)
+
+    def within_budget(self):
+        """True if the last fully idle window stayed under idle_budget wakeups/s."""
+        return not self.idle or self.wakeup_rate <= self.idle_budget
+
+    def report(self):
+        return {
+            "idle": self.idle,
+            "stretch": round(self.stretch, 2),
+            "wakeups_per_s": round(self.wakeup_rate, 1),
+            "idle_budget": self.idle_budget,
+            "tasks": {name: round(rate, 1) for name, rate in sorted(self.rates.items())},
+        }
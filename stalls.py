@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from perf import PERF
+
+# --- Stall Watchdog ---
+# Each watched thread promises when it will next check in (the scheduler's
+# next timer, the asyncio loop's next sleep). Lateness on arrival feeds a lag
+# histogram; a thread that is late past `threshold` while still blocked gets
+# its stack sampled from the watchdog thread, so jank reports carry the
+# offending call.
+
+
+class Heartbeat:
+    """One watched thread. `expect`/`arrive` are called from that thread only."""
+    def __init__(self, name, thread_id):
+        self.name = name
+        self.thread_id = thread_id
+        self.deadline = None  # perf_counter time the thread should be back by; None = parked
+        self.stalled = None   # deadline that was missed, while the stall lasts
+
+    def expect(self, due):
+        self.deadline = due
+
+    def arrive(self, now, due=None):
+        """Checked in at `now` for a promise made for `due`; records the lag.
+
+        The thread is busy from here on, so the deadline becomes `now`: a
+        callback that blocks after arriving is caught too.
+        """
+        if due is not None:
+            lag = max(0.0, now - due) * 1000.0
+            PERF.record(self.name + "_lag", lag)
+        self.deadline = now
+
+
+class StallWatchdog:
+    """Background thread that samples stacks of threads that missed a heartbeat.
+
+    Sleeps until the earliest deadline could be missed, so a quiet widget
+    costs a few wakeups per second; while a stall lasts it polls every
+    `interval` to time it.
+    """
+    def __init__(self, threshold=0.2, interval=0.05, max_samples=20, depth=12, clock=time.perf_counter):
+        self.threshold = threshold  # s late before a stack is sampled
+        self.interval = interval
+        self.depth = depth          # innermost frames kept per sample
+        self.clock = clock
+        self.beats = []
+        self.samples = deque(maxlen=max_samples)
+        self.stalls = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, name, thread_id=None):
+        hb = Heartbeat(name, thread_id or threading.get_ident())
+        self.beats.append(hb)
+        return hb
+
+    async def watch_loop(self, name="asyncio", interval=0.25):
+        """Coroutine: measures how late the running loop wakes from sleeps."""
+        hb = self.watch(name)
+        try:
+            while True:
+                due = self.clock() + interval
+                hb.expect(due)
+                await asyncio.sleep(interval)
+                hb.arrive(self.clock(), due)
+        finally:
+            hb.expect(None)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="phonon-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self._sleep()):
+            now = self.clock()
+            for hb in list(self.beats):
+                self.check(hb, now)
+
+    def _sleep(self):
+        now = self.clock()
+        wait = 1.0
+        for hb in self.beats:
+            if hb.stalled is not None:
+                return self.interval
+            if hb.deadline is not None:
+                wait = min(wait, hb.deadline + self.threshold - now)
+        return max(self.interval, wait)
+
+    def check(self, hb, now):
+        deadline = hb.deadline
+        if hb.stalled is not None:
+            if deadline != hb.stalled:
+                # Checked in again: the stall lasted until about now
+                PERF.record(hb.name + "_stall", (now - hb.stalled) * 1000.0)
+                hb.stalled = None
+            return
+        if deadline is not None and now - deadline > self.threshold:
+            hb.stalled = deadline
+            self.sample(hb, now - deadline)
+
+    def sample(self, hb, blocked):
+        frame = sys._current_frames().get(hb.thread_id)
+        stack = [line.rstrip() for line in traceback.format_stack(frame)[-self.depth:]] if frame else []
+        self.stalls[hb.name] = self.stalls.get(hb.name, 0) + 1
+        PERF.count(hb.name + "_stalls")
+        self.samples.append({
+            "thread": hb.name,
+            "blocked_ms": round(blocked * 1000.0, 1),
+            "at": time.strftime("%H:%M:%S"),
+            "stack": stack,
+        })
+        where = stack[-1].strip().splitlines()[0] if stack else "?"
+        print(f"Watchdog: {hb.name} blocked {blocked * 1000.0:.0f}ms, at {where}")
+
+    def report(self):
+        return {
+            "threshold_ms": round(self.threshold * 1000.0),
+            "stalls": dict(self.stalls),
+            "samples": list(self.samples),
+        }
@@ -0,0 +1,54 @@
+import threading
+
+from bridge import HIGH, UIBridge
+
+
+def test_wake_once_per_batch():
+    wakes = []
+    bridge = UIBridge(wake=lambda: wakes.append(1))
+    ran = []
+    for i in range(5):
+        bridge.post(ran.append, i)
+    assert len(wakes) == 1
+    bridge.drain()
+    assert ran == [0, 1, 2, 3, 4]
+    bridge.post(ran.append, 5)
+    assert len(wakes) == 2
+
+
+def test_failed_wake_is_rearmed_by_the_next_drain():
+    calls = []
+
+    def wake():
+        calls.append(1)
+        raise RuntimeError("main thread is not in main loop")
+
+    bridge = UIBridge(wake=wake)
+    bridge.post(lambda: None)
+    bridge.post(lambda: None)
+    assert len(calls) == 1
+    bridge.drain()  # the fallback tick
+    bridge.post(lambda: None)
+    assert len(calls) == 2
+
+
+def test_high_priority_and_keyed_coalescing():
+    bridge = UIBridge()
+    ran = []
+    bridge.post(ran.append, "media 1", key="media")
+    bridge.post(ran.append, "hover", priority=HIGH)
+    bridge.post(ran.append, "media 2", key="media")
+    bridge.drain()
+    assert ran == ["hover", "media 2"]
+    assert bridge.coalesced == 1
+
+
+def test_posts_from_other_threads_wait_for_drain():
+    bridge = UIBridge()
+    ran = []
+    t = threading.Thread(target=bridge.post, args=(ran.append, 1))
+    t.start()
+    t.join()
+    assert ran == [] and bridge.depth == 1
+    bridge.drain()
+    assert ran == [1]
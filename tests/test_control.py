@@ -0,0 +1,178 @@
+import asyncio
+
+from control import PAUSED, PLAYING, CommandDispatcher, TransportState
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def transport():
+    clock = Clock()
+    return TransportState(timeout=1.5, clock=clock), clock
+
+
+def test_toggle_shows_expected_until_confirmed():
+    ts, clock = transport()
+    assert ts.toggle(PLAYING) == PAUSED
+    clock.t = 0.3
+    assert ts.reconcile_status(PLAYING) == PAUSED  # poll predates the command
+    assert ts.reconcile_status(PAUSED) == PAUSED
+    assert not ts.is_pending("status") and ts.confirms == 1
+
+
+def test_ignored_toggle_rolls_back_after_timeout():
+    ts, clock = transport()
+    ts.toggle(PLAYING)
+    clock.t = 2.0
+    assert ts.reconcile_status(PLAYING) == PLAYING
+    assert ts.rollbacks == 1 and not ts.is_pending("status")
+
+
+def test_toggling_back_clears_the_pending_state():
+    ts, clock = transport()
+    ts.toggle(PLAYING)
+    assert ts.toggle(PAUSED) == PLAYING
+    assert not ts.is_pending("status")
+
+
+def test_failed_command_returns_the_rollback_point():
+    ts, clock = transport()
+    ts.toggle(PLAYING)
+    ts.toggle(PAUSED)  # back where we started
+    ts.toggle(PLAYING)
+    p = ts.failed("status")
+    assert p.before == PLAYING and ts.rollbacks == 1
+    assert ts.failed("status") is None
+
+
+def test_second_skip_keeps_the_original_track():
+    ts, clock = transport()
+    ts.skip(("A", "x"))
+    ts.skip(("B", "y"))  # pressed again before the first landed
+    assert ts.pending["track"].before == ("A", "x")
+    assert ts.reconcile_track(("A", "x")) == "pending"
+    assert ts.reconcile_track(("C", "z")) == "confirmed"
+    assert ts.reconcile_track(("C", "z")) is None
+
+
+def test_skip_that_never_lands_rolls_back():
+    ts, clock = transport()
+    ts.skip(("A", "x"))
+    clock.t = 1.6
+    assert ts.reconcile_track(("A", "x")) == "rolled_back"
+
+
+def test_seek_position_runs_on_until_a_poll_agrees():
+    ts, clock = transport()
+    ts.seek(60.0)
+    clock.t = 0.5
+    assert ts.reconcile_position(10.0, playing=True) == 60.5  # stale poll masked
+    assert ts.reconcile_position(60.4, playing=True) == 60.4
+    assert not ts.is_pending("position")
+
+
+def dispatcher():
+    clock = Clock()
+    return CommandDispatcher(None, toggle_window=0.15, seek_interval=0.1, scrub_gap=0.5, clock=clock), clock
+
+
+def test_skips_sum_into_one_command():
+    d, clock = dispatcher()
+    assert d.submit("skip", 1)       # first submit starts a drain
+    assert not d.submit("skip", 1)   # the running drain picks these up
+    assert not d.submit("skip", 1)
+    assert d.take() == ("skip", 3)
+    assert d.take() is None and not d.busy
+
+
+def test_next_then_prev_cancels_out():
+    d, clock = dispatcher()
+    d.submit("skip", 1)
+    d.submit("skip", -1)
+    assert d.take() == ("skip", 0)  # sent as 0 so the caller can roll the slide back
+
+
+def test_toggle_parity():
+    for clicks, expected in ((1, [("play_pause", None)]), (2, []), (3, [("play_pause", None)])):
+        d, clock = dispatcher()
+        for _ in range(clicks):
+            d.submit("play_pause")
+        assert abs(d.take() - 0.15) < 1e-9  # waits out the double-click window
+        clock.t = 0.2
+        sent = []
+        while True:
+            cmd = d.take()
+            if cmd is None:
+                break
+            sent.append(cmd)
+        assert sent == expected, clicks
+
+
+def test_skip_drops_a_queued_seek():
+    d, clock = dispatcher()
+    d.submit("seek", 42.0)
+    d.submit("skip", 1)
+    assert d.take() == ("skip", 1)
+    assert d.take() is None
+
+
+def test_drain_sends_one_at_a_time_and_survives_errors():
+    sent = []
+
+    async def execute(kind, value):
+        sent.append((kind, value))
+        if kind == "skip":
+            raise RuntimeError("session gone")
+
+    d = CommandDispatcher(execute, toggle_window=0.0)
+    d.submit("skip", 1)
+    d.submit("play_pause")
+    asyncio.run(d.drain())
+    assert sent == [("skip", 1), ("play_pause", None)]
+    assert d.sent == {"skip": 1, "play_pause": 1} and not d.busy
+
+
+def test_scrub_streams_latest_target_at_seek_interval():
+    d, clock = dispatcher()
+    d.submit("seek", 10.0)
+    assert d.take() == ("seek", 10.0)
+    for i, target in enumerate((11.0, 12.0, 13.0)):
+        clock.t = 0.02 * (i + 1)
+        d.submit("seek", target)  # motion events faster than seek_interval
+    assert abs(d.take() - 0.04) < 1e-9
+    clock.t = 0.1
+    assert d.take() == ("seek", 13.0)  # latest wins, the rest never went out
+
+
+def test_release_on_the_scrubbed_target_is_dropped():
+    d, clock = dispatcher()
+    d.submit("seek", 30.0)
+    assert d.take() == ("seek", 30.0)
+    clock.t = 0.2
+    d.submit("seek", 30.0)  # release lands where the scrub already was
+    assert d.take() is None
+
+
+def test_same_target_in_a_later_scrub_is_sent():
+    d, clock = dispatcher()
+    d.submit("seek", 30.0)
+    assert d.take() == ("seek", 30.0)
+    clock.t = 5.0  # well past scrub_gap
+    d.submit("seek", 30.0)
+    assert d.take() == ("seek", 30.0)
+
+
+def test_skip_forgets_the_last_seek():
+    d, clock = dispatcher()
+    d.submit("seek", 30.0)
+    d.take()
+    d.submit("skip", 1)
+    d.take()
+    clock.t = 0.1
+    d.submit("seek", 30.0)  # same spot on the new track
+    assert d.take() == ("seek", 30.0)
@@ -0,0 +1,78 @@
+from gesture import FLICK, LONG_PRESS, SCRUB, TAP, GestureRecognizer, SampleRing
+
+
+def replay(rec, area, trace):
+    """Press on the first sample, move through the middle, release on the last; returns every gesture fired."""
+    (x0, y0, t0), *middle, (x1, y1, t1) = trace
+    rec.press(x0, y0, t0, area)
+    fired = [g for g in (rec.move(x, y, t) for x, y, t in middle) if g]
+    g = rec.release(x1, y1, t1)
+    return fired + ([g] if g else [])
+
+
+def swipe(dx_per_ms, n=12, x0=100.0, y=50.0, t0=0.0):
+    return [(x0 + dx_per_ms * i, y, t0 + i * 0.001 * 5) for i in range(n)]  # a sample every 5 ms
+
+
+def test_tap():
+    assert replay(GestureRecognizer(), "art", [(10, 10, 0.0), (12, 11, 0.05), (12, 11, 0.1)]) == [(TAP, "art")]
+
+
+def test_fast_swipe_right_is_next_left_is_previous():
+    assert replay(GestureRecognizer(), "art", swipe(10.0)) == [(FLICK, 1)]   # 2000 px/s
+    assert replay(GestureRecognizer(), "art", swipe(-10.0)) == [(FLICK, -1)]
+
+
+def test_flick_fires_once_per_press():
+    rec = GestureRecognizer()
+    assert replay(rec, "art", swipe(10.0, n=30)).count((FLICK, 1)) == 1
+
+
+def test_slow_drag_is_neither_flick_nor_tap():
+    assert replay(GestureRecognizer(), "art", swipe(1.0, n=40)) == []  # 200 px/s
+
+
+def test_slow_start_then_fast_still_flicks():
+    slow = [(100.0 + i, 50.0, i * 0.005) for i in range(10)]
+    fast = [(110.0 + 12.0 * i, 50.0, 0.05 + i * 0.005) for i in range(1, 10)]
+    assert replay(GestureRecognizer(), "art", slow + fast) == [(FLICK, 1)]
+
+
+def test_vertical_swipe_is_not_a_flick():
+    trace = [(100.0 + i, 50.0 + 12.0 * i, i * 0.005) for i in range(12)]
+    assert replay(GestureRecognizer(), "art", trace) == []
+
+
+def test_long_press_fires_from_poll_and_suppresses_tap():
+    rec = GestureRecognizer(long_press=0.5)
+    rec.press(10, 10, 0.0, "art")
+    assert rec.poll(0.3) is None
+    assert rec.poll(0.5) == (LONG_PRESS, "art")
+    assert rec.poll(0.7) is None
+    assert rec.release(10, 10, 0.8) is None
+
+
+def test_moving_cancels_long_press():
+    rec = GestureRecognizer(long_press=0.5)
+    rec.press(10, 10, 0.0, "art")
+    rec.move(30, 10, 0.1)
+    assert rec.poll(0.6) is None
+
+
+def test_scrub_on_seek_bar_follows_x_after_slop():
+    rec = GestureRecognizer(slop=8.0)
+    trace = [(100, 5, 0.0), (104, 5, 0.01), (120, 5, 0.02), (150, 6, 0.03), (160, 6, 0.04)]
+    assert replay(rec, "seek", trace) == [(SCRUB, 120), (SCRUB, 150)]
+
+
+def test_jitter_on_seek_bar_is_a_tap():
+    assert replay(GestureRecognizer(), "seek", [(100, 5, 0.0), (103, 6, 0.02), (102, 5, 0.05)]) == [(TAP, "seek")]
+
+
+def test_ring_keeps_latest_samples_and_regresses_velocity():
+    ring = SampleRing(capacity=4)
+    for i in range(10):
+        ring.push(3.0 * i, -2.0 * i, i * 0.01)
+    assert ring.latest() == (27.0, -18.0, 0.09)
+    vx, vy = ring.velocity(0.05)
+    assert abs(vx - 300.0) < 1e-6 and abs(vy + 200.0) < 1e-6
@@ -0,0 +1,37 @@
+from layout import HitIndex, build_hit_index, compute_layout
+
+
+def test_hit_index_returns_first_zone_in_priority_order():
+    index = HitIndex([("play", 10, 10, 30, 30), ("art", 0, 0, 100, 100)])
+    assert index.hit(20, 20) == "play"
+    assert index.hit(50, 50) == "art"
+    assert index.hit(100, 100) == "art"  # edges are inclusive
+    assert index.hit(101, 50) is None
+    assert index.hit(-1, -1) is None
+
+
+def test_empty_index_hits_nothing():
+    assert HitIndex([]).hit(0, 0) is None
+
+
+def test_built_index_covers_the_layout():
+    L = compute_layout(510, 130, 1.0, True, True)
+    index = build_hit_index(L, True, True, True, True)
+    assert index.hit(L.art_x, L.art_y) == "art"
+    assert index.hit(L.bar_x1 + 5, L.bar_y) == "seek"
+    assert index.hit(L.width - 5, L.height - 5) == "resize"
+    for name, points in (("prev", L.prev_points()), ("next", L.next_points()), ("play", (L.play_points(),))):
+        xs, ys = points[0][0::2], points[0][1::2]
+        assert index.hit(sum(xs) / len(xs), sum(ys) / len(ys)) == name
+
+
+def test_zones_follow_visibility_flags():
+    L = compute_layout(510, 130, 1.0, True, True)
+    index = build_hit_index(L, art=False, progress=False, controls=False, resizable=False)
+    assert index.hit(L.art_x, L.art_y) is None
+    assert index.hit(L.bar_x1 + 5, L.bar_y) is None
+
+
+def test_index_is_memoized_per_layout():
+    L = compute_layout(510, 130, 1.0, True, True)
+    assert build_hit_index(L, True, True, True, False) is build_hit_index(L, True, True, True, False)
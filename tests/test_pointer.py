@@ -0,0 +1,112 @@
+import threading
+
+from pointer import FakePointerSource, HoverTracker, HoverZone, LowLevelHookSource, RevealPredictor
+
+
+def top_zone(revealed=False):
+    # 300x80 island parked at x=800 under a 1920px-wide top edge, 5px lip
+    return HoverZone("top", 800, -75, 300, 80, 5, 1920, revealed)
+
+
+def tracker_with_source():
+    changes = []
+    hover = HoverTracker(RevealPredictor(lead=0.1), on_change=lambda t: changes.append((t.inside, t.likely)))
+    hover.set_zone(top_zone())
+    source = FakePointerSource()
+    source.start(hover.feed)
+    return hover, source, changes
+
+
+def test_trace_into_lip_turns_hover_on_once():
+    hover, source, changes = tracker_with_source()
+    source.play([(950, 400, 0.00), (950, 300, 0.01), (950, 200, 0.02), (950, 3, 0.03), (951, 2, 0.04)])
+    assert hover.inside
+    assert changes.count((True, False)) == 1
+    assert source.position() == (951, 2)
+
+
+def test_fast_approach_is_predicted_before_arrival():
+    hover, source, changes = tracker_with_source()
+    # 2000 px/s straight up: the lip is ~40 ms away at the last sample
+    source.play([(950, 200, 0.00), (950, 160, 0.02), (950, 120, 0.04), (950, 80, 0.06)])
+    assert not hover.inside
+    assert hover.likely
+    assert hover.predictor.predictions >= 1
+
+
+def test_slow_drift_is_not_a_reveal():
+    hover, source, changes = tracker_with_source()
+    source.play([(950, 60 - i, i * 0.1) for i in range(10)])  # 10 px/s
+    assert not hover.inside and not hover.likely
+    assert changes == []
+
+
+def test_leaving_the_window_area_only_counts_once_revealed():
+    hover, source, changes = tracker_with_source()
+    source.move(900, 30, 0.0)  # over where the window would be, below the lip
+    assert not hover.inside
+    hover.set_zone(HoverZone("top", 800, 0, 300, 80, 5, 1920, revealed=True))
+    assert hover.inside
+    source.move(900, 200, 0.1)
+    assert not hover.inside
+
+
+def test_hook_source_delivers_off_the_hook_thread():
+    got = []
+    delivered = threading.Event()
+    source = LowLevelHookSource(get_pos=lambda: (0, 0))
+    source.on_move = lambda x, y, t: (got.append((x, y, threading.get_ident())), delivered.set())
+    worker = threading.Thread(target=source._deliver, daemon=True)
+    worker.start()
+    # What the hook proc does: queue and signal, nothing else
+    source.moves.append((10, 20, 0.0))
+    source._moved.set()
+    assert delivered.wait(1.0)
+    source.stop()
+    worker.join(1.0)
+    assert not worker.is_alive()
+    assert [(x, y) for x, y, _ in got] == [(10, 20)]
+    assert got[0][2] != threading.get_ident()
+
+
+def test_hook_source_poll_requests_a_reinstall_without_doing_it():
+    pos = [(100, 100)]
+    source = LowLevelHookSource(get_pos=lambda: pos[0], clock=lambda: 0.0)
+    fed = []
+    source.on_move = lambda x, y, t: fed.append((x, y))
+    source.poll()
+    pos[0] = (140, 100)
+    source.events += 1  # the hook saw the move
+    source.poll()
+    assert not source._reinstall
+    pos[0] = (180, 100)  # moved, but no hook call since the last poll
+    source.poll()
+    assert source._reinstall and source.reinstalls == 0  # left to the delivery thread
+    assert fed == [(100, 100), (140, 100), (180, 100)]
+
+
+def test_hook_reinstalls_back_off_while_events_stay_away():
+    now = [0.0]
+    pos = [0]
+    source = LowLevelHookSource(get_pos=lambda: (pos[0], 0), retry=1.0, streak=3, max_backoff=8.0,
+                                clock=lambda: now[0])
+    source.on_move = lambda x, y, t: None
+    done = []
+
+    def recentered_poll(t):
+        # SetCursorPos-style movement: never a hook call
+        now[0] = t
+        pos[0] += 50
+        source.poll()
+        if source._reinstall:
+            source._reinstall = False  # what the delivery thread does once reinstalled
+            done.append(t)
+
+    for t in range(60):
+        recentered_poll(float(t))
+    assert done[:3] == [1.0, 2.0, 3.0]
+    gaps = [b - a for a, b in zip(done, done[1:])]
+    assert gaps[2:5] == [2.0, 4.0, 8.0] and max(gaps) == 8.0
+    source.events += 1  # the hook delivers again: back to the short retry
+    recentered_poll(60.0)
+    assert source._failed == 0
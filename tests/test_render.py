@@ -0,0 +1,89 @@
+from PIL import Image
+
+from layout import compute_layout
+from render import FrameState, GlowCache, OffscreenRenderer, diff_frames, render_glow
+
+
+def layout():
+    return compute_layout(510, 130, 1.0, True, True)
+
+
+def state(**kw):
+    art = Image.linear_gradient("L").convert("RGB").resize((300, 300))
+    defaults = dict(title="Track", artist="Artist", curr_time="1:23", total_time="3:45", ratio=0.37,
+                    playing=True, art=art)
+    defaults.update(kw)
+    return FrameState(**defaults)
+
+
+def test_diff_frames():
+    a = Image.new("RGB", (10, 10), "#000000")
+    b = a.copy()
+    assert diff_frames(a, b) == (0, 0)
+    b.putpixel((3, 4), (0, 40, 0))
+    b.putpixel((5, 5), (7, 0, 0))
+    assert diff_frames(a, b) == (2, 40)
+
+
+def test_same_state_renders_identical_frames():
+    renderer = OffscreenRenderer()
+    L = layout()
+    first = renderer.render(L, state())
+    assert first.size == (510, 130)
+    assert diff_frames(first, renderer.render(L, state())) == (0, 0)
+
+
+def test_corners_show_the_key_color():
+    frame = OffscreenRenderer().render(layout(), state(key_color="#000001"))
+    assert frame.getpixel((0, 0)) == (0, 0, 1)
+    assert frame.getpixel((509, 129)) == (0, 0, 1)
+
+
+def test_progress_change_only_touches_the_bar():
+    renderer = OffscreenRenderer()
+    L = layout()
+    a = renderer.render(L, state(ratio=0.2))
+    b = renderer.render(L, state(ratio=0.6))
+    changed, delta = diff_frames(a, b)
+    assert changed > 0 and delta > 0
+    band = (0, int(L.bar_y - 2 * L.dot_r - L.bar_thick), 510, int(L.bar_y + 2 * L.dot_r + L.bar_thick) + 1)
+    assert diff_frames(a.crop(band), b.crop(band))[0] == changed
+
+
+def test_play_pause_glyph_changes_the_frame():
+    renderer = OffscreenRenderer()
+    L = layout()
+    assert diff_frames(renderer.render(L, state(playing=True)), renderer.render(L, state(playing=False)))[0] > 0
+
+
+def test_glow_replaces_the_solid_background():
+    renderer = OffscreenRenderer()
+    L = layout()
+    art = state().art
+    solid = renderer.render(L, state())
+    glow = renderer.render(L, state(glow=render_glow(art, 510, 130, 27, 0.95)))
+    assert diff_frames(solid, glow)[0] > 0
+
+
+def test_late_glow_for_old_art_does_not_evict_the_current_one():
+    old = Image.new("RGB", (64, 64), "#ff0000")
+    new = Image.new("RGB", (64, 64), "#0000ff")
+    cache = GlowCache()
+    cache.use(new, 0.7)
+    current = cache.exact(new, 120, 40, 10, 0.7)
+    late = cache.exact(old, 120, 40, 10, 0.7)  # queued before the track changed
+    assert late is not None and cache.stale == 1
+    assert cache.lookup(new, 120, 40, 10, 0.7) is current
+    assert cache.lookup(old, 120, 40, 10, 0.7) is None
+    assert cache.interim(new, 100, 40, 10, 0.7) is not None
+
+
+def test_use_drops_glows_for_the_previous_art():
+    a = Image.new("RGB", (64, 64), "#ff0000")
+    b = Image.new("RGB", (64, 64), "#00ff00")
+    cache = GlowCache()
+    cache.use(a, 0.7)
+    cache.exact(a, 120, 40, 10, 0.7)
+    cache.use(b, 0.7)
+    assert cache.lookup(a, 120, 40, 10, 0.7) is None
+    assert cache.interim(a, 100, 40, 10, 0.7) is None
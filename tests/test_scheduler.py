@@ -0,0 +1,123 @@
+from scheduler import Scheduler
+
+
+class FakeHost:
+    """after()/after_cancel() on a manual clock; run() fires whatever is due."""
+    def __init__(self):
+        self.now = 0.0
+        self.jobs = {}
+        self.seq = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, ms, fn):
+        self.seq += 1
+        self.jobs[self.seq] = (self.now + ms / 1000.0, fn)
+        return self.seq
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self, until):
+        while True:
+            due = [(t, j) for j, (t, _) in self.jobs.items() if t <= until]
+            if not due:
+                break
+            t, job = min(due)
+            self.now = max(self.now, t)
+            _, fn = self.jobs.pop(job)
+            fn()
+        self.now = until
+
+
+def scheduler(**kw):
+    host = FakeHost()
+    s = Scheduler(host.after, host.after_cancel, clock=host.clock, **kw)
+    return s, host
+
+
+def test_active_and_idle_intervals():
+    s, host = scheduler()
+    runs = []
+    s.add("frame", lambda: runs.append(host.now), 16, idle_interval=250)
+    s.start()
+    host.run(0.1)
+    assert len(runs) == 7  # 0, 16, ... 96 ms
+    s.set_idle(True)
+    n = len(runs)
+    host.run(1.1)
+    assert len(runs) - n == 4  # 250 ms apart once the active deadline passed
+
+
+def test_leaving_idle_pulls_deadlines_back():
+    s, host = scheduler()
+    runs = []
+    s.add("frame", lambda: runs.append(host.now), 16, idle_interval=250)
+    s.set_idle(True)
+    s.start()
+    host.run(0.01)
+    assert runs == [0.0]  # next one is 250 ms out
+    s.set_idle(False)
+    host.run(0.03)
+    assert len(runs) == 2 and runs[1] < 0.03
+
+
+def test_poke_runs_a_task_now_and_returned_delay_is_one_shot():
+    s, host = scheduler()
+    runs = []
+
+    def mouse():
+        runs.append(host.now)
+        return 500 if len(runs) == 1 else None
+
+    s.add("mouse", mouse, 1000)
+    s.start()
+    host.run(0.1)
+    assert runs == [0.0]
+    s.poke("mouse")
+    host.run(0.1)
+    assert runs == [0.0, 0.1]
+    host.run(1.05)
+    assert runs == [0.0, 0.1]  # back to the 1000 ms interval
+    host.run(1.11)
+    assert len(runs) == 3
+    s.poke("missing")  # unknown names are ignored
+
+
+def test_tasks_due_within_slack_share_a_wakeup():
+    s, host = scheduler()
+    s.add("a", lambda: None, 100)
+    s.add("b", lambda: None, 100, delay=3)
+    s.start()
+    host.run(0.001)
+    assert s.total_wakeups == 1
+
+
+def test_idle_budget_stretches_and_recovers():
+    s, host = scheduler(idle_budget=5)
+    s.add("busy", lambda: None, 16, idle_interval=50)  # 20 wakeups/s while idle
+    s.set_idle(True)
+    s.start()
+    host.run(1.05)
+    assert s.stretch == 1.5 and not s.within_budget()
+    host.run(4.0)
+    assert s.stretch > 1.5
+    s.remove("busy")
+    s.add("quiet", lambda: None, 500, idle_interval=1000)
+    host.run(30.0)
+    assert s.stretch == 1.0 and s.within_budget()
+
+
+def test_callback_errors_do_not_stop_the_loop():
+    s, host = scheduler()
+    runs = []
+
+    def flaky():
+        runs.append(host.now)
+        raise ValueError("boom")
+
+    s.add("flaky", flaky, 100)
+    s.start()
+    host.run(0.25)
+    assert len(runs) == 3
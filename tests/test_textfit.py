@@ -0,0 +1,78 @@
+import random
+
+from textfit import TextFitter, fit_text
+
+
+def linear_truncate(text, measure, max_w):
+    # The loop fit_text replaced, kept verbatim as the reference
+    if measure(text) <= max_w: return text
+    while measure(text + "...") > max_w and len(text) > 0:
+        text = text[:-1]
+    return text + "..."
+
+
+def proportional(text):
+    # Uneven glyph widths, like a real proportional font
+    return sum(3 + (ord(c) * 7) % 9 for c in text)
+
+
+class FakeFont:
+    """Tk font stand-in: measure() plus a str() name, counting calls."""
+    def __init__(self, name="TkDefaultFont"):
+        self.name = name
+        self.calls = 0
+
+    def measure(self, text):
+        self.calls += 1
+        return proportional(text)
+
+    def __str__(self):
+        return self.name
+
+
+def test_matches_the_linear_loop():
+    rng = random.Random(46)
+    alphabet = "abcdefghijklmnopqrstuvwxyz ABCDEFGHIJ!?.-'éü"
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        max_w = rng.randint(0, 400)
+        fitted, n = fit_text(text, max_w, proportional)
+        assert fitted == linear_truncate(text, proportional, max_w), (text, max_w)
+
+
+def test_measurements_are_logarithmic():
+    text = "x" * 1000
+    fitted, n = fit_text(text, 300, proportional)
+    assert fitted == linear_truncate(text, proportional, 300)
+    assert n <= 12
+
+
+def test_fitter_hits_skip_measuring():
+    fitter = TextFitter()
+    font = FakeFont()
+    title = "A Rather Long Track Title That Needs Truncating"
+    first = fitter.fit(title, font, 120)
+    calls = font.calls
+    assert fitter.fit(title, font, 120) == first
+    assert font.calls == calls
+    assert fitter.report() == {"hits": 1, "misses": 1, "measurements": calls}
+
+
+def test_fitter_keys_on_font_and_width():
+    fitter = TextFitter()
+    a, b = FakeFont("font1"), FakeFont("font2")
+    fitter.fit("Some Title Here", a, 60)
+    fitter.fit("Some Title Here", b, 60)
+    fitter.fit("Some Title Here", a, 80)
+    assert fitter.misses == 3 and fitter.hits == 0
+
+
+def test_fitter_evicts_least_recently_used():
+    fitter = TextFitter(capacity=2)
+    font = FakeFont()
+    fitter.fit("one", font, 50)
+    fitter.fit("two", font, 50)
+    fitter.fit("one", font, 50)    # refreshes "one"
+    fitter.fit("three", font, 50)  # evicts "two"
+    assert (str(font), "one", 50) in fitter.cache
+    assert (str(font), "two", 50) not in fitter.cache
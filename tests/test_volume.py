@@ -0,0 +1,121 @@
+import volume
+from volume import WHEEL_DELTA, CoreAudioMixer, RecordingVolumeKeys, SimulatedMixer, VolumeController, WheelAccumulator, app_key
+
+
+def wheel(deltas, per_frame):
+    """Feeds deltas `per_frame` at a time with a flush after each frame, like the widget."""
+    keys = RecordingVolumeKeys()
+    acc = WheelAccumulator(keys)
+    for i in range(0, len(deltas), per_frame):
+        for d in deltas[i:i + per_frame]:
+            acc.add(d)
+        acc.flush()
+    return keys, acc
+
+
+def test_notches_in_one_frame_become_one_batch():
+    keys, acc = wheel([WHEEL_DELTA] * 5, per_frame=5)
+    assert keys.batches == [5]
+    assert acc.events == 5 and acc.flushes == 1
+
+
+def test_high_resolution_remainders_carry_over():
+    keys, acc = wheel([30] * 12, per_frame=3)  # 90 per frame, 360 in total
+    assert keys.net == 3
+    assert acc.acc == 0
+
+
+def test_direction_change_drops_the_remainder():
+    keys, acc = wheel([100, -WHEEL_DELTA], per_frame=2)
+    assert keys.batches == [-1]
+
+
+def test_free_spinning_wheel_is_capped_per_flush():
+    keys, acc = wheel([WHEEL_DELTA] * 40, per_frame=40)
+    assert keys.batches == [10]
+
+
+def test_empty_frames_send_nothing():
+    keys, acc = wheel([20, 20], per_frame=1)
+    assert keys.batches == []
+    assert not acc.pending
+
+
+def test_mixer_steps_the_endpoint_one_write_per_flush():
+    mixer = SimulatedMixer(level=0.5)
+    acc = WheelAccumulator(VolumeController(mixer, step=0.02))
+    for _ in range(3):
+        acc.add(WHEEL_DELTA)
+    acc.flush()
+    assert abs(mixer.level - 0.56) < 1e-9
+    assert mixer.writes == 1
+
+
+def test_mixer_level_is_clamped():
+    mixer = SimulatedMixer(level=0.99)
+    ctl = VolumeController(mixer, step=0.02)
+    assert ctl.send(5) == 1.0
+    assert ctl.send(-100) == 0.0
+
+
+def test_app_session_is_preferred_then_falls_back_to_endpoint():
+    mixer = SimulatedMixer(level=0.5, sessions={"Spotify.exe": 0.3})
+    ctl = VolumeController(mixer, step=0.1)
+    ctl.app_id = "SpotifyAB.SpotifyMusic_zpdnekdrzrea0!Spotify"
+    ctl.send(1)
+    assert abs(mixer.sessions["Spotify.exe"] - 0.4) < 1e-9
+    assert ctl.scope == ctl.app_id and mixer.level == 0.5
+    ctl.app_id = "chrome.exe"  # no session: the endpoint takes the step
+    ctl.send(-1)
+    assert abs(mixer.level - 0.4) < 1e-9 and ctl.scope is None
+
+
+class FakeSessions:
+    """Stands in for pycaw's AudioUtilities; counts enumerations."""
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+
+    def GetAllSessions(self):
+        self.calls += 1
+        return [type("Session", (), {"Process": type("Proc", (), {"name": lambda self, n=n: n})(),
+                                     "SimpleAudioVolume": n})() for n in self.names]
+
+
+def test_core_audio_caches_session_misses_for_a_while(monkeypatch):
+    fake = FakeSessions(["chrome.exe"])
+    monkeypatch.setattr(volume, "AudioUtilities", fake, raising=False)
+    now = [0.0]
+    mixer = CoreAudioMixer.__new__(CoreAudioMixer)  # skip the endpoint, sessions only
+    mixer.miss_ttl, mixer.clock = 2.0, lambda: now[0]
+    mixer._sessions, mixer._misses, mixer.enumerations = {}, {}, 0
+    for _ in range(5):
+        assert mixer._session("Spotify.exe") is None
+    assert fake.calls == 1
+    fake.names.append("Spotify.exe")
+    now[0] = 2.5
+    assert mixer._session("Spotify.exe") == "Spotify.exe"
+    assert mixer._session("Spotify.exe") == "Spotify.exe"
+    assert fake.calls == 2
+
+
+def test_app_key():
+    assert app_key("Spotify.exe") == "spotify"
+    assert app_key(None) == ""
+
+
+def test_core_audio_uses_the_wrapped_endpoint_of_newer_pycaw():
+    endpoint = object()
+    device = type("AudioDevice", (), {"EndpointVolume": endpoint})()
+    assert CoreAudioMixer._endpoint(device) is endpoint
+
+
+def test_create_mixer_falls_back_when_activation_fails(monkeypatch):
+    class Broken:
+        @staticmethod
+        def GetSpeakers():
+            raise OSError("no render endpoint")
+
+    monkeypatch.setattr(volume, "PYCAW_AVAILABLE", True)
+    monkeypatch.setattr(volume, "AudioUtilities", Broken, raising=False)
+    assert volume.create_mixer() is None
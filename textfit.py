@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+# --- Text Fitting ---
+# Labels are cut to the text column with an ellipsis. Width is monotonic in
+# the prefix length, so the cut point is binary-searched, and the result is
+# kept per (font, text, width) because the same title comes back every poll.
+
+ELLIPSIS = "..."
+
+
+def fit_text(text, max_w, measure, ellipsis=ELLIPSIS):
+    """Longest prefix of `text` that fits `max_w` px with `ellipsis` appended.
+
+    Returns (fitted, measurements). Text that already fits comes back whole.
+    """
+    if measure(text) <= max_w:
+        return text, 1
+    lo, hi = 0, len(text) - 1  # text[:lo] + ellipsis fits (or lo == 0); text[:hi + 1] + ellipsis doesn't
+    n = 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        n += 1
+        if measure(text[:mid] + ellipsis) <= max_w:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + ellipsis, n
+
+
+class TextFitter:
+    """LRU memo around fit_text for Tk fonts.
+
+    Fonts come from the widget's FontRegistry and are never reconfigured, so
+    a font's Tk name pins its size and the key needs no Tk call.
+    """
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.measurements = 0
+
+    def fit(self, text, font, max_w):
+        return self.fit_with(text, max_w, str(font), font.measure)
+
+    def fit_with(self, text, max_w, font_key, measure):
+        """Same as fit() for any measure(text) -> px, e.g. a PIL font's getlength."""
+        text = text or ""
+        key = (font_key, text, int(max_w))
+        fitted = self.cache.get(key)
+        if fitted is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return fitted
+        fitted, n = fit_text(text, max_w, measure)
+        self.misses += 1
+        self.measurements += n
+        self.cache[key] = fitted
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        return fitted
+
+    def report(self):
+        return {"hits": self.hits, "misses": self.misses, "measurements": self.measurements}
@@ -0,0 +1,97 @@
+import time
+
+# --- Easing ---
+def linear(t):
+    return t
+
+def ease_in_quad(t):
+    return t * t
+
+def ease_out_quad(t):
+    return 1 - (1 - t) * (1 - t)
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+def ease_in_out_cubic(t):
+    return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+def lerp_color(c1, c2, t):
+    """Blend two '#RRGGBB' colors."""
+    r1, g1, b1 = int(c1[1:3], 16), int(c1[3:5], 16), int(c1[5:7], 16)
+    r2, g2, b2 = int(c2[1:3], 16), int(c2[3:5], 16), int(c2[5:7], 16)
+    return '#{:02x}{:02x}{:02x}'.format(int(lerp(r1, r2, t)), int(lerp(g1, g2, t)), int(lerp(b1, b2, t)))
+
+
+# --- Tween Timeline ---
+class Tween:
+    def __init__(self, start, end, duration, on_update, easing=linear, on_done=None, interp=lerp):
+        self.start = start
+        self.end = end
+        self.duration = max(duration, 1e-6)
+        self.on_update = on_update
+        self.easing = easing
+        self.on_done = on_done
+        self.interp = interp
+        self.t0 = None
+
+    def step(self, now):
+        """Applies the value for `now`. Returns True once finished."""
+        if self.t0 is None:
+            self.t0 = now
+        t = min(1.0, (now - self.t0) / self.duration)
+        self.on_update(self.interp(self.start, self.end, self.easing(t)))
+        return t >= 1.0
+
+
+class Timeline:
+    """All fades, slides, pulses and color transitions, advanced by the frame tick.
+
+    Tweens are keyed; adding a tween under a key that is already animating
+    replaces it, so restarting a fade never leaves a stale timer behind.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.tweens = {}
+        self.on_activate = None  # called when the first tween starts (wake the frame loop)
+
+    @property
+    def active(self):
+        return bool(self.tweens)
+
+    def add(self, key, tween):
+        was_idle = not self.tweens
+        self.tweens[key] = tween
+        if was_idle and self.on_activate:
+            self.on_activate()
+        return tween
+
+    def animate(self, key, start, end, duration, on_update, easing=linear, on_done=None, interp=lerp):
+        return self.add(key, Tween(start, end, duration, on_update, easing, on_done, interp))
+
+    def color(self, key, c1, c2, duration, on_update, easing=linear, on_done=None):
+        return self.animate(key, c1, c2, duration, on_update, easing, on_done, interp=lerp_color)
+
+    def cancel(self, key):
+        self.tweens.pop(key, None)
+
+    def is_animating(self, key):
+        return key in self.tweens
+
+    def advance(self, now=None):
+        """Steps every tween once. Returns True while anything is still animating."""
+        if not self.tweens:
+            return False
+        now = self.clock() if now is None else now
+        for key, tween in list(self.tweens.items()):
+            if tween.step(now):
+                # on_done may chain a new tween under the same key
+                if self.tweens.get(key) is tween:
+                    del self.tweens[key]
+                if tween.on_done:
+                    tween.on_done()
+        return bool(self.tweens)
@@ -0,0 +1,277 @@
+import ctypes
+import time
+from ctypes import wintypes
+
+# Optional: direct Core Audio control (falls back to volume keys without it)
+try:
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    PYCAW_AVAILABLE = True
+except Exception:
+    PYCAW_AVAILABLE = False
+
+# --- Volume Input ---
+# Wheel deltas are summed per frame and turned into one batch of volume key
+# presses, so a free-spinning wheel costs one SendInput call per frame
+# instead of two keybd_event calls per notch.
+
+VK_VOLUME_MUTE = 0xAD
+VK_VOLUME_DOWN = 0xAE
+VK_VOLUME_UP = 0xAF
+WHEEL_DELTA = 120
+
+
+# --- SendInput structures (pointer-sized fields, so the x64 layout is right) ---
+ULONG_PTR = ctypes.c_size_t
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [("wVk", wintypes.WORD),
+                ("wScan", wintypes.WORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ULONG_PTR)]
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", wintypes.LONG),
+                ("dy", wintypes.LONG),
+                ("mouseData", wintypes.DWORD),
+                ("dwFlags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ULONG_PTR)]
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [("uMsg", wintypes.DWORD),
+                ("wParamL", wintypes.WORD),
+                ("wParamH", wintypes.WORD)]
+
+class INPUT_I(ctypes.Union):
+    _fields_ = [("ki", KEYBDINPUT),
+                ("mi", MOUSEINPUT),
+                ("hi", HARDWAREINPUT)]
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", wintypes.DWORD),
+                ("ii", INPUT_I)]
+
+
+class VolumeKeys:
+    """Sends volume key presses. `send(steps)`: +n = n x up, -n = n x down."""
+    def send(self, steps):
+        raise NotImplementedError
+
+
+class SendInputVolumeKeys(VolumeKeys):
+    """All presses of a batch go out in a single SendInput call."""
+    MAX_STEPS = 25  # 50 inputs, one notch of the shell OSD per press
+
+    def __init__(self):
+        self._buffer = (INPUT * (2 * self.MAX_STEPS))()
+        self.calls = 0
+
+    def send(self, steps):
+        n = min(abs(steps), self.MAX_STEPS)
+        if not n:
+            return 0
+        vk = VK_VOLUME_UP if steps > 0 else VK_VOLUME_DOWN
+        buf = self._buffer
+        for i in range(n):
+            for j, flags in ((2 * i, 0), (2 * i + 1, KEYEVENTF_KEYUP)):
+                buf[j].type = INPUT_KEYBOARD
+                buf[j].ii.ki = KEYBDINPUT(vk, 0, flags, 0, 0)
+        self.calls += 1
+        return ctypes.windll.user32.SendInput(2 * n, buf, ctypes.sizeof(INPUT))
+
+
+class RecordingVolumeKeys(VolumeKeys):
+    """Test double: keeps every batch instead of injecting it."""
+    def __init__(self):
+        self.batches = []
+
+    def send(self, steps):
+        if steps:
+            self.batches.append(steps)
+        return 2 * abs(steps)
+
+    @property
+    def net(self):
+        return sum(self.batches)
+
+
+class WheelAccumulator:
+    """Sums wheel deltas between flushes.
+
+    High-resolution wheels report fractions of WHEEL_DELTA; the remainder is
+    carried to the next flush so slow scrolling still adds up to a step.
+    """
+    def __init__(self, keys, notch=WHEEL_DELTA, max_steps=10):
+        self.keys = keys
+        self.notch = notch
+        self.max_steps = max_steps  # per flush, so a flung wheel can't jump 0 -> 100
+        self.acc = 0
+        self.events = 0
+        self.flushes = 0
+
+    @property
+    def pending(self):
+        return abs(self.acc) >= self.notch
+
+    def add(self, delta):
+        # A direction change drops whatever was left over from the other way
+        if self.acc and (self.acc > 0) != (delta > 0):
+            self.acc = 0
+        self.acc += delta
+        self.events += 1
+
+    def flush(self):
+        steps = int(self.acc / self.notch)  # truncates toward zero, keeps the sign
+        if not steps:
+            return 0
+        self.acc -= steps * self.notch
+        steps = max(-self.max_steps, min(self.max_steps, steps))
+        self.flushes += 1
+        self.keys.send(steps)
+        return steps
+
+
+# --- Mixers ---
+# Levels are scalars in 0..1. `app_id` selects a per-app session; a mixer
+# returns None from get() when it can't find that session.
+
+def app_key(name):
+    """'Spotify.exe' / 'SpotifyAB.SpotifyMusic_x!Spotify' -> lowercase name to match on."""
+    name = (name or "").lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+class Mixer:
+    def get(self, app_id=None):
+        raise NotImplementedError
+
+    def set(self, level, app_id=None):
+        raise NotImplementedError
+
+
+class SimulatedMixer(Mixer):
+    """In-memory mixer for tests; counts writes so coalescing can be checked."""
+    def __init__(self, level=0.5, sessions=None):
+        self.level = level
+        self.sessions = dict(sessions or {})  # process name -> level
+        self.writes = 0
+
+    def _find(self, app_id):
+        key = app_key(app_id)
+        for name in self.sessions:
+            if app_key(name) in key:
+                return name
+        return None
+
+    def get(self, app_id=None):
+        if app_id is None:
+            return self.level
+        name = self._find(app_id)
+        return None if name is None else self.sessions[name]
+
+    def set(self, level, app_id=None):
+        self.writes += 1
+        if app_id is None:
+            self.level = level
+        else:
+            self.sessions[self._find(app_id)] = level
+
+
+class CoreAudioMixer(Mixer):
+    """Default render endpoint via IAudioEndpointVolume, app sessions via ISimpleAudioVolume.
+
+    Apps with no audio session (paused, or routed elsewhere) are remembered
+    for `miss_ttl` seconds, so a spinning wheel doesn't enumerate every
+    process on each flush.
+    """
+    def __init__(self, miss_ttl=2.0, clock=time.perf_counter):
+        self.endpoint = self._endpoint(AudioUtilities.GetSpeakers())
+        self.endpoint.GetMasterVolumeLevelScalar() # Fail here, not on the first scroll
+        self.miss_ttl = miss_ttl
+        self.clock = clock
+        self._sessions = {}  # app_id -> ISimpleAudioVolume (enumeration walks every process)
+        self._misses = {}    # app_id -> when the last enumeration came up empty
+        self.enumerations = 0
+
+    @staticmethod
+    def _endpoint(speakers):
+        # pycaw 20251023+ returns an AudioDevice wrapper exposing the interface;
+        # older releases return the raw IMMDevice to activate ourselves
+        endpoint = getattr(speakers, "EndpointVolume", None)
+        if endpoint is not None:
+            return endpoint
+        iface = speakers.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        return ctypes.cast(iface, ctypes.POINTER(IAudioEndpointVolume))
+
+    def _session(self, app_id):
+        vol = self._sessions.get(app_id)
+        if vol is not None:
+            return vol
+        missed = self._misses.get(app_id)
+        if missed is not None and self.clock() - missed < self.miss_ttl:
+            return None
+        self.enumerations += 1
+        key = app_key(app_id)
+        for session in AudioUtilities.GetAllSessions():
+            proc = session.Process
+            if proc and app_key(proc.name()) in key:
+                self._misses.pop(app_id, None)
+                vol = self._sessions[app_id] = session.SimpleAudioVolume
+                return vol
+        self._misses[app_id] = self.clock()
+        return None
+
+    def get(self, app_id=None):
+        if app_id is None:
+            return self.endpoint.GetMasterVolumeLevelScalar()
+        try:
+            vol = self._session(app_id)
+            return None if vol is None else vol.GetMasterVolume()
+        except Exception:
+            self._sessions.pop(app_id, None) # Session went away; look it up again next time
+            return None
+
+    def set(self, level, app_id=None):
+        if app_id is None:
+            self.endpoint.SetMasterVolumeLevelScalar(level, None)
+        else:
+            self._session(app_id).SetMasterVolume(level, None)
+
+
+def create_mixer():
+    """CoreAudioMixer when pycaw is installed and an endpoint activates, else None (volume keys)."""
+    if not PYCAW_AVAILABLE:
+        return None
+    try:
+        return CoreAudioMixer()
+    except Exception as e:
+        print(f"Core Audio unavailable, using volume keys: {e}")
+        return None
+
+
+class VolumeController(VolumeKeys):
+    """Applies wheel steps to a mixer. Same send() shape as the key injectors,
+    so WheelAccumulator drives either; one flush is one read and one write.
+    """
+    def __init__(self, mixer, step=0.02):
+        self.mixer = mixer
+        self.step = step
+        self.app_id = None  # per-app target; None = system endpoint
+        self.level = None
+        self.scope = None   # what the last write actually hit
+
+    def send(self, steps):
+        app = self.app_id
+        level = self.mixer.get(app) if app else None
+        if level is None:
+            app = None  # No session for this app (yet): fall back to the endpoint
+            level = self.mixer.get()
+        level = max(0.0, min(1.0, level + steps * self.step))
+        self.mixer.set(level, app)
+        self.level, self.scope = level, app
+        return level
@@ -4,19 +4,35 @@ import sys
 import json
 import threading
 import subprocess
-from ctypes import windll, Structure, c_long, byref, c_short, sizeof, Union
+from ctypes import windll, Structure, c_long, byref, sizeof
 import time
 import datetime
 import io
+import hashlib
 import os
 import ctypes
 import math
-from ctypes import wintypes
 import pystray
+from concurrent.futures import ThreadPoolExecutor
+
+from layout import compute_layout, get_rounded_rect_points, build_hit_index, Visibility, HIDDEN
+from pointer import RevealPredictor, HoverTracker, HoverZone, create_pointer_source
+from gesture import GestureRecognizer, TAP, FLICK, LONG_PRESS, SCRUB
+from volume import WheelAccumulator, SendInputVolumeKeys, VolumeController, create_mixer
+from control import TransportState, CommandDispatcher, PLAYING
+from bridge import UIBridge, HIGH
+from eventloop import WakeableEventLoop, LoopDriver
+from stalls import StallWatchdog
+from textfit import TextFitter
+from timeline import Timeline, ease_in_quad, ease_out_quad, ease_out_cubic
+from scheduler import Scheduler
+from perf import PERF, timed
+from render import (TextSpriteCache, ArtQualityPolicy, make_rounded_image, GlowCache, OffscreenRenderer,
+                    FrameState, FONT_SPECS, LABEL_FONTS, DRAFT_FILTER, FINAL_FILTER)
 
 # --- Ensure Pillow is Importable ---
 try:
-    from PIL import Image, ImageTk, ImageDraw, ImageFilter, ImageEnhance
+    from PIL import Image, ImageTk, ImageDraw
 except ImportError:
     print("CRITICAL: Pillow not installed. Run 'pip install Pillow'")
     sys.exit(1)
@@ -43,6 +59,21 @@ except ImportError as e:
     WINRT_AVAILABLE = False
     GlobalSystemMediaTransportControlsSessionManager = None
 
+# Max wakeups/s while the widget is settled (battery budget, see Scheduler)
+IDLE_WAKEUP_BUDGET = 30
+
+# Seconds a loop may run late before the watchdog samples its stack
+STALL_THRESHOLD = 0.2
+
+# ms a new glow size must hold before the exact blur replaces the stretched one
+GLOW_SETTLE_MS = 150
+
+# ms after a glow lands before the other mode's variant is rendered in the background
+GLOW_PRERENDER_DELAY_MS = 1000
+
+# Seconds the progress area keeps showing the volume after the last wheel step
+VOLUME_OVERLAY_HOLD = 1.2
+
 # --- Mouse Polling Setup ---
 class POINT(Structure):
     _fields_ = [("x", c_long), ("y", c_long)]
@@ -130,87 +161,162 @@ class FocusHelper:
         return False
 
 
-# --- Keyboard Input for Volume ---
-class KEYBDINPUT(Structure):
-    _fields_ = [("wVk", c_short),
-                ("wScan", c_short),
-                ("dwFlags", c_long),
-                ("time", c_long),
-                ("dwExtraInfo", c_long)]
-
-class MOUSEINPUT(Structure):
-    _fields_ = [("dx", c_long),
-                ("dy", c_long),
-                ("mouseData", c_long),
-                ("dwFlags", c_long),
-                ("time", c_long),
-                ("dwExtraInfo", c_long)]
-
-class HARDWAREINPUT(Structure):
-    _fields_ = [("uMsg", c_long),
-                ("wParamL", c_short),
-                ("wParamH", c_short)]
-
-class INPUT_I(Union):
-    _fields_ = [("ki", KEYBDINPUT),
-                ("mi", MOUSEINPUT),
-                ("hi", HARDWAREINPUT)]
-
-class INPUT(Structure):
-    _fields_ = [("type", c_long),
-                ("ii", INPUT_I)]
-
-def send_volume_key(vk):
-    # VK_VOLUME_MUTE = 0xAD, VK_VOLUME_DOWN = 0xAE, VK_VOLUME_UP = 0xAF
-    # KEYEVENTF_KEYUP = 0x0002
-    extra = windll.kernel32.GetMessageExtraInfo()
-    ii_ = INPUT_I()
-    ii_.ki = KEYBDINPUT(vk, 0x48, 0, 0, extra)
-    x = INPUT(1, ii_)
-    windll.user32.SendInput(1, byref(x), sizeof(x))
-    
-    ii_.ki = KEYBDINPUT(vk, 0x48, 2, 0, extra) # Hardware scancode for volume keys isn't strictly needed but good practice
-    x = INPUT(1, ii_)
-    windll.user32.SendInput(1, byref(x), sizeof(x))
-
-
 # --- Helper: Rounded Rectangle ---
-def get_rounded_rect_points(x1, y1, x2, y2, radius=25):
-    points = []
-    # Increase precision for mathematically round corners
-    steps = 10 # Increase for more smoothness
-    # Top Left
-    for i in range(180, 271, steps):
-        ang = math.radians(i)
-        points.extend([x1+radius + radius*math.cos(ang), y1+radius + radius*math.sin(ang)])
-    # Top Right
-    for i in range(270, 361, steps):
-        ang = math.radians(i)
-        points.extend([x2-radius + radius*math.cos(ang), y1+radius + radius*math.sin(ang)])
-    # Bottom Right
-    for i in range(0, 91, steps):
-        ang = math.radians(i)
-        points.extend([x2-radius + radius*math.cos(ang), y2-radius + radius*math.sin(ang)])
-    # Bottom Left
-    for i in range(90, 181, steps):
-        ang = math.radians(i)
-        points.extend([x1+radius + radius*math.cos(ang), y2-radius + radius*math.sin(ang)])
-        
-    return points
-
 def create_rounded_rect(canvas, x1, y1, x2, y2, radius=25, **kwargs):
     points = get_rounded_rect_points(x1, y1, x2, y2, radius)
-    return canvas.create_polygon(points, **kwargs, smooth=True) 
-
-# --- Helper: Rounded Image ---
-def make_rounded_image(pil_img, width, height, radius=0):
-    pil_img = pil_img.resize((int(width), int(height)), Image.Resampling.LANCZOS)
-    mask = Image.new("L", (int(width), int(height)), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.rounded_rectangle((0, 0, int(width), int(height)), radius=radius, fill=255)
-    output = Image.new("RGBA", (int(width), int(height)), (0, 0, 0, 0))
-    output.paste(pil_img, (0, 0), mask)
-    return output
+    return canvas.create_polygon(points, **kwargs, smooth=True)
+
+# --- Retained Scene Graph ---
+class SceneGraph:
+    """Named canvas items that are created once and then only diffed.
+
+    Every option and coordinate we push to Tk is remembered, so re-applying an
+    unchanged value (the common case for a settled widget) costs no Tk call.
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ids = {}      # name -> canvas id
+        self.props = {}    # canvas id -> {option: last applied value}
+        self.coords_ = {}  # canvas id -> last applied coords
+        self.canvas_size = None
+        self.tk_calls = 0
+
+    def _id(self, item):
+        return self.ids[item] if isinstance(item, str) else item
+
+    def add(self, name, kind, coords, **opts):
+        if name in self.ids:
+            return self.ids[name]
+        item = getattr(self.canvas, "create_" + kind)(*coords, **opts)
+        self.tk_calls += 1
+        self.ids[name] = item
+        self.props[item] = {k: self._norm(v) for k, v in opts.items()}
+        self.coords_[item] = self._round(coords)
+        return item
+
+    @staticmethod
+    def _norm(value):
+        # Fonts and images are compared by their Tk name
+        if isinstance(value, (str, int, float, tuple)) or value is None:
+            return value
+        return str(value)
+
+    @staticmethod
+    def _round(coords):
+        return tuple(round(c, 2) for c in coords)
+
+    def config(self, item, **opts):
+        item = self._id(item)
+        cache = self.props.setdefault(item, {})
+        changed = {}
+        for k, v in opts.items():
+            nv = self._norm(v)
+            if cache.get(k, ()) != nv:
+                cache[k] = nv
+                changed[k] = v
+        if changed:
+            self.canvas.itemconfig(item, **changed)
+            self.tk_calls += 1
+        return bool(changed)
+
+    def coords(self, item, *coords):
+        item = self._id(item)
+        key = self._round(coords)
+        if self.coords_.get(item) == key:
+            return False
+        self.coords_[item] = key
+        self.canvas.coords(item, *coords)
+        self.tk_calls += 1
+        return True
+
+    def show(self, item, visible=True):
+        return self.config(item, state="normal" if visible else "hidden")
+
+    def cget(self, item, option, default=None):
+        return self.props.get(self._id(item), {}).get(option, default)
+
+    def resize(self, w, h):
+        if self.canvas_size != (w, h):
+            self.canvas_size = (w, h)
+            self.canvas.config(width=w, height=h)
+            self.tk_calls += 1
+
+# --- Image Slots ---
+class ImageSlots:
+    """One Tk photo per slot and size, updated in place with paste().
+
+    A new PhotoImage is only allocated when a slot's dimensions (or mode)
+    change; otherwise pixels are copied into the existing Tk image and every
+    canvas item showing it redraws without an itemconfig.
+    """
+    def __init__(self, factory=None, sizes_per_slot=2):
+        self.factory = factory or ImageTk.PhotoImage
+        self.sizes_per_slot = sizes_per_slot
+        self.slots = {}  # name -> {(w, h, mode): photo}, oldest first
+        self.allocations = 0
+        self.pastes = 0
+
+    def update(self, name, pil_img):
+        """Returns the photo now holding pil_img for this slot."""
+        photos = self.slots.setdefault(name, {})
+        key = (pil_img.width, pil_img.height, pil_img.mode)
+        photo = photos.pop(key, None)
+        if photo is not None:
+            photo.paste(pil_img)
+            self.pastes += 1
+        else:
+            photo = self.factory(pil_img)
+            self.allocations += 1
+            while len(photos) >= self.sizes_per_slot:
+                photos.pop(next(iter(photos)))
+        photos[key] = photo  # Most recently used last
+        return photo
+
+    def clear(self, name):
+        self.slots.pop(name, None)
+
+# --- Font Registry ---
+class FontRegistry:
+    """Tk named fonts shared by (family, size, weight).
+
+    A scale change points the labels at another registered font instead of
+    reconfiguring one in place, so each size keeps its Tk metrics and going
+    back to a size seen before (island <-> normal) measures nothing.
+    """
+    def __init__(self, root=None):
+        self.root = root
+        self.fonts = {}  # (family, size, weight) -> tkfont.Font
+        self.created = 0
+        self.hits = 0
+
+    def get(self, family, size, weight="normal"):
+        key = (family, size, weight)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        from tkinter import font as tkfont
+        name = f"phonon-{family}-{size}-{weight}".replace(" ", "_")
+        font = tkfont.Font(root=self.root, name=name, family=family, size=size, weight=weight)
+        font.metrics("linespace") # Resolve the font now rather than on its first draw
+        self.fonts[key] = font
+        self.created += 1
+        return font
+
+    def scaled(self, specs, scale):
+        """{attr: font} for every (family, base size, weight) spec at `scale`."""
+        return {attr: self.get(family, int(size * scale), weight) for attr, (family, size, weight) in specs.items()}
+
+    def precompute(self, specs, scales):
+        for scale in scales:
+            self.scaled(specs, scale)
+
+    def report(self):
+        return {"fonts": len(self.fonts), "created": self.created, "hits": self.hits}
+
+# Hit zone -> cursor, and the scene items each button pulses
+HIT_CURSORS = {"prev": "hand2", "next": "hand2", "play": "hand2", "art": "hand2", "seek": "hand2", "resize": "size_nw_se"}
+BUTTON_ITEMS = {"prev": ("prev_1", "prev_2"), "next": ("next_1", "next_2"), "play": ("play", "pause_1", "pause_2")}
 
 # --- Themes Definition ---
 THEMES = {
@@ -397,6 +503,9 @@ class MediaWidget(tk.Tk):
         self.damping = 49
         self.ambilight_enabled = True
         self.ambilight_intensity = 0.95
+        self.text_sprites_enabled = False
+        self.volume_per_app = False
+        self.single_thread_loop = False # asyncio stepped on the Tk thread (restart to apply)
         self.hover_zone_height = 14
         self.lip_size = 9
         self.y_offset = 7
@@ -447,10 +556,22 @@ class MediaWidget(tk.Tk):
         self.last_media_time = 0  # Last time we had valid media
         self.content_hold_duration = 5.0  # Keep showing old content for 5s when no session
         
-        # Gesture Tracking State
-        self.gesture_start_x = 0
-        self.gesture_start_time = 0
-        self.gesture_triggered = False
+        # Gesture Tracking State (flicks/taps/long-press on art, scrubs on seek)
+        self.gestures = GestureRecognizer()
+        # Play/pause/skip show their expected result at once; polls reconcile
+        self.transport = TransportState()
+        # All transport commands funnel through one coalescing queue
+        self.commands = CommandDispatcher(self.execute_command)
+        # Wheel volume: deltas summed per frame, one write per flush. Core Audio
+        # when available (direct level, per-app sessions), volume keys otherwise
+        self.volume = None
+        mixer = create_mixer()
+        if mixer:
+            self.volume = VolumeController(mixer)
+        self.wheel = WheelAccumulator(self.volume or SendInputVolumeKeys())
+        self.volume_level = 0
+        self.volume_overlay_until = 0
+        self.overlay_stash = None
         self.mouse_leave_time = 0
         
         # State Cache
@@ -462,7 +583,10 @@ class MediaWidget(tk.Tk):
         self.tooltip_win = None
         self.tooltip_job = None
         self.tooltip_text = ""
-        self.fade_jobs = {}
+        self.title_full = ""
+        self.artist_full = ""
+        self.artist_truncated = None # Tooltip bindings follow this, not every poll
+        self.text_fit = TextFitter()
         self.title_dy = 0
         self.artist_dy = 0
         
@@ -472,6 +596,29 @@ class MediaWidget(tk.Tk):
         self.vel_w = 0.0
         self.vel_h = 0.0
         
+        # Visibility model: hidden/peeking/shown plus tray and fullscreen occlusion
+        self.visibility = Visibility()
+        self.visibility.on_reveal = self.on_reveal
+        self.deferred_media = None
+        self.glow_deferred = None
+        self.hover = HoverTracker(RevealPredictor(lead=0.1), on_change=self.on_hover_change)
+        self.hover_zone_key = None
+        
+        # Art resampling policy (draft while moving, LANCZOS at rest)
+        self.art_policy = ArtQualityPolicy()
+        self.art_seq = 0 # Bumped per decode request; stale decodes are dropped
+        self.art_inflight = False
+        self.art_digest = None # md5 of the bytes last_pil_img was decoded from
+        
+        # Blocking image work (art decode, glow blur) never runs on the Tk thread
+        self.image_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="phonon-image")
+        
+        # Shared tween timeline (fades, slides, pulses), advanced by animate_physics
+        self.timeline = Timeline()
+        
+        # Window geometry() calls; counted here because they start before the scene exists
+        self.geometry_calls = 0
+
         # Dimension State (Actual current values)
         self.setup_dimensions()
         
@@ -480,15 +627,42 @@ class MediaWidget(tk.Tk):
         
         # Loop Setup
         self.attributes('-alpha', 1.0)
-        self.loop = asyncio.new_event_loop()
-        self.thread = threading.Thread(target=self.run_async_loop, daemon=True)
-        self.thread.start()
+        # Background threads hand results to Tk through the bridge, never Tk directly
+        self.bridge = UIBridge(wake=self.wake_bridge)
+        # Lag histograms for both loops, stack samples when either blocks
+        self.watchdog = StallWatchdog(threshold=STALL_THRESHOLD)
+        self.loop_driver = None
+        if self.single_thread_loop:
+            # Integrated mode: the scheduler steps asyncio below; no second thread
+            self.loop = WakeableEventLoop()
+            self.thread = None
+        else:
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self.run_async_loop, daemon=True)
+            self.thread.start()
         
-        # Periodic
-        self.after(16, self.animate_physics) 
-        self.after(30, self.check_mouse)
+        # Periodic: one central scheduler owns every loop (frame, mouse, config, media)
         self.last_config_mtime = 0
-        self.check_config_reload()
+        self.pending_config_mtime = 0
+        self.media_poll_busy = False
+        self.scheduler = Scheduler(self.after, self.after_cancel, idle_budget=IDLE_WAKEUP_BUDGET)
+        self.scheduler.heartbeat = self.watchdog.watch("tk")
+        self.scheduler.add("frame", self.animate_physics, 16, idle_interval=250, delay=16)
+        # Hover arrives as events when the mouse hook installs; the mouse task
+        # then only runs on hover changes, hide-delay expiry and a slow safety net
+        self.pointer = create_pointer_source(get_mouse_pos, self.hover.feed)
+        if self.pointer.event_driven:
+            self.scheduler.add("mouse", self.check_mouse, 1000, idle_interval=2000, delay=30)
+        else:
+            self.scheduler.add("mouse", self.check_mouse, 30, idle_interval=50, delay=30)
+        self.scheduler.add("config", self.check_config_reload, 200, idle_interval=1000)
+        self.scheduler.add("media", self.poll_media, 500)
+        self.scheduler.add("occlusion", self.check_occlusion, 2000)
+        if self.single_thread_loop:
+            self.start_integrated_loop()
+        self.timeline.on_activate = lambda: self.scheduler.poke("frame")
+        self.scheduler.start()
+        self.watchdog.start()
 
     def setup_dimensions(self, reset_physics=True):
         screen_w = self.winfo_screenwidth()
@@ -547,7 +721,9 @@ class MediaWidget(tk.Tk):
             self.update_dock_side()
         
         # Immediate sync for mode-snapping
-        self.geometry(f"{int(self.width)}x{int(self.height)}+{int(self.current_x)}+{int(self.current_y)}")
+        self.set_geometry(f"{int(self.width)}x{int(self.height)}+{int(self.current_x)}+{int(self.current_y)}")
+        if hasattr(self, 'scheduler'):
+            self.scheduler.poke("frame")
 
     def update_dock_side(self):
         screen_w = self.winfo_screenwidth()
@@ -577,8 +753,10 @@ class MediaWidget(tk.Tk):
                 if self.last_config_mtime == 0:
                     self.last_config_mtime = mtime
                 elif mtime > self.last_config_mtime:
-                     # Allow write to settle
-                    time.sleep(0.05)
+                    if self.pending_config_mtime != mtime:
+                        # Allow write to settle: reload on the next tick instead of sleeping
+                        self.pending_config_mtime = mtime
+                        return 50
                     print("Settings changed. Reloading...")
                     self.last_config_mtime = mtime
                     self.load_config()
@@ -586,10 +764,9 @@ class MediaWidget(tk.Tk):
         except Exception as e:
             print(f"CRITICAL RELOAD ERROR: {e}")
             pass
-        self.after(100, self.check_config_reload)
 
     def apply_config_changes(self):
-        self.deiconify() 
+        self.restore_window()
         self.update_idletasks() 
         
         # CRITICAL: Preserve mode-specific dimensions before setup_dimensions
@@ -610,18 +787,12 @@ class MediaWidget(tk.Tk):
         
         self.setup_dimensions(reset_physics=False)
         
-        # Invalidate art cache to force redraw on setting change
-        self.last_drawn_size = -1
-        self.last_drawn_w = -1
-        
+        # Retained scene: only changed fonts/colors/visibility/coords reach Tk.
+        # The art bitmap is redrawn by update_ui_animation only if its size changed.
         self.setup_ui()
         
-        # Trigger immediate background update if Ambilight state might have changed
-        if hasattr(self, 'last_pil_img') and self.ambilight_enabled:
-             # Force re-process
-             self.run_task(lambda: self.async_process_background(self.last_pil_img, self.width, self.height, self.border_radius))
-        elif not self.ambilight_enabled:
-             self.apply_glow_bg(None)
+        # Glow is re-rendered only if ambilight, size, radius or intensity changed
+        self.refresh_glow()
 
         self.apply_acrylic_effect(self.winfo_id(), THEMES[self.current_theme_name]["acrylic_tint"])
 
@@ -735,6 +906,9 @@ class MediaWidget(tk.Tk):
                     self.dynamic_island_enabled = config.get("dynamic_island_enabled", self.dynamic_island_enabled)
                     self.ambilight_enabled = config.get("ambilight_enabled", self.ambilight_enabled)
                     self.ambilight_intensity = config.get("ambilight_intensity", self.ambilight_intensity * 100) / 100.0
+                    self.text_sprites_enabled = config.get("text_sprites_enabled", self.text_sprites_enabled)
+                    self.volume_per_app = config.get("volume_per_app", self.volume_per_app)
+                    self.single_thread_loop = config.get("single_thread_loop", self.single_thread_loop)
                     
                     # Behavior
                     self.animation_speed = config.get("animation_speed", self.animation_speed)
@@ -800,6 +974,8 @@ class MediaWidget(tk.Tk):
         data["show_artist"] = self.show_artist
         data["show_progress"] = self.show_progress
         data["show_controls"] = self.show_controls
+        data["volume_per_app"] = self.volume_per_app
+        data["single_thread_loop"] = self.single_thread_loop
         
         # REMOVE legacy keys if they exist to prevent pollution
         if "width" in data:
@@ -864,8 +1040,11 @@ class MediaWidget(tk.Tk):
         # 4. Save state (including the new mode flag)
         self.save_config()
         
-        # 5. Restart widget for clean mode switch (fixes border radius glitch)
-        self.restart_app()
+        # 5. Re-target the retained scene in place. The background shape is
+        #    derived from border_radius every frame, so no restart is needed.
+        self.setup_dimensions(reset_physics=False)
+        self.setup_ui()
+        self.refresh_glow()
 
     def setup_ui(self):
         if not hasattr(self, 'canvas'):
@@ -877,235 +1056,401 @@ class MediaWidget(tk.Tk):
             self.canvas.bind("<Motion>", self.on_mouse_move)
             self.canvas.bind("<MouseWheel>", self.on_scroll)
             self.canvas.bind("<Shift-MouseWheel>", self.on_scroll)
+            self.canvas.bind("<Button-3>", self.show_context_menu) # Right Click
 
-        
-        self.canvas.delete("all")
-        # ═══════════════════════════════════════════════════════════
-        # ULTRA PREMIUM MODERN POPUP MENU
-        # ═══════════════════════════════════════════════════════════
-        def show_ctx(e):
-            m = ModernMenu(self, width=240)
-            
-            # Status Section
-            status_icon = "📌" if self.sticky else "📍"
-            m.add_item(f"{status_icon} Stay Visible", self.toggle_sticky)
-            
-            mode_icon = "🔄"
-            mode_label = "Switch to Normal" if self.mode == "island" else "Switch to Island"
-            m.add_item(f"{mode_icon} {mode_label}", self.toggle_mode)
-            
-            m.add_separator()
-            
-            # Appearance Section
-            ambi_label = "✨ Disable Ambilight" if self.ambilight_enabled else "✨ Enable Ambilight"
-            m.add_item(ambi_label, self.toggle_ambilight)
-            
-            # Simplified theme/speed as direct items since submenu is complex for custom canvas
-            m.add_item("🎨 Switch Theme", lambda: self.apply_theme("Light Mode" if self.current_theme_name == "Dark Mode" else "Dark Mode"))
-            
-            m.add_separator()
-            
-            m.add_item("⚙️ Settings", self.launch_settings)
-            m.add_item("🔄 Reload Config", self.apply_config_changes)
-            
-            m.add_separator()
-            
-            m.add_item("🔁 Restart App", self.restart_app)
-            m.add_item("❌ Exit", self.quit_app)
-            
-            m.show(e.x_root, e.y_root)
+            self.scene = SceneGraph(self.canvas)
+            self.build_scene()
 
-        self.canvas.bind("<Button-3>", show_ctx) # Right Click
-        
-        # Background (Image based now)
-        self.bg_img_id = self.canvas.create_image(self.width/2, self.height/2, anchor=tk.CENTER)
-        self.bg_id = create_rounded_rect(self.canvas, 0, 0, self.width, self.height, radius=self.border_radius, fill=self.island_color)
-        # We keep bg_id as a fallback/base layer
-        
-        # --- Fix for Mode Switch: Invalidate Play/Pause IDs ---
-        # Since we just cleared the canvas, these IDs are dead. 
-        # By removing the attributes, update_play_pause_ui will recreate them.
-        if hasattr(self, 'pause_id_1'): del self.pause_id_1
-        if hasattr(self, 'pause_id_2'): del self.pause_id_2
-        if hasattr(self, 'play_id'): del self.play_id
-        
-        # --- Fix for Mode Switch: Restore Glow ---
-        # If we have a glow image ready, apply it immediately to the new bg_img_id
-        if hasattr(self, 'tk_glow_bg') and self.tk_glow_bg:
-            self.canvas.itemconfig(self.bg_img_id, image=self.tk_glow_bg)
-            self.canvas.itemconfig(self.bg_id, state="hidden")
+        # Items are retained across config/theme/mode changes; only re-sync them.
+        self.refresh_scene()
 
-        # --- Fix for Album Art: Force Redraw ---
-        self.last_drawn_size = -1
-        self.last_drawn_w = -1
+    # ═══════════════════════════════════════════════════════════
+    # ULTRA PREMIUM MODERN POPUP MENU
+    # ═══════════════════════════════════════════════════════════
+    def show_context_menu(self, e):
+        m = ModernMenu(self, width=240)
 
+        # Status Section
+        status_icon = "📌" if self.sticky else "📍"
+        m.add_item(f"{status_icon} Stay Visible", self.toggle_sticky)
 
+        mode_icon = "🔄"
+        mode_label = "Switch to Normal" if self.mode == "island" else "Switch to Island"
+        m.add_item(f"{mode_icon} {mode_label}", self.toggle_mode)
+
+        m.add_separator()
+
+        # Appearance Section
+        ambi_label = "✨ Disable Ambilight" if self.ambilight_enabled else "✨ Enable Ambilight"
+        m.add_item(ambi_label, self.toggle_ambilight)
+
+        # Simplified theme/speed as direct items since submenu is complex for custom canvas
+        m.add_item("🎨 Switch Theme", lambda: self.apply_theme("Light Mode" if self.current_theme_name == "Dark Mode" else "Dark Mode"))
+
+        if self.volume:
+            vol_label = "🔈 Wheel: System Volume" if self.volume_per_app else "🔈 Wheel: App Volume"
+            m.add_item(vol_label, self.toggle_volume_scope)
+
+        m.add_separator()
+
+        m.add_item("⚙️ Settings", self.launch_settings)
+        m.add_item("🔄 Reload Config", self.apply_config_changes)
         
-        # Scale fonts based on height
-        base_h = 125
-        scale = self.height / base_h
-        padding = max(10, self.height * 0.12)
-        
-        # Album Art Positioning
-        self.art_size = int(self.height - (padding * 2.2))
-        self.art_x = padding + self.art_size // 2 
-        self.art_y = self.height // 2
-        
-        # Calculate Text Center (Evenly spaced between art and right border)
-        right_margin = 35
-        art_end_x = padding + self.art_size + right_margin
-        text_x = art_end_x + (self.width - art_end_x - right_margin) // 2
+        m.add_separator()
         
-        # Text Styles
-        from tkinter import font as tkfont
-        self.font_title = tkfont.Font(family="Segoe UI Variable Display", size=int(13 * scale), weight="bold")
-        self.font_artist = tkfont.Font(family="Segoe UI Variable Text", size=int(9 * scale), weight="normal")
-        self.font_time = tkfont.Font(family="Segoe UI Variable Text", size=int(9 * scale), weight="bold")
-        self.artist_fg = "#909090"
-        
-        # Vertical stack center values
-        if self.show_progress and self.show_controls:
-            title_y = self.height * 0.22
-            artist_y = self.height * 0.40
-            ctrl_y = self.height * 0.64
-            self.bar_y = self.height * 0.86
-        elif self.show_progress:
-            title_y = self.height * 0.35
-            artist_y = self.height * 0.52
-            self.bar_y = self.height * 0.85
-            ctrl_y = -100
-        elif self.show_controls:
-            title_y = self.height * 0.32
-            artist_y = self.height * 0.50
-            ctrl_y = self.height * 0.75
-            self.bar_y = -100
+        perf_label = "📊 Hide Perf Overlay" if self.perf_overlay_enabled else "📊 Show Perf Overlay"
+        m.add_item(perf_label, self.toggle_perf_overlay)
+        m.add_item("💾 Dump Perf Stats", self.dump_perf_stats)
+
+        m.add_separator()
+
+        m.add_item("🔁 Restart App", self.restart_app)
+        m.add_item("❌ Exit", self.quit_app)
+
+        m.show(e.x_root, e.y_root)
+
+    def build_scene(self):
+        """Creates every canvas item exactly once. Creation order is the z-order."""
+        s = self.scene
+        L = compute_layout(self.width, self.height, None, self.show_progress, self.show_controls)
+
+        # Text Styles: shared named fonts, swapped per scale by update_fonts
+        self.fonts = FontRegistry(self)
+        for attr, font in self.fonts.scaled(FONT_SPECS, L.scale).items():
+            setattr(self, attr, font)
+        # Both modes' sizes up front, so toggle_mode only swaps font names
+        self.fonts.precompute(FONT_SPECS, self.mode_font_scales())
+        self.artist_fg = self.sub_color
+
+        # Reused Tk photos for the art and glow bitmaps
+        self.image_slots = ImageSlots()
+        self.glow_img = None   # PIL source of the glow photo
+        self.glow_cache = GlowCache()
+        self.glow_seq = 0      # Bumped per glow shown or requested; stale renders are dropped
+        self.offscreen = None  # OffscreenRenderer, built on first snapshot
+
+        # Background (Image based now); bg_id is kept as a fallback/base layer
+        self.bg_img_id = s.add("bg_img", "image", (self.width/2, self.height/2), anchor=tk.CENTER)
+        self.bg_id = s.add("bg", "polygon", get_rounded_rect_points(0, 0, self.width, self.height, self.border_radius), smooth=True, fill=self.island_color)
+        self.tk_glow_bg = None
+
+        # Album Art Image and its placeholder
+        self.placeholder_id_rect = s.add("placeholder", "polygon", get_rounded_rect_points(*L.placeholder_box, radius=int(L.art_size*0.25)), smooth=True, fill="#111111", tags="art_group")
+        self.art_id = s.add("art", "image", (L.art_x, L.art_y), anchor=tk.CENTER, state="hidden", tags=("art", "art_group"))
+
+        # SHADOW: Softer color (#121212) and smaller offset for a more premium look
+        self.title_shadow_id = s.add("title_shadow", "text", (L.text_x + 1, L.title_y + 1), text="", font=self.font_title, fill="#121212", anchor="center", tags="expanded_ui")
+        self.title_id = s.add("title", "text", (L.text_x, L.title_y), text="Waiting...", font=self.font_title, fill=self.fg_color, anchor="center", tags="expanded_ui")
+        self.artist_shadow_id = s.add("artist_shadow", "text", (L.text_x + 0.8, L.artist_y + 0.8), text="", font=self.font_artist, fill="#121212", anchor="center", tags="expanded_ui")
+        self.artist_id = s.add("artist", "text", (L.text_x, L.artist_y), text="-", font=self.font_artist, fill=self.artist_fg, anchor="center", tags=("expanded_ui", "artist_label"))
+
+        # Time Labels and Bar
+        self.lbl_curr_time_shadow = s.add("curr_time_shadow", "text", (L.bar_x1 - L.time_gap + 0.5, L.bar_y + 0.5), text="0:00", font=self.font_time, fill="#121212", anchor="e", tags="expanded_ui")
+        self.lbl_curr_time = s.add("curr_time", "text", (L.bar_x1 - L.time_gap, L.bar_y), text="0:00", font=self.font_time, fill=self.fg_color, anchor="e", tags="expanded_ui")
+        self.lbl_total_time_shadow = s.add("total_time_shadow", "text", (L.bar_x2 + L.time_gap + 0.5, L.bar_y + 0.5), text="0:00", font=self.font_time, fill="#121212", anchor="w", tags="expanded_ui")
+        self.lbl_total_time = s.add("total_time", "text", (L.bar_x2 + L.time_gap, L.bar_y), text="0:00", font=self.font_time, fill=self.fg_color, anchor="w", tags="expanded_ui")
+
+        # Optional baked sprites (text + shadow in one image) for the same labels
+        self.px_per_pt = self.winfo_fpixels('1p')
+        self.text_sprites = TextSpriteCache(to_photo=ImageTk.PhotoImage)
+        # The scene keeps only photo names; this keeps the shown photos alive when the LRU evicts them
+        self.label_sprites = {}
+        self.label_text = {"title": "Waiting...", "artist": "-", "curr_time": "0:00", "total_time": "0:00"}
+        for name in LABEL_FONTS:
+            tags = ("expanded_ui", "artist_label") if name == "artist" else "expanded_ui"
+            s.add(name + "_sprite", "image", (-100, -100), anchor=s.cget(name, "anchor"), state="hidden", tags=tags)
+        self.bar_bg_id = s.add("bar_bg", "line", (L.bar_x1, L.bar_y, L.bar_x2, L.bar_y), width=L.bar_thick, fill="#222222", capstyle=tk.ROUND, tags="expanded_ui")
+        self.bar_val_id = s.add("bar_val", "line", (L.bar_x1, L.bar_y, L.bar_x1, L.bar_y), width=L.bar_thick, fill=self.fg_color, capstyle=tk.ROUND, tags="expanded_ui")
+        self.dot_id = s.add("dot", "oval", (L.bar_x1-L.dot_r, L.bar_y-L.dot_r, L.bar_x1+L.dot_r, L.bar_y+L.dot_r), fill=self.fg_color, outline="", tags="expanded_ui")
+        self.bar_coords = (L.bar_x1, L.bar_y, L.bar_x2, L.bar_y)
+        self.bar_y = L.bar_y
+
+        # Transport Buttons
+        prev_a, prev_b = L.prev_points()
+        next_a, next_b = L.next_points()
+        for name, pts, tag in (("prev_1", prev_a, "btn_prev"), ("prev_2", prev_b, "btn_prev"),
+                               ("next_1", next_a, "btn_next"), ("next_2", next_b, "btn_next")):
+            s.add(name, "polygon", pts, fill=self.fg_color, outline=self.fg_color, width=1, joinstyle=tk.ROUND, tags=(tag, "expanded_ui"))
+        pause_a, pause_b = L.pause_points()
+        self.pause_id_1 = s.add("pause_1", "line", pause_a, capstyle=tk.ROUND, tags=("btn_play", "play_icon", "expanded_ui"))
+        self.pause_id_2 = s.add("pause_2", "line", pause_b, capstyle=tk.ROUND, tags=("btn_play", "play_icon", "expanded_ui"))
+        self.play_id = s.add("play", "polygon", L.play_points(), tags=("btn_play", "play_icon", "expanded_ui"))
+
+        # Clicks and cursors resolve through the hit index (see update_ui_animation)
+        self.hits = None
+        self.cursor_name = ""
+
+        # Perf Overlay (topmost, hidden until toggled from the context menu)
+        self.perf_overlay_enabled = False
+        s.add("perf_overlay", "text", (L.padding, 4), text="", font=("Consolas", 7), fill="#7CFC00", anchor="nw", state="hidden")
+
+        # Resize Handle (only shown in normal mode)
+        s.add("resize_handle", "rectangle", (self.width-30, self.height-30, self.width, self.height), fill="", outline="", tags="resize_handle")
+
+    # --- Labels: canvas text + shadow pair, or one baked sprite ---
+    def set_label(self, name, text):
+        self.label_text[name] = text
+        if self.use_text_sprites:
+            self.update_sprite(name)
         else:
-            title_y = self.height * 0.42
-            artist_y = self.height * 0.60
-            ctrl_y = -100
-            self.bar_y = -100
-            
+            self.scene.config(name, text=text)
+            self.scene.config(name + "_shadow", text=text)
+
+    def sprite_font(self, name):
+        """(family, weight, px) a label's sprite is drawn with."""
+        font = getattr(self, LABEL_FONTS[name])
+        return font.cget("family"), font.cget("weight"), max(1, round(font.cget("size") * self.px_per_pt))
+
+    def update_sprite(self, name):
+        family, weight, px = self.sprite_font(name)
+        color = self.artist_fg if name == "artist" else self.fg_color
+        sprite = self.text_sprites.get(self.label_text[name], family, weight, px, color,
+                                       shadow_offset=max(1, round(self.height / 125)))
+        if sprite is not None:
+            self.label_sprites[name] = sprite
+            self.scene.config(name + "_sprite", image=sprite)
+
+    def fit_label(self, name, text, max_w):
+        """Truncates with the font the label is actually drawn with."""
+        if self.use_text_sprites:
+            family, weight, px = self.sprite_font(name)
+            font = self.text_sprites.load_font(family, weight, px)
+            if font is not None:
+                return self.text_fit.fit_with(text, max_w, ("sprite", family, weight, px), font.getlength)
+        return self.text_fit.fit(text, getattr(self, LABEL_FONTS[name]), max_w)
+
+    def place_label(self, name, x, y, shadow_offset):
+        # Sprites carry their shadow, so the per-frame path moves one item per label
+        if self.use_text_sprites:
+            self.scene.coords(name + "_sprite", x, y)
+        else:
+            self.scene.coords(name + "_shadow", x + shadow_offset, y + shadow_offset)
+            self.scene.coords(name, x, y)
+
+    def normal_size(self):
+        """(w, h) stored for normal mode, or None if normal_geometry doesn't parse."""
+        try:
+            # Same WxH+X+Y parsing as setup_dimensions
+            parts = self.normal_geometry.replace('x', '+').split('+')
+            return int(parts[0]), int(parts[1])
+        except (ValueError, IndexError):
+            return None
+
+    def mode_font_scales(self):
+        scales = [self.island_height / 125]
+        size = self.normal_size()
+        if size:
+            scales.append(size[1] / 125)
+        return scales
+
+    def update_fonts(self):
+        fonts = self.fonts.scaled(FONT_SPECS, self.height / 125)
+        for attr, font in fonts.items():
+            setattr(self, attr, font)
+        # The scene diffs by font name: an unchanged scale costs no Tk call
+        for name, attr in LABEL_FONTS.items():
+            self.scene.config(name, font=fonts[attr])
+            self.scene.config(name + "_shadow", font=fonts[attr])
+
+    def refresh_scene(self):
+        """Pushes theme, toggles and fonts into the retained items.
+
+        Only options that actually changed reach Tk, so a theme switch or a
+        settings slider costs a handful of itemconfigs instead of a rebuild.
+        """
+        s = self.scene
+
         # Theme Overrides
         theme = THEMES[self.current_theme_name]
         self.island_color = theme["bg_color"]
         self.fg_color = theme["fg_color"]
         self.sub_color = theme["sub_color"]
         self.artist_fg = self.sub_color
-        
-        # Mode Specific Overrides
-        if self.current_theme_name == "Minimalist":
-            # No art, center everything
-            text_x = self.width // 2
-            self.show_progress = False # Override for minimalist
-            self.bar_y = -100
-            title_y = self.height * 0.45
-            artist_y = self.height * 0.55
-            ctrl_y = -100 # No controls in minimalist? Let's hide them.
-
-        if self.show_title:
-            # SHADOW: Softer color (#121212) and smaller offset for a more premium look
-            self.title_shadow_id = self.canvas.create_text(text_x + 1, title_y + 1, text="", font=self.font_title, fill="#121212", anchor="center", tags="expanded_ui")
-            self.title_id = self.canvas.create_text(text_x, title_y, text="Waiting...", font=self.font_title, fill=self.fg_color, anchor="center", tags="expanded_ui")
-        else:
-            self.title_id = self.canvas.create_text(-1000, -1000, text="", tags="expanded_ui")
-            self.title_shadow_id = self.canvas.create_text(-1000, -1000, text="", tags="expanded_ui")
-        
-        if self.show_artist:
-            # SHADOW: Softer color (#121212) and smaller offset
-            self.artist_shadow_id = self.canvas.create_text(text_x + 0.8, artist_y + 0.8, text="", font=self.font_artist, fill="#121212", anchor="center", tags="expanded_ui")
-            self.artist_id = self.canvas.create_text(text_x, artist_y, text="-", font=self.font_artist, fill=self.artist_fg, anchor="center", tags="expanded_ui")
-        else:
-            self.artist_id = self.canvas.create_text(-1000, -1000, text="", tags="expanded_ui")
-            self.artist_shadow_id = self.canvas.create_text(-1000, -1000, text="", tags="expanded_ui")
+        self.show_art = theme["show_art"]
+        self.update_fonts()
+
+        s.config("bg", fill=self.island_color)
+        s.show("bg", self.tk_glow_bg is None)
+        s.config("title", fill=self.fg_color)
+        s.config("artist", fill=self.artist_fg)
+        for name in ("curr_time", "total_time", "bar_val", "dot"):
+            s.config(name, fill=self.fg_color)
+        for name in ("prev_1", "prev_2", "next_1", "next_2"):
+            s.config(name, fill=self.fg_color, outline=self.fg_color)
+
+        # Visibility
+        show_timeline = theme["show_timeline"]
+        was_sprites = getattr(self, 'use_text_sprites', False)
+        self.use_text_sprites = self.text_sprites_enabled and self.text_sprites.available()
+        label_visible = {
+            "title": self.show_title,
+            "artist": self.show_artist,
+            "curr_time": self.show_progress and show_timeline,
+            "total_time": self.show_progress and show_timeline,
+        }
+        for name, visible in label_visible.items():
+            s.show(name, visible and not self.use_text_sprites)
+            s.show(name + "_shadow", visible and not self.use_text_sprites)
+            s.show(name + "_sprite", visible and self.use_text_sprites)
+            if self.use_text_sprites:
+                self.update_sprite(name) # Re-bakes only if font size or color changed
+            elif was_sprites:
+                self.set_label(name, self.label_text[name])
+        for name in ("bar_bg", "bar_val", "dot"):
+            s.show(name, self.show_progress and show_timeline)
+        for name in ("prev_1", "prev_2", "next_1", "next_2"):
+            s.show(name, self.show_controls and show_timeline)
+        s.show("resize_handle", self.mode == "normal")
+
+        # Play/Pause follows current status; layout handles the rest
+        self.update_ui_animation()
 
-        # Time Labels and Bar
-        if self.show_progress:
-            # Center bar in the available text space
-            bar_w = (self.width - art_end_x - right_margin) * 0.75 # Use 75% of available space
-            bar_w_half = bar_w // 2
-            
-            bar_x1 = text_x - bar_w_half
-            bar_x2 = text_x + bar_w_half
-            self.bar_coords = (bar_x1, self.bar_y, bar_x2, self.bar_y)
-            
-            self.lbl_curr_time_shadow = self.canvas.create_text(bar_x1 - (10 * scale) + 0.5, self.bar_y + 0.5, text="0:00", font=self.font_time, fill="#121212", anchor="e", tags="expanded_ui")
-            self.lbl_curr_time = self.canvas.create_text(bar_x1 - (10 * scale), self.bar_y, text="0:00", font=self.font_time, fill=self.fg_color, anchor="e", tags="expanded_ui")
-            
-            self.lbl_total_time_shadow = self.canvas.create_text(bar_x2 + (10 * scale) + 0.5, self.bar_y + 0.5, text="0:00", font=self.font_time, fill="#121212", anchor="w", tags="expanded_ui")
-            self.lbl_total_time = self.canvas.create_text(bar_x2 + (10 * scale), self.bar_y, text="0:00", font=self.font_time, fill=self.fg_color, anchor="w", tags="expanded_ui")
+    def refresh_glow(self, force=False):
+        """Re-renders the ambilight only when its inputs actually changed."""
+        if self.visibility.suppressed:
+            # Non-critical while parked; rendered once on reveal
+            self.glow_deferred = bool(force or self.glow_deferred)
+            return
+        if not self.ambilight_enabled or not hasattr(self, 'last_pil_img'):
+            self.glow_key = None
+            self.glow_seq += 1
+            self.scheduler.remove("glow")
+            self.apply_glow_bg(None)
+            return
 
-            # Thicker bar (4px)
-            bar_thick = int(4 * scale)
-            self.bar_bg_id = self.canvas.create_line(bar_x1, self.bar_y, bar_x2, self.bar_y, width=bar_thick, fill="#222222", capstyle=tk.ROUND, tags="expanded_ui")
-            self.bar_val_id = self.canvas.create_line(bar_x1, self.bar_y, bar_x1, self.bar_y, width=bar_thick, fill=self.fg_color, capstyle=tk.ROUND, tags="expanded_ui")
-            
-            dot_r = 5.0 * scale
-            self.dot_id = self.canvas.create_oval(bar_x1-dot_r, self.bar_y-dot_r, bar_x1+dot_r, self.bar_y+dot_r, fill=self.fg_color, outline="", tags="expanded_ui")
-            self.seek_hitbox = (bar_x1-20, self.bar_y-20, bar_x2+20, self.bar_y+20)
-        else:
-            self.lbl_curr_time = self.canvas.create_text(-100, -100, text="", tags="expanded_ui")
-            self.lbl_total_time = self.canvas.create_text(-100, -100, text="", tags="expanded_ui")
-            self.bar_coords = (0,0,0,0)
-            self.bar_val_id = self.canvas.create_line(0,0,0,0, tags="expanded_ui")
-            self.dot_id = self.canvas.create_oval(0,0,0,0, tags="expanded_ui")
-            self.seek_hitbox = (0,0,0,0)
+        # Enforce mode-specific dimensions for the glow generation
+        # to prevent "ghosting" of the previous mode's size during transitions
+        w, h, r = self.glow_geometry(self.mode)
 
-        if self.show_controls:
-            btn_offset = 48 * scale 
-            
-            s = 9 * scale 
-            gap_tri = 0.5 * scale
-            self.canvas.create_polygon(text_x - btn_offset, ctrl_y - s, text_x - btn_offset, ctrl_y + s, text_x - btn_offset - s, ctrl_y, fill=self.fg_color, outline=self.fg_color, width=1, joinstyle=tk.ROUND, tags=("btn_prev", "expanded_ui"))
-            self.canvas.create_polygon(text_x - btn_offset + s + gap_tri, ctrl_y - s, text_x - btn_offset + s + gap_tri, ctrl_y + s, text_x - btn_offset + gap_tri, ctrl_y, fill=self.fg_color, outline=self.fg_color, width=1, joinstyle=tk.ROUND, tags=("btn_prev", "expanded_ui"))
-            
-            self.btn_play_id = self.canvas.create_text(text_x, ctrl_y, text="", font=("Arial", 0), tags=("btn_play", "expanded_ui"))
-            
-            self.canvas.create_polygon(text_x + btn_offset, ctrl_y - s, text_x + btn_offset, ctrl_y + s, text_x + btn_offset + s, ctrl_y, fill=self.fg_color, outline=self.fg_color, width=1, joinstyle=tk.ROUND, tags=("btn_next", "expanded_ui"))
-            self.canvas.create_polygon(text_x + btn_offset - s - gap_tri, ctrl_y - s, text_x + btn_offset - s - gap_tri, ctrl_y + s, text_x + btn_offset - gap_tri, ctrl_y, fill=self.fg_color, outline=self.fg_color, width=1, joinstyle=tk.ROUND, tags=("btn_next", "expanded_ui"))
-            
-            self.update_play_pause_ui(4) 
-            
-            for tag in ["btn_prev", "btn_play", "btn_next"]:
-                self.canvas.tag_bind(tag, "<Enter>", lambda e: self.canvas.config(cursor="hand2"))
-                self.canvas.tag_bind(tag, "<Leave>", lambda e: self.canvas.config(cursor=""))
-        else:
-            self.btn_prev_id = None
-            self.btn_play_id = None
-            self.btn_next_id = None
+        img = self.last_pil_img
+        key = (id(img), w, h, r, self.ambilight_intensity)
+        if not force and key == getattr(self, 'glow_key', None):
+            return
+        self.glow_key = key
+        self.glow_cache.use(img, self.ambilight_intensity)
+        glow = self.glow_cache.lookup(img, w, h, r, self.ambilight_intensity, self.bg_key)
+        if glow is not None:
+            # Rendered before or pre-rendered (e.g. the other mode): swap it in this frame
+            self.scheduler.remove("glow")
+            self.glow_seq += 1
+            self.apply_glow_bg(glow)
+            return
+        if not force and self.show_interim_glow(img, w, h, r):
+            # Stretched stand-in now; the exact blur once the size holds still
+            self.scheduler.add("glow", self.settle_glow, GLOW_SETTLE_MS, delay=GLOW_SETTLE_MS)
+            return
+        self.scheduler.remove("glow")
+        self.glow_seq += 1
+        self.image_pool.submit(self.async_process_background, img, w, h, r, self.glow_seq)
+
+    def glow_geometry(self, mode):
+        """(w, h, radius) the glow is rendered at in `mode`."""
+        if mode == "island":
+            return self.island_width, self.island_height, self.island_border_radius
+        if mode == self.mode:
+            return self.width, self.height, self.normal_border_radius # In normal mode, width/height are authoritative
+        size = self.normal_size()
+        return (size[0], size[1], self.normal_border_radius) if size else None
+
+    def prerender_glows(self):
+        """Scheduler one-shot: fills the glow cache for both modes, one pool job per missing shape."""
+        self.scheduler.remove("glow_prerender")
+        if not self.ambilight_enabled or not hasattr(self, 'last_pil_img') or self.visibility.suppressed:
+            return
+        img = self.last_pil_img
+        for mode in ("island", "normal"):
+            geom = self.glow_geometry(mode)
+            if geom and self.glow_cache.lookup(img, *geom, self.ambilight_intensity, self.bg_key) is None:
+                self.image_pool.submit(self.prerender_glow, img, *geom)
+
+    def prerender_glow(self, img, w, h, r):
+        # Image pool: only fills the cache; refresh_glow finds it on the next switch
+        if not self.glow_cache.owns(img, getattr(self, 'ambilight_intensity', 0.7)):
+            return # Track or intensity changed while queued; exact() would drop it anyway
+        try:
+            self.create_glow_background(img.copy(), w, h, r, source=img)
+        except Exception as e:
+            print(f"Glow prerender error: {e}")
+
+    @timed("interim_glow")
+    def show_interim_glow(self, img, w, h, r):
+        glow = self.glow_cache.interim(img, w, h, r, self.ambilight_intensity, self.bg_key)
+        if glow is None:
+            return False
+        self.glow_seq += 1 # An exact render still in flight is for the old size
+        self.apply_glow_bg(glow)
+        return True
+
+    def flush_interim_glow(self):
+        """Scheduler one-shot: one stretched glow for all the resize motion since the last frame."""
+        self.scheduler.remove("glow_interim")
+        self.refresh_glow()
+
+    def settle_glow(self):
+        """Scheduler task: exact glow once a resize or mode switch has settled."""
+        if self.resizing_window:
+            return # Still held; check again after GLOW_SETTLE_MS
+        self.scheduler.remove("glow")
+        self.refresh_glow(force=True)
 
 
-        # Album Art Image
-        self.art_id = self.canvas.create_image(self.art_x, self.art_y, anchor=tk.CENTER, tags=("art", "art_group"))
-        if not hasattr(self, 'last_pil_img'):
-             self.canvas.itemconfig(self.art_id, state="hidden")
-            
-        self.canvas.tag_bind("art", "<Enter>", lambda e: self.canvas.config(cursor="hand2"))
-        self.canvas.tag_bind("art", "<Leave>", lambda e: self.canvas.config(cursor=""))
-        self.canvas.tag_bind("art", "<Button-1>", lambda e: self.run_task(self.focus_source_app))
-
-        # Apply visibility based on theme
-        if not theme["show_art"]:
-            self.canvas.itemconfig("art_group", state="hidden")
-        if not theme["show_timeline"]:
-            self.canvas.itemconfig("expanded_ui", state="hidden")
-            # But keep title/artist visible if they were supposed to be
-            if self.show_title: self.canvas.itemconfig(self.title_id, state="normal")
-            if self.show_artist: self.canvas.itemconfig(self.artist_id, state="normal")
-            # Hide the others
-            if hasattr(self, 'bar_bg_id'): self.canvas.itemconfig(self.bar_bg_id, state="hidden")
-            if hasattr(self, 'bar_val_id'): self.canvas.itemconfig(self.bar_val_id, state="hidden")
-            if hasattr(self, 'dot_id'): self.canvas.itemconfig(self.dot_id, state="hidden")
-            if hasattr(self, 'lbl_curr_time'): self.canvas.itemconfig(self.lbl_curr_time, state="hidden")
-            if hasattr(self, 'lbl_total_time'): self.canvas.itemconfig(self.lbl_total_time, state="hidden")
-
-        
-        # Resize Handle
-        if self.mode == "normal":
-            self.canvas.create_rectangle(self.width-30, self.height-30, self.width, self.height, fill="", outline="", tags="resize_handle")
-            self.canvas.tag_bind("resize_handle", "<Enter>", lambda e: self.canvas.config(cursor="size_nw_se"))
-            self.canvas.tag_bind("resize_handle", "<Leave>", lambda e: self.canvas.config(cursor=""))
+    # ═══════════════════════════════════════════════════════════
+    # PERFORMANCE OVERLAY
+    # ═══════════════════════════════════════════════════════════
+    def perf_extra(self):
+        return {"scheduler": self.scheduler.report(), "tk_calls_total": self.scene.tk_calls + self.geometry_calls,
+                "photo_allocations": self.image_slots.allocations, "photo_pastes": self.image_slots.pastes,
+                "ui_bridge": self.bridge.report(),
+                "event_loop": self.loop_driver.report() if self.loop_driver else "threaded",
+                "watchdog": self.watchdog.report(), "text_fit": self.text_fit.report(),
+                "fonts": self.fonts.report(), "glow": self.glow_cache.report()}
+
+    def toggle_perf_overlay(self):
+        self.perf_overlay_enabled = not self.perf_overlay_enabled
+        if self.perf_overlay_enabled:
+            self.scheduler.add("perf_overlay", self.update_perf_overlay, 500)
+        else:
+            self.scheduler.remove("perf_overlay")
+            self.scene.show("perf_overlay", False)
 
+    def update_perf_overlay(self):
+        wk = self.scheduler.report()
+        text = PERF.overlay_text() + f"  wakeups/s {wk['wakeups_per_s']}{' idle' if wk['idle'] else ''}"
+        self.scene.config("perf_overlay", text=text, state="normal")
+        self.canvas.tag_raise(self.scene.ids["perf_overlay"])
 
+    def dump_perf_stats(self):
+        config_dir = os.path.join(os.path.expanduser("~"), ".phonon")
+        path = os.path.join(config_dir, f"perf_{datetime.datetime.now():%Y%m%d_%H%M%S}.json")
+        try:
+            os.makedirs(config_dir, exist_ok=True)
+            PERF.dump(path, self.perf_extra())
+            print(f"Perf stats written to {path}")
+            # What the widget looked like, for reports that come with stats
+            self.render_offscreen().save(path[:-len(".json")] + ".png")
+        except Exception as e:
+            print(f"Failed to dump perf stats: {e}")
+
+    def frame_state(self):
+        """The current frame's content for the offscreen renderer."""
+        text = self.label_text
+        return FrameState(
+            title=self.title_full or text["title"], artist=self.artist_full or text["artist"],
+            curr_time=text["curr_time"], total_time=text["total_time"],
+            ratio=self.volume_level if self.volume_overlay_active() else self.last_ratio,
+            playing=self.last_status == PLAYING, art=getattr(self, 'last_pil_img', None),
+            glow=self.glow_img, bg_color=self.island_color, fg_color=self.fg_color,
+            sub_color=self.artist_fg, radius=self.border_radius, show_art=self.show_art,
+            show_progress=self.show_progress,
+            show_controls=self.show_controls and THEMES[self.current_theme_name]["show_timeline"],
+            title_dy=self.title_dy, artist_dy=self.artist_dy, key_color=self.bg_key)
+
+    @timed("render_offscreen")
+    def render_offscreen(self):
+        """The whole widget as one PIL image, composited without Tk."""
+        if self.offscreen is None:
+            self.offscreen = OffscreenRenderer(px_per_pt=self.px_per_pt)
+        return self.offscreen.render(self.layout, self.frame_state())
 
     # --- Interaction ---
     def on_click(self, event):
@@ -1117,57 +1462,36 @@ class MediaWidget(tk.Tk):
         self.win_start_w = self.current_width
         self.win_start_h = self.height
         
-        print("\n" + "*"*30)
-        print(f" WIDGET CLICKED AT: {x}, {y}")
-        print("*"*30)
-        sys.stdout.flush()
+        # 1. Interactive Elements, resolved from the layout's hit index (no canvas queries)
+        zone = self.hits.hit(x, y) if self.hits else None
 
-        # 1. Interactive Elements (Priority)
-        # Using a 30x30 bounding area
-        items = self.canvas.find_overlapping(x-15, y-15, x+15, y+15)
-        # Also include the absolute CLOSEST item for thin icons
-        closest = self.canvas.find_closest(x, y, halo=5)
-        all_items = set(list(items) + list(closest))
-        
-        print(f"   Items found: {all_items}")
-        sys.stdout.flush()
-        
-        for i in all_items:
-            tags = self.canvas.gettags(i)
-            print(f"   Checking Piece {i} with Tags: {tags}")
-            sys.stdout.flush()
-            
-            if "btn_prev" in tags:
-                self.run_task(self.svc_prev)
-                self.pulse_btn(i)
-                return
-            elif "btn_next" in tags:
-                self.run_task(self.svc_next)
-                self.pulse_btn(i)
-                return
-            elif "btn_play" in tags:
-                self.run_task(self.svc_play_pause)
-                self.pulse_btn(i)
-                return
-            elif "art" in tags:
-                self.run_task(self.focus_source_app)
-                self.gesture_start_x = event.x_root
-                self.gesture_start_time = time.time()
-                self.gesture_triggered = False
-                return
-            elif "resize_handle" in tags:
-                print("   [CLICK] Resize Handle Hit")
-                self.resizing_window = True
-                return
+        if zone == "prev":
+            self.press_skip(-1)
+            self.pulse_btn(zone)
+            return
+        elif zone == "next":
+            self.press_skip(1)
+            self.pulse_btn(zone)
+            return
+        elif zone == "play":
+            self.press_play_pause()
+            self.pulse_btn(zone)
+            return
+        elif zone == "art":
+            # Tap focuses the source app on release; flicks skip, long press pins
+            self.gestures.press(event.x_root, event.y_root, time.perf_counter(), "art")
+            self.scheduler.add("gesture", self.check_gesture_hold, 50, delay=50)
+            return
+        elif zone == "resize":
+            self.resizing_window = True
+            return
 
-        # 2. Seek Bar (Secondary)
-        if self.show_progress:
-            sx1, sy1, sx2, sy2 = self.seek_hitbox
-            if sx1 <= x <= sx2 and sy1 <= y <= sy2:
-                print("   [CLICK] Seek Bar Hit")
-                self.dragging_slider = True
-                self.update_seek_visual(x)
-                return
+        # 2. Seek Bar (lowest priority zone)
+        if zone == "seek":
+            self.dragging_slider = True
+            self.gestures.press(event.x_root, event.y_root, time.perf_counter(), "seek")
+            self.update_seek_visual(x)
+            return
 
         # 3. Mode-specific Window Dragging
         if self.mode == "normal":
@@ -1192,18 +1516,18 @@ class MediaWidget(tk.Tk):
             
         # Pulse background to show feedback (Premium Dark)
         current_color = self.island_color
-        self.canvas.itemconfig(self.bg_id, fill="#0A0A0A" if self.sticky else self.island_color)
+        self.timeline.cancel("sticky_pulse")
+        self.scene.config("bg", fill="#0A0A0A" if self.sticky else self.island_color)
         if not self.sticky:
-            self.after(200, lambda: self.canvas.itemconfig(self.bg_id, fill=current_color))
+            self.timeline.color("sticky_pulse", "#0A0A0A", current_color, 0.2,
+                                lambda c: self.scene.config("bg", fill=c), easing=ease_out_quad)
 
     def apply_theme(self, theme_name):
         self.current_theme_name = theme_name
         self.save_config()
+        # Recolors the retained items in place; no media re-fetch needed
         self.setup_ui()
         self.apply_acrylic_effect(self.winfo_id(), THEMES[theme_name]["acrylic_tint"])
-        # Trigger an immediate media update to refresh colors
-        if hasattr(self, 'last_track_key') and self.last_track_key:
-            self.update_media_state(self.last_track_key[0], self.last_track_key[1], 0, 1, 0, None)
     
     # ═══════════════════════════════════════════════════════════
     # CONTEXT MENU HELPER METHODS
@@ -1214,10 +1538,7 @@ class MediaWidget(tk.Tk):
         self.ambilight_enabled = not self.ambilight_enabled
         self.save_config()
         # Refresh background immediately instead of restarting
-        if hasattr(self, 'last_track_key') and self.last_track_key:
-            title, artist = self.last_track_key[0], self.last_track_key[1]
-            # Force immediate redraw with current media
-            self.update_media_state(title, artist, 0, 1, 0, self.current_thumbnail_stream if hasattr(self, 'current_thumbnail_stream') else None)
+        self.refresh_glow()
     
     def launch_settings(self):
         """Launch the settings GUI"""
@@ -1256,6 +1577,8 @@ class MediaWidget(tk.Tk):
     def restart_app(self, icon=None, item=None):
         """Restart the widget application"""
         self.running = False
+        self.scheduler.stop()
+        self.pointer.stop()
         
         if hasattr(self, 'tray_icon'):
             self.tray_icon.stop()
@@ -1306,16 +1629,51 @@ class MediaWidget(tk.Tk):
 
     def minimize_to_tray(self):
         self.withdraw()
+        self.visibility.set_minimized(True)
         print("Minimized to System Tray")
 
     def show_window(self, icon=None, item=None):
-        self.after(0, self.deiconify)
-        self.after(0, self.lift)
+        # Called from the tray thread
+        self.bridge.post(self.restore_window, priority=HIGH)
+
+    def restore_window(self):
+        """Undoes minimize_to_tray; every un-hide goes through here so visibility stays in sync."""
+        self.deiconify()
+        self.lift()
+        self.visibility.set_minimized(False)
+
+    def check_occlusion(self):
+        # Fullscreen D3D apps / presentation mode cover even a topmost window
+        try:
+            state = ctypes.c_int(0)
+            windll.shell32.SHQueryUserNotificationState(byref(state))
+            # QUNS_BUSY = 2, QUNS_RUNNING_D3D_FULL_SCREEN = 3, QUNS_PRESENTATION_MODE = 4
+            self.visibility.set_occluded(state.value in (2, 3, 4))
+        except Exception:
+            pass
+
+    def on_reveal(self):
+        """Brings everything skipped while hidden up to date in one pass."""
+        if self.deferred_media:
+            args, self.deferred_media = self.deferred_media, None
+            self.update_media_state(*args)
+        if self.glow_deferred is not None:
+            force, self.glow_deferred = self.glow_deferred, None
+            self.refresh_glow(force)
+        self.update_ui_animation()
+        self.scheduler.poke("frame")
+        self.scheduler.poke("media")
 
     def quit_app(self, icon=None, item=None):
         if hasattr(self, 'tray_icon'):
             self.tray_icon.stop()
         self.running = False
+        self.scheduler.stop()
+        self.watchdog.stop()
+        self.pointer.stop()
+        if self.loop_driver:
+            self.loop_driver.close()
+        self.image_pool.shutdown(wait=False)
         self.destroy()
         sys.exit(0)
     
@@ -1326,18 +1684,59 @@ class MediaWidget(tk.Tk):
         # On Windows, horizontal scroll is often reported as MouseWheel with Shift (0x1)
         if event.state & 0x1: 
             if event.delta > 0:
-                self.run_task(self.svc_prev)
+                self.press_skip(-1)
             else:
-                self.run_task(self.svc_next)
+                self.press_skip(1)
             return
 
-        # 2. Vertical Scroll (Volume)
-        vk = 0xAF if event.delta > 0 else 0xAE
+        # 2. Vertical Scroll (Volume), coalesced until the next frame
+        self.wheel.add(event.delta)
+        if self.wheel.pending and "volume" not in self.scheduler.tasks:
+            self.scheduler.add("volume", self.flush_volume, 16, delay=16)
+
+    def flush_volume(self):
+        if self.volume:
+            self.volume.app_id = getattr(self, 'last_session_id', None) if self.volume_per_app else None
         try:
-             windll.user32.keybd_event(vk, 0, 0, 0) # Press
-             windll.user32.keybd_event(vk, 0, 2, 0) # Release
+            steps = self.wheel.flush()
+            if steps and self.volume:
+                self.show_volume_overlay(self.volume.level)
         except Exception as e:
-             print(f"Volume Injection Error: {e}")
+            print(f"Volume Injection Error: {e}")
+        self.scheduler.remove("volume")
+
+    def toggle_volume_scope(self):
+        self.volume_per_app = not self.volume_per_app
+        self.save_config()
+
+    # --- Volume Overlay (level shown in the progress area while scrolling) ---
+    def volume_overlay_active(self):
+        return time.perf_counter() < self.volume_overlay_until
+
+    def show_volume_overlay(self, level):
+        if not self.show_progress:
+            return
+        if not self.volume_overlay_active():
+            self.overlay_stash = (self.label_text["curr_time"], self.label_text["total_time"])
+        self.volume_overlay_until = time.perf_counter() + VOLUME_OVERLAY_HOLD
+        self.volume_level = level
+        scope = "App" if self.volume.scope else "Vol"
+        self.set_label("curr_time", scope)
+        self.set_label("total_time", f"{round(level * 100)}%")
+        self.update_ui_animation()
+        if "volume_overlay" not in self.scheduler.tasks:
+            self.scheduler.add("volume_overlay", self.end_volume_overlay, 100, delay=VOLUME_OVERLAY_HOLD * 1000)
+
+    def end_volume_overlay(self):
+        remaining = self.volume_overlay_until - time.perf_counter()
+        if remaining > 0:
+            return remaining * 1000 # Extended by later scrolling
+        self.scheduler.remove("volume_overlay")
+        if self.overlay_stash:
+            curr_str, total_str = self.overlay_stash
+            self.set_label("curr_time", curr_str)
+            self.set_label("total_time", total_str)
+        self.update_ui_animation()
 
 
     def launch_settings(self):
@@ -1353,25 +1752,14 @@ class MediaWidget(tk.Tk):
             except: pass
 
     def on_drag(self, event):
-        # 1. Gesture Detection (restricted to art area start)
-        if self.gesture_start_time > 0 and not self.gesture_triggered:
-            dx = event.x_root - self.gesture_start_x
-            dt = time.time() - self.gesture_start_time
-            
-            if dt < 0.2: # Within 200ms
-                if abs(dx) > 100: # Over 100 pixels
-                    if dx > 100:
-                        self.run_task(self.svc_next)
-                    else:
-                        self.run_task(self.svc_prev)
-                    self.gesture_triggered = True
-                    # If gesture triggered, cancel any potential window drag
-                    self.dragging_window = False
-                    return
+        # 1. Gestures own presses that started on the art or seek bar
+        if self.gestures.active:
+            gesture = self.gestures.move(event.x_root, event.y_root, time.perf_counter())
+            if gesture:
+                self.on_gesture(gesture, event)
+            return
 
-        if self.dragging_slider:
-            self.update_seek_visual(event.x)
-        elif self.dragging_window:
+        if self.dragging_window:
             dx = event.x_root - self.drag_start_x
             dy = event.y_root - self.drag_start_y
             self.current_x = self.win_start_x + dx
@@ -1379,7 +1767,7 @@ class MediaWidget(tk.Tk):
             # Force target to follow current exactly during drag
             self.target_x = self.current_x
             self.target_y = self.current_y
-            self.geometry(f"+{int(self.current_x)}+{int(self.current_y)}")
+            self.set_geometry(f"{int(self.current_width)}x{int(self.current_height)}+{int(self.current_x)}+{int(self.current_y)}")
         elif self.resizing_window:
             dx = event.x_root - self.drag_start_x
             dy = event.y_root - self.drag_start_y
@@ -1389,13 +1777,18 @@ class MediaWidget(tk.Tk):
             # Live Resize: Force update immediately 1:1 with mouse
             self.current_width = self.width
             self.current_height = self.height
-            self.geometry(f"{int(self.current_width)}x{int(self.current_height)}+{int(self.current_x)}+{int(self.current_y)}")
+            self.set_geometry(f"{int(self.current_width)}x{int(self.current_height)}+{int(self.current_x)}+{int(self.current_y)}")
             self.update_ui_animation()
+            # Stretched glow follows the new shape, at most once per frame however fast the motion events come
+            if "glow_interim" not in self.scheduler.tasks:
+                self.scheduler.add("glow_interim", self.flush_interim_glow, 16, delay=16)
             
     def on_release(self, event):
-        # Reset Geature State
-        self.gesture_start_time = 0
-        self.gesture_triggered = False
+        if self.gestures.active:
+            gesture = self.gestures.release(event.x_root, event.y_root, time.perf_counter())
+            if gesture:
+                self.on_gesture(gesture, event)
+            self.scheduler.remove("gesture")
 
         if self.dragging_slider:
             self.dragging_slider = False
@@ -1405,11 +1798,13 @@ class MediaWidget(tk.Tk):
             
             if hasattr(self, 'current_media_end') and self.current_media_end > 0:
                 seek_sec = pct * self.current_media_end
-                self.run_task(lambda: self.svc_seek(seek_sec))
+                self.seek_to(seek_sec)
         
         if self.dragging_window or self.resizing_window:
             if self.resizing_window:
-                self.setup_ui() # Finalize the new layout once resizing stops
+                self.setup_ui() # Finalize fonts/layout once resizing stops
+                self.scheduler.remove("glow_interim")
+                self.refresh_glow()
             
             # Save position for Normal mode
             if self.mode == "normal":
@@ -1420,29 +1815,55 @@ class MediaWidget(tk.Tk):
             self.update_dock_side()
             self.save_config()
 
+    def on_gesture(self, gesture, event=None):
+        kind, value = gesture
+        if kind == FLICK:
+            self.press_skip(value)
+        elif kind == SCRUB:
+            # Live scrub: the dispatcher throttles these to one in flight, latest wins
+            sec = self.update_seek_visual(event.x)
+            if sec is not None:
+                self.seek_to(sec)
+        elif kind == LONG_PRESS:
+            self.toggle_sticky()
+        elif kind == TAP and value == "art":
+            self.run_task(self.focus_source_app)
+
+    def check_gesture_hold(self):
+        # Press-and-hold needs a timer: no events arrive while the pointer is still
+        gesture = self.gestures.poll(time.perf_counter())
+        if gesture or not self.gestures.active or self.gestures.moved:
+            self.scheduler.remove("gesture")
+        if gesture:
+            self.on_gesture(gesture)
+
     def update_seek_visual(self, x):
         bx1, _, bx2, _ = self.bar_coords
         clamped_x = max(bx1, min(x, bx2))
-        self.canvas.coords(self.bar_val_id, bx1, self.bar_y, clamped_x, self.bar_y)
-        self.canvas.coords(self.dot_id, clamped_x-5, self.bar_y-5, clamped_x+5, self.bar_y+5)
+        self.scene.coords("bar_val", bx1, self.bar_y, clamped_x, self.bar_y)
+        self.scene.coords("dot", clamped_x-5, self.bar_y-5, clamped_x+5, self.bar_y+5)
         
         if hasattr(self, 'current_media_end') and self.current_media_end > 0:
             pct = (clamped_x - bx1) / (bx2 - bx1)
             sec = pct * self.current_media_end
             t_str = self.format_time(sec)
-            self.canvas.itemconfig(self.lbl_curr_time, text=t_str)
-            if hasattr(self, 'lbl_curr_time_shadow'):
-                self.canvas.itemconfig(self.lbl_curr_time_shadow, text=t_str)
-
-    def pulse_btn(self, item):
-        # Determine original color if possible, or just use white/artist_fg
-        tags = self.canvas.gettags(item)
-        orig_color = self.fg_color
-        if "btn_shuffle" in tags or "btn_loop" in tags:
-             orig_color = self.artist_fg
-             
-        self.canvas.itemconfig(item, fill=self.sub_color)
-        self.after(100, lambda: self.canvas.itemconfig(item, fill=orig_color))
+            self.set_label("curr_time", t_str)
+            return sec
+        return None
+
+    def seek_to(self, sec):
+        # Position clock follows the target until a poll catches up
+        self.transport.seek(sec)
+        self.last_ratio = sec / self.current_media_end
+        self.send_command("seek", sec)
+
+    def pulse_btn(self, zone):
+        # Flash every piece of the button to sub_color, then ease back on the shared timeline
+        items = BUTTON_ITEMS[zone]
+        def paint(c):
+            for item in items:
+                self.scene.config(item, fill=c)
+        self.timeline.color(("pulse", zone), self.sub_color, self.fg_color, 0.15, paint, easing=ease_in_quad)
 
     def format_time(self, seconds):
         if seconds < 0: seconds = 0
@@ -1451,28 +1872,36 @@ class MediaWidget(tk.Tk):
         return f"{m}:{s:02d}"
 
     def on_mouse_move(self, event):
-        # Handle seek bar hover cursor
-        if self.show_progress:
-            x, y = event.x, event.y
-            sx1, sy1, sx2, sy2 = self.seek_hitbox
-            if sx1 <= x <= sx2 and sy1 <= y <= sy2:
-                self.canvas.config(cursor="hand2")
-                return
-        
-        # If not over seek bar or buttons (handled by tag_bind)
-        # We check overlapping for buttons just in case or let tag_bind handle it.
-        # Actually tag_bind handles it better. But we need to reset if not over anything.
-        items = self.canvas.find_overlapping(event.x, event.y, event.x, event.y)
-        is_over_button = any(tag in self.canvas.gettags(i) for i in items for tag in ["btn_prev", "btn_play", "btn_next"])
-        
-        if not is_over_button:
-            self.canvas.config(cursor="")
+        # Cursor follows the hit zone; Tk is only told when it actually changes
+        zone = self.hits.hit(event.x, event.y) if self.hits else None
+        self.set_cursor(HIT_CURSORS.get(zone, ""))
+
+    def set_cursor(self, cursor):
+        if cursor != self.cursor_name:
+            self.cursor_name = cursor
+            self.canvas.config(cursor=cursor)
 
     # --- Animation ---
+    @timed("animate_physics")
     def animate_physics(self):
+        if self.scheduler.idle:
+            PERF.break_frames() # Idle cadence is intentional, not dropped frames
+        else:
+            PERF.frame(0.016)
+        tk_calls_before = self.scene.tk_calls + self.geometry_calls
+        
+        # Results posted by background threads land before this frame's layout
+        if self.bridge.depth:
+            self.bridge.drain()
+
+        # Advance fades/slides/pulses first so this frame's layout sees them
+        animating = self.timeline.advance()
+        
         if self.dragging_window or self.resizing_window:
             self.vel_x = self.vel_y = self.vel_w = self.vel_h = 0
-            self.after(16, self.animate_physics)
+            if animating and self.dragging_window:
+                self.update_ui_animation()
+            self.scheduler.set_idle(False)
             return
 
         # Target selection
@@ -1512,14 +1941,38 @@ class MediaWidget(tk.Tk):
         if abs(target_x - self.current_x) < eps and abs(self.vel_x) < v_eps: self.current_x = target_x; self.vel_x = 0
         if abs(target_y - self.current_y) < eps and abs(self.vel_y) < v_eps: self.current_y = target_y; self.vel_y = 0
 
-        self.geometry(f"{int(self.current_width)}x{int(self.current_height)}+{int(self.current_x)}+{int(self.current_y)}")
+        self.set_geometry(f"{int(self.current_width)}x{int(self.current_height)}+{int(self.current_x)}+{int(self.current_y)}")
         
-        # Update Canvas Elements
-        self.update_ui_animation()
-
-        self.after(16, self.animate_physics) 
-
+        # Settled springs and no tweens -> let the scheduler drop to idle cadence
+        settled = (self.vel_w == self.vel_h == self.vel_x == self.vel_y == 0 and
+                   self.current_width == target_w and self.current_height == target_h and
+                   self.current_x == target_x and self.current_y == target_y)
+        self.visibility.update(self.dock_side, self.current_x, self.current_y,
+                               getattr(self, 'x_hidden', 0), self.y_hidden, settled)
+        self.update_hover_zone()
+        
+        # Update Canvas Elements (skipped while parked; on_reveal catches up)
+        if not self.visibility.suppressed:
+            self.update_ui_animation()
+        elif self.art_policy.pending:
+            # The draft can't settle unseen and would keep the frame loop awake;
+            # dropping it makes the first frame after on_reveal a final render
+            self.art_policy.invalidate()
+
+        # A pending high-quality art pass keeps frames coming until it lands
+        self.scheduler.set_idle(settled and not self.timeline.active and not self.art_policy.pending)
+        PERF.record("tk_calls_per_frame", self.scene.tk_calls + self.geometry_calls - tk_calls_before)
+
+    def set_geometry(self, geom):
+        # Skip the Tk round trip when nothing moved (the settled case)
+        if geom != getattr(self, 'last_geometry', None):
+            self.last_geometry = geom
+            self.geometry(geom)
+            self.geometry_calls += 1
+
+    @timed("update_ui_animation")
     def update_ui_animation(self):
+        s = self.scene
         # Update Background Rounded Rect (No flickering)
         # Force strict compliance with mode dimensions for the background shape
         draw_w, draw_h = self.current_width, self.current_height
@@ -1530,143 +1983,94 @@ class MediaWidget(tk.Tk):
              draw_w, draw_h = self.island_width, self.island_height
         
         # URGENT: Ensure canvas matches current window size to avoid clipping
-        self.canvas.config(width=int(draw_w), height=int(draw_h))
-             
-        points = get_rounded_rect_points(0, 0, draw_w, draw_h, radius=self.border_radius)
-        self.canvas.coords(self.bg_id, *points)
+        s.resize(int(draw_w), int(draw_h))
+        s.coords("bg", *get_rounded_rect_points(0, 0, draw_w, draw_h, radius=self.border_radius))
         
-        has_glow = self.canvas.itemcget(self.bg_img_id, "image") != ""
-        if has_glow:
-            self.canvas.coords(self.bg_img_id, self.current_width/2, self.current_height/2)
-            self.canvas.itemconfig(self.bg_id, state="hidden")
+        if self.tk_glow_bg is not None:
+            s.coords("bg_img", self.current_width/2, self.current_height/2)
+            s.show("bg", False)
         else:
-            self.canvas.itemconfig(self.bg_id, state="normal")
+            s.show("bg", True)
 
-        # Reposition and scaling of art
-        scale = self.current_height / 125.0
-        padding = max(10, self.current_height * 0.12)
-        target_h = int(self.current_height - (padding * 2.2))
-        
-        # Calculate aspect ratio
-        art_w, art_h = target_h, target_h # Default square
-        if hasattr(self, 'last_pil_img') and self.last_pil_img:
+        # Reposition and scaling of art (aspect-correct, capped in compute_layout)
+        has_art = hasattr(self, 'last_pil_img') and self.last_pil_img
+        aspect = None
+        if has_art:
             ow, oh = self.last_pil_img.size
             aspect = ow / oh
-            art_w = target_h * aspect
-            art_h = target_h
-            # Cap width to 45% of widget
-            if art_w > self.current_width * 0.45:
-                art_w = self.current_width * 0.45
-                art_h = art_w / aspect
-        
-        art_x = padding + art_w // 2
-        art_y = self.current_height / 2
-        self.last_art_w = art_w # Store for update_media_state
-        
-        self.canvas.coords(self.art_id, art_x, art_y)
-        
-        if hasattr(self, 'last_pil_img') and self.last_pil_img:
-            # We use art_w as the key for redraw check
-            if not hasattr(self, 'last_drawn_w') or abs(self.last_drawn_w - art_w) > 3:
-                self.last_drawn_w = art_w
-                self.redraw_art_image(art_w, art_h)
-            self.canvas.itemconfig(self.art_id, state="normal")
-            if hasattr(self, 'placeholder_id_rect'):
-                self.canvas.itemconfig(self.placeholder_id_rect, state="hidden")
+        L = compute_layout(self.current_width, self.current_height, aspect, self.show_progress, self.show_controls)
+        self.layout = L
+        self.hits = build_hit_index(L, bool(has_art and self.show_art), self.show_progress,
+                                    self.show_controls and THEMES[self.current_theme_name]["show_timeline"],
+                                    self.mode == "normal")
+        self.last_art_w = L.art_w # Store for update_media_state
+        
+        s.coords("art", L.art_x, L.art_y)
+        
+        if has_art:
+            # Cheap resampling while the springs move, one LANCZOS pass once settled
+            moving = self.vel_w != 0 or self.vel_h != 0 or self.resizing_window
+            quality = self.art_policy.on_frame(L.art_w, L.art_h, moving)
+            if quality:
+                self.redraw_art_image(L.art_w, L.art_h, quality)
+            s.show("art", self.show_art)
+            s.show("placeholder", False)
         else:
-            self.canvas.itemconfig(self.art_id, state="hidden")
             # Handle placeholder (stays square)
-            art_size = target_h
-            x1, y1 = padding, art_y - art_size/2
-            x2, y2 = x1 + art_size, y1 + art_size
-            if not hasattr(self, 'placeholder_id_rect'):
-                self.placeholder_id_rect = create_rounded_rect(self.canvas, x1, y1, x2, y2, radius=int(art_size*0.25), fill="#111111", tags="art_group")
-            else:
-                self.canvas.itemconfig(self.placeholder_id_rect, state="normal")
-                p_points = get_rounded_rect_points(x1, y1, x2, y2, radius=int(art_size*0.25))
-                self.canvas.coords(self.placeholder_id_rect, *p_points)
-            art_w = art_size # for layout calc
-
-        # Reposition UI Elements
-        right_margin = 35 * scale
-        art_end_x = padding + art_w + right_margin
-        text_x = art_end_x + (self.current_width - art_end_x - (25 * scale)) // 2
-        
-        # Vertical stack center values
-        if self.show_progress and self.show_controls:
-            title_y, artist_y, ctrl_y, bar_y = self.current_height*0.22, self.current_height*0.40, self.current_height*0.64, self.current_height*0.86
-        elif self.show_progress:
-            title_y, artist_y, bar_y, ctrl_y = self.current_height*0.35, self.current_height*0.52, self.current_height*0.85, -100
-        elif self.show_controls:
-            title_y, artist_y, ctrl_y, bar_y = self.current_height*0.32, self.current_height*0.50, self.current_height*0.75, -100
-        else:
-            title_y, artist_y, ctrl_y, bar_y = self.current_height*0.42, self.current_height*0.60, -100, -100
+            s.show("art", False)
+            s.coords("placeholder", *get_rounded_rect_points(*L.placeholder_box, radius=int(L.art_size*0.25)))
+            s.show("placeholder", self.show_art)
 
         # Apply transition offsets (for smooth song change)
         dy_t = getattr(self, 'title_dy', 0)
         dy_a = getattr(self, 'artist_dy', 0)
         
-        offset = 0.8 * scale
-        self.canvas.coords(self.title_shadow_id, text_x + offset, title_y + dy_t + offset)
-        self.canvas.coords(self.title_id, text_x, title_y + dy_t)
-        
-        self.canvas.coords(self.artist_shadow_id, text_x + offset, artist_y + dy_a + offset)
-        self.canvas.coords(self.artist_id, text_x, artist_y + dy_a)
+        self.place_label("title", L.text_x, L.title_y + dy_t, L.shadow_offset)
+        self.place_label("artist", L.text_x, L.artist_y + dy_a, L.shadow_offset)
         
         if self.show_progress:
-            bar_w = (self.current_width - art_end_x - right_margin) * 0.75
-            bar_x1, bar_x2 = text_x - bar_w//2, text_x + bar_w//2
-            self.bar_coords = (bar_x1, bar_y, bar_x2, bar_y)
+            self.bar_coords = (L.bar_x1, L.bar_y, L.bar_x2, L.bar_y)
+            self.bar_y = L.bar_y
             
-            self.canvas.coords(self.bar_bg_id, bar_x1, bar_y, bar_x2, bar_y)
-            self.canvas.coords(self.lbl_curr_time_shadow, bar_x1 - (10 * scale) + 0.5, bar_y + 0.5)
-            self.canvas.coords(self.lbl_curr_time, bar_x1 - (10 * scale), bar_y)
-            self.canvas.coords(self.lbl_total_time_shadow, bar_x2 + (10 * scale) + 0.5, bar_y + 0.5)
-            self.canvas.coords(self.lbl_total_time, bar_x2 + (10 * scale), bar_y)
+            s.config("bar_bg", width=L.bar_thick)
+            s.config("bar_val", width=L.bar_thick)
+            s.coords("bar_bg", L.bar_x1, L.bar_y, L.bar_x2, L.bar_y)
+            self.place_label("curr_time", L.bar_x1 - L.time_gap, L.bar_y, 0.5)
+            self.place_label("total_time", L.bar_x2 + L.time_gap, L.bar_y, 0.5)
             
             if not self.dragging_slider:
-                new_x = bar_x1 + (bar_w * self.last_ratio)
-                self.canvas.coords(self.bar_val_id, bar_x1, bar_y, new_x, bar_y)
-                dot_r = 5.0 * scale
-                self.canvas.coords(self.dot_id, new_x-dot_r, bar_y-dot_r, new_x+dot_r, bar_y+dot_r)
+                ratio = self.volume_level if self.volume_overlay_active() else self.last_ratio
+                new_x = L.bar_x_at(ratio)
+                s.coords("bar_val", L.bar_x1, L.bar_y, new_x, L.bar_y)
+                s.coords("dot", new_x-L.dot_r, L.bar_y-L.dot_r, new_x+L.dot_r, L.bar_y+L.dot_r)
+        else:
+            self.bar_coords = (0,0,0,0)
         
+        # Reposition Play/Pause and Prev/Next Buttons (Must work in ALL modes)
+        self.update_play_pause_ui(self.last_status)
         if self.show_controls:
-            btn_offset = 48 * scale
-            s = 9 * scale
-            gap = 0.5 * scale
-            
-            # Reposition Play Button
-            self.canvas.coords(self.btn_play_id, text_x, ctrl_y)
-            self.update_play_pause_ui(self.last_status, text_x, ctrl_y)
-            
-            # Reposition Prev/Next Buttons (Must work in ALL modes)
-            prev_items = self.canvas.find_withtag("btn_prev")
-            if len(prev_items) >= 2:
-                self.canvas.coords(prev_items[0], text_x - btn_offset, ctrl_y - s, text_x - btn_offset, ctrl_y + s, text_x - btn_offset - s, ctrl_y)
-                self.canvas.coords(prev_items[1], text_x - btn_offset + s + gap, ctrl_y - s, text_x - btn_offset + s + gap, ctrl_y + s, text_x - btn_offset + gap, ctrl_y)
-
-            next_items = self.canvas.find_withtag("btn_next")
-            if len(next_items) >= 2:
-                self.canvas.coords(next_items[0], text_x + btn_offset, ctrl_y - s, text_x + btn_offset, ctrl_y + s, text_x + btn_offset + s, ctrl_y)
-                self.canvas.coords(next_items[1], text_x + btn_offset - s - gap, ctrl_y - s, text_x + btn_offset - s - gap, ctrl_y + s, text_x + btn_offset - gap, ctrl_y)
+            prev_a, prev_b = L.prev_points()
+            next_a, next_b = L.next_points()
+            s.coords("prev_1", *prev_a)
+            s.coords("prev_2", *prev_b)
+            s.coords("next_1", *next_a)
+            s.coords("next_2", *next_b)
 
         if self.mode == "normal":
             # Reposition Resize Handle
-            self.canvas.coords("resize_handle", self.current_width-30, self.current_height-30, self.current_width, self.current_height)
-
-        # Ensure Z-Order
-        self.canvas.tag_lower(self.bg_img_id)
-        self.canvas.tag_lower(self.bg_id)
-        self.canvas.tag_raise("art_group")
-        self.canvas.tag_raise("expanded_ui")
+            s.coords("resize_handle", self.current_width-30, self.current_height-30, self.current_width, self.current_height)
 
-    def redraw_art_image(self, w, h):
+    @timed("redraw_art_image")
+    def redraw_art_image(self, w, h, quality="final"):
         if not hasattr(self, 'last_pil_img'): return
         try:
              radius = int(min(w, h) * 0.25)
-             processed_img = make_rounded_image(self.last_pil_img, w, h, radius=radius)
-             self.tk_img_current = ImageTk.PhotoImage(processed_img)
-             self.canvas.itemconfig(self.art_id, image=self.tk_img_current)
+             if quality == "draft":
+                 processed_img = make_rounded_image(self.art_draft_src, w, h, radius=radius, resample=DRAFT_FILTER)
+             else:
+                 processed_img = make_rounded_image(self.last_pil_img, w, h, radius=radius, resample=FINAL_FILTER)
+             self.tk_img_current = self.image_slots.update("art", processed_img)
+             self.scene.config("art", image=self.tk_img_current)
         except: pass
 
 
@@ -1682,51 +2086,30 @@ class MediaWidget(tk.Tk):
                 self.settings_process = None # Clean up
         
         if ctx_open or settings_open:
-            if self.mode == "island":
+            if self.mode == "island" and self.target_y != self.y_visible:
                  self.target_y = self.y_visible
-            self.after(200, self.check_mouse) # Slower poll needed
-            return
+                 self.scheduler.poke("frame")
+            return 200 # Slower poll needed
 
         if self.dragging_window or self.resizing_window:
-            self.after(30, self.check_mouse)
             return
 
-        mx, my = get_mouse_pos()
-        screen_w = self.winfo_screenwidth()
-        screen_h = self.winfo_screenheight()
-        
-        should_show = False
-        
-        # 1. Check if mouse is in the "Lip" zone for current dock side
-        if self.dock_side == "top":
-            trigger_w = self.width + 30
-            zone_x1 = self.current_x - 15
-            zone_x2 = self.current_x + self.width + 15
-            if zone_x1 <= mx <= zone_x2 and my <= self.hover_zone_height:
-                should_show = True
-        elif self.dock_side == "left":
-            if mx <= self.hover_zone_height and self.current_y <= my <= self.current_y + self.height:
-                should_show = True
-        elif self.dock_side == "right":
-            if mx >= screen_w - self.hover_zone_height and self.current_y <= my <= self.current_y + self.height:
-                should_show = True
+        # 1. Lip zone or (already showing) widget + buffer, from the hover tracker.
+        # A hook source keeps it current; this poll is the polling fallback's
+        # only input and the hook's safety net (it also revives a dropped hook).
+        self.update_hover_zone()
+        self.pointer.poll()
+        should_show = self.hover.inside
 
-        # 2. Check if mouse is within the visible widget + tight buffer
-        if not should_show:
-            wx, wy = self.winfo_x(), self.winfo_y()
-            # Reduced buffer to 10px for ultra-precision
-            buffer = 10
-            if wx - buffer <= mx <= wx + self.width + buffer and wy - buffer <= my <= wy + self.height + buffer:
-                # Only keep visible if it's already somewhat visible
-                if self.dock_side == "top" and self.current_y > self.y_hidden + 2: should_show = True
-                elif self.dock_side == "left" and self.current_x > self.x_hidden + 2: should_show = True
-                elif self.dock_side == "right" and self.current_x < self.x_hidden - 2: should_show = True
-                elif self.dock_side is None: should_show = True
+        # 1b. Heading for the lip? Catch up deferred work ~100ms before it opens
+        if self.visibility.state == HIDDEN and not should_show:
+            self.visibility.set_warm(self.hover.likely)
 
         if self.sticky:
             should_show = True
 
         # Handle Hide Delay
+        recheck = None
         if should_show:
             self.mouse_leave_time = 0
         else:
@@ -1736,7 +2119,9 @@ class MediaWidget(tk.Tk):
             elapsed = (time.time() - self.mouse_leave_time) * 1000
             if elapsed < self.auto_hide_delay:
                 should_show = True
+                recheck = self.auto_hide_delay - elapsed + 1 # No move event will come to end the delay
 
+        prev_target = (self.target_x, self.target_y)
         if self.dock_side == "top":
             self.target_y = self.y_visible if should_show else self.y_hidden
             self.target_x = self.current_x
@@ -1750,16 +2135,37 @@ class MediaWidget(tk.Tk):
             self.target_x = self.current_x
             self.target_y = self.current_y
 
-        self.after(30, self.check_mouse)
-
-    def check_config_reload(self):
-        if os.path.exists("config.json"):
-            m = os.path.getmtime("config.json")
-            if m > self.last_config_mtime:
-                self.load_config()
-                self.setup_dimensions()
-                self.last_config_mtime = m
-        self.after(200, self.check_config_reload)
+        # Wake the frame loop out of idle cadence as soon as a target moves
+        if (self.target_x, self.target_y) != prev_target:
+            self.scheduler.poke("frame")
+
+        if self.pointer.event_driven:
+            return recheck
+
+    def update_hover_zone(self):
+        """Hands the hover tracker a fresh zone snapshot when the geometry changed."""
+        x, y = int(self.current_x), int(self.current_y)
+        if self.dock_side == "top": revealed = self.current_y > self.y_hidden + 2
+        elif self.dock_side == "left": revealed = self.current_x > self.x_hidden + 2
+        elif self.dock_side == "right": revealed = self.current_x < self.x_hidden - 2
+        else: revealed = True
+        key = (self.dock_side, x, y, self.width, self.height, self.hover_zone_height, revealed)
+        if key != self.hover_zone_key:
+            self.hover_zone_key = key
+            self.hover.set_zone(HoverZone(self.dock_side, x, y, self.width, self.height,
+                                          self.hover_zone_height, self.winfo_screenwidth(), revealed))
+
+    def on_hover_change(self, tracker):
+        # May run on the pointer delivery thread; only event-driven sources need the wakeup
+        if self.running and getattr(self, 'pointer', None) and self.pointer.event_driven:
+            self.bridge.post(self.apply_hover, priority=HIGH, key="hover")
+
+    def apply_hover(self):
+        # Tk thread, straight off the hover post: pre-warm now so the ~100ms lead
+        # isn't spent waiting for the mouse task
+        if self.visibility.state == HIDDEN and not self.hover.inside:
+            self.visibility.set_warm(self.hover.likely)
+        self.scheduler.poke("mouse")
 
     def launch_settings(self):
         # Prefer python settings.py if it exists
@@ -1787,28 +2193,42 @@ class MediaWidget(tk.Tk):
             print("DEBUG: Event loop set. Starting run_forever().")
             sys.stdout.flush()
             self.loop.create_task(self.monitor_media())
+            self.loop.create_task(self.watchdog.watch_loop())
             self.loop.run_forever()
         except Exception as e:
             print(f"DEBUG: Background loop CRASHED: {e}")
             sys.stdout.flush()
 
+    def start_integrated_loop(self):
+        """Single-threaded mode: asyncio runs one iteration per scheduler step on the Tk thread."""
+        print("Event loop: integrated with Tk (single thread)")
+        asyncio.set_event_loop(self.loop)
+        # Coroutines post from the Tk thread now, so their UI calls run in place
+        self.bridge.inline_thread = threading.get_ident()
+        # WinRT and executor completions come from other threads: step right away
+        self.loop.on_wake = lambda: self.bridge.post(self.scheduler.poke, "asyncio", priority=HIGH, key="loop_wake")
+        self.loop_driver = LoopDriver(self.loop)
+        self.scheduler.add("asyncio", self.loop_driver.step, self.loop_driver.max_delay)
+        self.loop.create_task(self.monitor_media())
+        self.loop.create_task(self.watchdog.watch_loop())
+
     def run_task(self, coro_func):
         if self.loop:
-            is_active = self.loop.is_running()
-            name = getattr(coro_func, '__name__', 'lambda')
-            print(f"DEBUG: run_task launching {name} (Loop Running: {is_active})...")
-            sys.stdout.flush()
             try:
-                # If it's a bound method or function, call it to get the coro
-                res = coro_func()
-                if asyncio.iscoroutine(res):
-                    asyncio.run_coroutine_threadsafe(res, self.loop)
-                    print(f"DEBUG: {name} scheduled successfully.")
-                else:
-                    print(f"DEBUG: {name} was not a coroutine (sync?).")
+                self.bridge.to_loop(self.loop, coro_func)
             except Exception as e:
-                print(f"DEBUG: FAILED to schedule {name}: {e}")
-            sys.stdout.flush()
+                print(f"DEBUG: FAILED to schedule {getattr(coro_func, '__name__', 'lambda')}: {e}")
+
+    # --- UI Bridge (background threads -> Tk) ---
+    def wake_bridge(self):
+        # One after(0) per batch: the bridge only asks on the first post into an
+        # empty queue. If Tk can't take it (mainloop not running yet), the bridge
+        # swallows the error and the frame tick's drain is the fallback
+        self.after(0, self.drain_bridge)
+
+    def drain_bridge(self):
+        if self.bridge.drain():
+            self.scheduler.poke("frame") # Leftovers go out with the next frame tick
 
     async def monitor_media(self):
         if not WINRT_AVAILABLE: return
@@ -1822,221 +2242,278 @@ class MediaWidget(tk.Tk):
             sys.stdout.flush()
             return
         
-        print(f"DEBUG: monitor_media Entering loop (Running: {self.running})")
+        print("DEBUG: media manager ready; polling is driven by the scheduler.")
         sys.stdout.flush()
+
+    def poll_media(self):
+        """Scheduler task (Tk thread): hands one media poll to the asyncio loop."""
+        if not getattr(self, 'manager', None) or self.media_poll_busy or not self.running:
+            return
+        self.media_poll_busy = True
+        fut = self.bridge.to_loop(self.loop, self.poll_media_once)
+        fut.add_done_callback(lambda f: setattr(self, 'media_poll_busy', False))
+        # Parked or covered: nobody sees the progress tick, poll slower
+        if self.visibility.suppressed:
+            return 1500
+
+    async def poll_media_once(self):
+        # SMART SESSION SELECTION: Prioritize playing sessions over paused ones
+        try:
+            all_sessions = self.manager.get_sessions()
+            
+            # TWO-PASS FILTERING: First find if ANY session is playing
+            has_playing_session = False
+            for session in all_sessions:
+                try:
+                    info = session.get_playback_info()
+                    if info and info.playback_status == 4:  # Playing
+                        has_playing_session = True
+                        break
+                except:
+                    continue
+            
+            # DEBOUNCE: If we recently had a playing session, wait before showing paused
+            if not hasattr(self, '_last_had_playing'):
+                self._last_had_playing = has_playing_session
+                self._playing_lost_time = None
+            
+            if not has_playing_session and self._last_had_playing:
+                # Just lost playing session - start timer
+                if self._playing_lost_time is None:
+                    self._playing_lost_time = time.time()
+                # Wait 1 second before showing paused (allows song transition)
+                if time.time() - self._playing_lost_time < 1.0:
+                    has_playing_session = True  # Pretend we still have playing
+            elif has_playing_session:
+                # Reset debounce timer
+                self._playing_lost_time = None
+                self._last_had_playing = True
+            
+            best_session = None
+            best_priority = -1  # Higher = better
+            
+            for session in all_sessions:
+                try:
+                    info = session.get_playback_info()
+                    if not info:
+                        continue
+                    
+                    status = info.playback_status
+                    app_id = session.source_app_user_model_id
+                    
+                    # AGGRESSIVE FILTER: If ANY session is playing, IGNORE all non-playing sessions
+                    if has_playing_session and status != 4:
+                        continue  # Skip paused/stopped sessions entirely
+                    
+                    # Calculate priority
+                    priority = 0
+                    
+                    # Playing sessions get +100 priority
+                    if status == 4:  # Playing
+                        priority += 100
+                    
+                    # Spotify gets +50 priority
+                    if "Spotify" in app_id:
+                        priority += 50
+                    
+                    # Edge/Chrome (for Spotify Web) gets +30 if playing
+                    if status == 4 and any(browser in app_id for browser in ["edge", "chrome", "firefox"]):
+                        props = await session.try_get_media_properties_async()
+                        if props and props.title and ("Spotify" in props.title or "Spotify" in (props.artist or "")):
+                            priority += 30
+                    
+                    # Update best session
+                    if priority > best_priority:
+                        best_priority = priority
+                        best_session = session
+                
+                except Exception as e:
+                    continue
+            
+            # Use the best session found, but apply hold time logic
+            current_time = time.time()
+            should_hold = False
+            
+            if self.last_session_id and (current_time - self.last_session_lock_time) < self.session_hold_duration:
+                # We're in hold period - only switch if new session is MUCH better
+                if best_priority < self.last_session_priority + 50:
+                    # New session isn't significantly better, keep current
+                    should_hold = True
+                    # Try to find the current session in the list
+                    for session in all_sessions:
+                        try:
+                            if session.source_app_user_model_id == self.last_session_id:
+                                best_session = session
+                                best_priority = self.last_session_priority
+                                break
+                        except:
+                            continue
+            
+            if not should_hold and best_session:
+                # Update lock
+                try:
+                    self.last_session_id = best_session.source_app_user_model_id
+                    self.last_session_priority = best_priority
+                    self.last_session_lock_time = current_time
+                except:
+                    pass
+            
+            self.session = best_session
+            
+        except Exception as e:
+            # Fallback to get_current_session if scanning fails
+            self.session = self.manager.get_current_session()
         
-        while self.running:
-            # SMART SESSION SELECTION: Prioritize playing sessions over paused ones
+        if self.session:
             try:
-                all_sessions = self.manager.get_sessions()
+                thumb_stream = None
+                props = await self.session.try_get_media_properties_async()
                 
-                # TWO-PASS FILTERING: First find if ANY session is playing
-                has_playing_session = False
-                for session in all_sessions:
-                    try:
-                        info = session.get_playback_info()
-                        if info and info.playback_status == 4:  # Playing
-                            has_playing_session = True
-                            break
-                    except:
-                        continue
+                # HOLD LOGIC: If properties are empty OR generic during track transition, don't update yet
+                # Some sessions report empty properties for a few ms when track changes
+                title = (props.title or "").strip()
+                artist = (props.artist or "").strip()
                 
-                # DEBOUNCE: If we recently had a playing session, wait before showing paused
-                if not hasattr(self, '_last_had_playing'):
-                    self._last_had_playing = has_playing_session
-                    self._playing_lost_time = None
+                # More aggressive generic check to catch browser/app placeholders like "Spotify" or "-"
+                is_generic = (not title or title.lower() in ["unknown title", "spotify", "no media", "play something..."]) and \
+                             (not artist or artist.lower() in ["unknown artist", "artist", "-", "."])
                 
-                if not has_playing_session and self._last_had_playing:
-                    # Just lost playing session - start timer
-                    if self._playing_lost_time is None:
-                        self._playing_lost_time = time.time()
-                    # Wait 1 second before showing paused (allows song transition)
-                    if time.time() - self._playing_lost_time < 1.0:
-                        has_playing_session = True  # Pretend we still have playing
-                elif has_playing_session:
-                    # Reset debounce timer
-                    self._playing_lost_time = None
-                    self._last_had_playing = True
-                
-                best_session = None
-                best_priority = -1  # Higher = better
+                if is_generic and (time.time() - self.last_media_time) < self.content_hold_duration:
+                    # Skip this tick to hold previous content if we lost info or got generic info briefly
+                    return
+
+                # SECONDARY FILTER: Even if artist is valid, if Title is bad, don't show it during hold
+                bad_title = not title or title.lower() in ["unknown title", "spotify", "no media", "play something..."]
+                if bad_title and (time.time() - self.last_media_time) < self.content_hold_duration:
+                    return
+
+                if not title: title = "Unknown Title"
+                if not artist: artist = "Unknown Artist"
                 
-                for session in all_sessions:
+                # FINAL SAFETY: If we resolved to Unknown Title, block it for 5s
+                if title == "Unknown Title" and (time.time() - self.last_media_time) < self.content_hold_duration:
+                    return
+                thumb_data = None
+                if props.thumbnail:
                     try:
-                        info = session.get_playback_info()
-                        if not info:
-                            continue
-                        
-                        status = info.playback_status
-                        app_id = session.source_app_user_model_id
-                        
-                        # AGGRESSIVE FILTER: If ANY session is playing, IGNORE all non-playing sessions
-                        if has_playing_session and status != 4:
-                            continue  # Skip paused/stopped sessions entirely
-                        
-                        # Calculate priority
-                        priority = 0
-                        
-                        # Playing sessions get +100 priority
-                        if status == 4:  # Playing
-                            priority += 100
-                        
-                        # Spotify gets +50 priority
-                        if "Spotify" in app_id:
-                            priority += 50
-                        
-                        # Edge/Chrome (for Spotify Web) gets +30 if playing
-                        if status == 4 and any(browser in app_id for browser in ["edge", "chrome", "firefox"]):
-                            props = await session.try_get_media_properties_async()
-                            if props and props.title and ("Spotify" in props.title or "Spotify" in (props.artist or "")):
-                                priority += 30
-                        
-                        # Update best session
-                        if priority > best_priority:
-                            best_priority = priority
-                            best_session = session
-                    
-                    except Exception as e:
-                        continue
+                        thumb_stream = await props.thumbnail.open_read_async()
+                        from winrt.windows.storage import streams as winrt_streams
+                        from winrt.windows.security.cryptography import CryptographicBuffer as crypto
+                        reader = winrt_streams.DataReader(thumb_stream)
+                        await reader.load_async(thumb_stream.size)
+                        ibuffer = reader.read_buffer(thumb_stream.size)
+                        arr = crypto.copy_to_byte_array(ibuffer)
+                        thumb_data = bytes(arr)
+                    except Exception as thumb_err:
+                        print(f"WARNING: Thumbnail fetch failed for '{title}': {thumb_err}")
+                        thumb_data = None
                 
-                # Use the best session found, but apply hold time logic
-                current_time = time.time()
-                should_hold = False
+                timeline = self.session.get_timeline_properties()
+                pos = timeline.position.total_seconds() if timeline.position else 0
+                end = timeline.end_time.total_seconds() if timeline.end_time else 1
                 
-                if self.last_session_id and (current_time - self.last_session_lock_time) < self.session_hold_duration:
-                    # We're in hold period - only switch if new session is MUCH better
-                    if best_priority < self.last_session_priority + 50:
-                        # New session isn't significantly better, keep current
-                        should_hold = True
-                        # Try to find the current session in the list
-                        for session in all_sessions:
-                            try:
-                                if session.source_app_user_model_id == self.last_session_id:
-                                    best_session = session
-                                    best_priority = self.last_session_priority
-                                    break
-                            except:
-                                continue
+                info = self.session.get_playback_info()
+                status = info.playback_status
                 
-                if not should_hold and best_session:
-                    # Update lock
-                    try:
-                        self.last_session_id = best_session.source_app_user_model_id
-                        self.last_session_priority = best_priority
-                        self.last_session_lock_time = current_time
-                    except:
-                        pass
+                if status == 4:
+                     last_updated = timeline.last_updated_time
+                     if last_updated:
+                         now = datetime.datetime.now(datetime.timezone.utc)
+                         diff = (now - last_updated).total_seconds()
+                         if diff > 0: pos += diff
+                
+                if pos > end: pos = end
                 
-                self.session = best_session
+                shuffle = info.is_shuffle_active if info else False
+                repeat = info.auto_repeat_mode if info else 0 # 0=None, 1=Track, 2=List
                 
+                self.bridge.post(self.update_media_state, title, artist, pos, end, status, thumb_data, shuffle, repeat, key="media")
+                
+                # Update last media time since we successfully got media
+                self.last_media_time = time.time()
             except Exception as e:
-                # Fallback to get_current_session if scanning fails
-                self.session = self.manager.get_current_session()
-            
-            if self.session:
-                try:
-                    thumb_stream = None
-                    props = await self.session.try_get_media_properties_async()
-                    
-                    # HOLD LOGIC: If properties are empty OR generic during track transition, don't update yet
-                    # Some sessions report empty properties for a few ms when track changes
-                    title = (props.title or "").strip()
-                    artist = (props.artist or "").strip()
-                    
-                    # More aggressive generic check to catch browser/app placeholders like "Spotify" or "-"
-                    is_generic = (not title or title.lower() in ["unknown title", "spotify", "no media", "play something..."]) and \
-                                 (not artist or artist.lower() in ["unknown artist", "artist", "-", "."])
-                    
-                    if is_generic and (time.time() - self.last_media_time) < self.content_hold_duration:
-                        # Skip this tick to hold previous content if we lost info or got generic info briefly
-                        await asyncio.sleep(0.3)
-                        continue
-
-                    # SECONDARY FILTER: Even if artist is valid, if Title is bad, don't show it during hold
-                    bad_title = not title or title.lower() in ["unknown title", "spotify", "no media", "play something..."]
-                    if bad_title and (time.time() - self.last_media_time) < self.content_hold_duration:
-                        await asyncio.sleep(0.3) 
-                        continue
-
-                    if not title: title = "Unknown Title"
-                    if not artist: artist = "Unknown Artist"
-                    
-                    # FINAL SAFETY: If we resolved to Unknown Title, block it for 5s
-                    if title == "Unknown Title" and (time.time() - self.last_media_time) < self.content_hold_duration:
-                        await asyncio.sleep(0.3)
-                        continue
-                    thumb_data = None
-                    if props.thumbnail:
-                        try:
-                            thumb_stream = await props.thumbnail.open_read_async()
-                            from winrt.windows.storage import streams as winrt_streams
-                            from winrt.windows.security.cryptography import CryptographicBuffer as crypto
-                            reader = winrt_streams.DataReader(thumb_stream)
-                            await reader.load_async(thumb_stream.size)
-                            ibuffer = reader.read_buffer(thumb_stream.size)
-                            arr = crypto.copy_to_byte_array(ibuffer)
-                            thumb_data = bytes(arr)
-                        except Exception as thumb_err:
-                            print(f"WARNING: Thumbnail fetch failed for '{title}': {thumb_err}")
-                            thumb_data = None
-                    
-                    timeline = self.session.get_timeline_properties()
-                    pos = timeline.position.total_seconds() if timeline.position else 0
-                    end = timeline.end_time.total_seconds() if timeline.end_time else 1
-                    
-                    info = self.session.get_playback_info()
-                    status = info.playback_status
-                    
-                    if status == 4:
-                         last_updated = timeline.last_updated_time
-                         if last_updated:
-                             now = datetime.datetime.now(datetime.timezone.utc)
-                             diff = (now - last_updated).total_seconds()
-                             if diff > 0: pos += diff
-                    
-                    if pos > end: pos = end
-                    
-                    shuffle = info.is_shuffle_active if info else False
-                    repeat = info.auto_repeat_mode if info else 0 # 0=None, 1=Track, 2=List
-                    
-                    self.after(0, self.update_media_state, title, artist, pos, end, status, thumb_data, shuffle, repeat)
-                    
-                    # Update last media time since we successfully got media
-                    self.last_media_time = time.time()
-                except Exception as e:
-                    print(f"DEBUG: monitor_media internal error: {e}")
-                    sys.stdout.flush()
-            else:
-                 # No session available - use CONTENT HOLD to prevent flash
-                 current_time = time.time()
-                 time_since_media = current_time - self.last_media_time
-                 
-                 # Only show "No Media" if we've had no session for a LONG time
-                 if time_since_media > self.content_hold_duration:
-                     try:
-                        all_sessions = self.manager.get_sessions()
-                        if not all_sessions or len(all_sessions) == 0:
-                            # Only then show No Media
-                            self.after(0, self.update_media_state, "No Media", "Play something...", 0, 100, 5, None, False, 0)
-                        else:
-                            # We have sessions but none selected? Try to grab the first active one
-                            for s in all_sessions:
-                                info = s.get_playback_info()
-                                if info and info.playback_status == 4: # Playing
-                                    self.session = s
-                                    break
-                     except:
-                        pass
-                 # else: Keep showing the last known content (do nothing)
-            
-            await asyncio.sleep(0.5)  # Slightly slower but safer polling
+                print(f"DEBUG: monitor_media internal error: {e}")
+                sys.stdout.flush()
+        else:
+             # No session available - use CONTENT HOLD to prevent flash
+             current_time = time.time()
+             time_since_media = current_time - self.last_media_time
+             
+             # Only show "No Media" if we've had no session for a LONG time
+             if time_since_media > self.content_hold_duration:
+                 try:
+                    all_sessions = self.manager.get_sessions()
+                    if not all_sessions or len(all_sessions) == 0:
+                        # Only then show No Media
+                        self.bridge.post(self.update_media_state, "No Media", "Play something...", 0, 100, 5, None, False, 0, key="media")
+                    else:
+                        # We have sessions but none selected? Try to grab the first active one
+                        for s in all_sessions:
+                            info = s.get_playback_info()
+                            if info and info.playback_status == 4: # Playing
+                                self.session = s
+                                break
+                 except:
+                    pass
+             # else: Keep showing the last known content (do nothing)
+
+    # --- Optimistic Transport (UI thread) ---
+    def press_play_pause(self):
+        expected = self.transport.toggle(self.last_status)
+        self.last_status = expected
+        self.update_play_pause_ui(expected)
+        self.send_command("play_pause")
+
+    def press_skip(self, direction):
+        self.transport.skip(self.last_track_key)
+        for name in ("title", "artist"):
+            self.slide_label(name, out=True)
+        self.send_command("skip", direction)
+
+    def send_command(self, kind, value=None):
+        if self.commands.submit(kind, value) and self.loop:
+            self.bridge.to_loop(self.loop, self.commands.drain)
+
+    def rollback_command(self, kind):
+        p = self.transport.failed(kind)
+        if p is None:
+            return
+        print(f"Transport command '{kind}' not applied, rolling back")
+        if kind == "status":
+            self.last_status = p.before
+            self.update_play_pause_ui(p.before)
+        else:
+            for name in ("title", "artist"):
+                self.slide_label(name, out=False)
 
     async def svc_play_pause(self):
-        if self.session: await self.session.try_toggle_play_pause_async()
+        await self.svc_transport("status", self.session.try_toggle_play_pause_async if self.session else None)
     async def svc_next(self):
-        if self.session: await self.session.try_skip_next_async()
+        await self.svc_transport("track", self.session.try_skip_next_async if self.session else None)
     async def svc_prev(self):
-        if self.session: await self.session.try_skip_previous_async()
+        await self.svc_transport("track", self.session.try_skip_previous_async if self.session else None)
+
+    async def execute_command(self, kind, value):
+        # Runs on the event loop, one command at a time (see CommandDispatcher)
+        if kind == "play_pause":
+            await self.svc_play_pause()
+        elif kind == "skip":
+            if value == 0:
+                self.bridge.post(self.rollback_command, "track", priority=HIGH) # next + prev cancelled out
+            for _ in range(abs(value)):
+                await (self.svc_next() if value > 0 else self.svc_prev())
+        elif kind == "seek":
+            await self.svc_seek(value)
+
+    async def svc_transport(self, kind, call):
+        # try_* return False when the session refuses the command
+        try:
+            ok = bool(call) and await call()
+        except Exception as e:
+            print(f"Transport command failed: {e}")
+            ok = False
+        if not ok:
+            self.bridge.post(self.rollback_command, kind, priority=HIGH)
         
     async def svc_seek(self, seconds):
         if self.session:
@@ -2279,22 +2756,27 @@ class MediaWidget(tk.Tk):
                 # Run in thread because EnumWindows is blocking-ish and uses heavy ctypes
                 await self.loop.run_in_executor(None, lambda: FocusHelper().focus_app(app_id))
 
-    def toggle_ambilight(self):
-        """Toggle ambilight and restart widget for changes to apply"""
-        self.ambilight_enabled = not self.ambilight_enabled
-        self.save_config()
-        # Restart to apply ambilight changes cleanly
-        self.restart_app()
-
     # --- UI Update ---
+    @timed("update_media_state")
     def update_media_state(self, title, artist, pos, end, status, thumb_stream, shuffle=False, repeat=0):
+        if self.visibility.suppressed:
+            # Keep only the latest state; on_reveal replays it once
+            self.deferred_media = (title, artist, pos, end, status, thumb_stream, shuffle, repeat)
+            return
         try:
             self.current_media_end = end
+            # An optimistic click outranks polls that predate it
+            status = self.transport.reconcile_status(status)
             self.last_status = status
+            pos = self.transport.reconcile_position(pos, status == PLAYING)
             
             # --- Enhanced Caching Check ---
             current_key = (title, artist)
             track_changed = (current_key != self.last_track_key)
+            skip = self.transport.reconcile_track(current_key)
+            if skip == "rolled_back":
+                for name in ("title", "artist"):
+                    self.slide_label(name, out=False)
             
             # Hash-based thumbnail tracking to detect actual image changes
             thumb_hash = None
@@ -2308,7 +2790,7 @@ class MediaWidget(tk.Tk):
             thumb_changed = (thumb_hash != getattr(self, 'last_thumb_hash', None))
             
             # Additional check: If we have no art but we SHOULD have art, retry fetch
-            needs_art_retry = (thumb_stream is not None and not hasattr(self, 'last_pil_img'))
+            needs_art_retry = (thumb_stream is not None and not hasattr(self, 'last_pil_img') and not self.art_inflight)
             
             # Force refresh every 10 updates to catch edge cases
             if not hasattr(self, 'update_counter'):
@@ -2327,21 +2809,19 @@ class MediaWidget(tk.Tk):
                 # But here we are just updating the visual state.
                 
                 if thumb_stream: 
-                    try:
-                        self.update_art_image(thumb_stream) 
-                    except Exception as e:
-                        print(f"ERROR: Failed to update album art: {e}")
-                        if hasattr(self, 'placeholder_id_rect'):
-                            self.canvas.itemconfig(self.placeholder_id_rect, state="normal")
+                    self.load_art(thumb_stream)
                 else:
                     # ONLY hide art if we've officially timed out on having any media
                     if (time.time() - self.last_media_time) > self.content_hold_duration or not title or title == "No Media":
+                        self.art_seq += 1 # Drop any decode still in flight
+                        self.art_inflight = False
+                        self.art_digest = None
                         if hasattr(self, 'last_pil_img'): 
                             del self.last_pil_img
                             if hasattr(self, 'last_thumb_hash'):
                                 del self.last_thumb_hash
-                        self.canvas.itemconfig(self.art_id, state="hidden")
-                        self.apply_glow_bg(None)
+                        self.scene.show("art", False)
+                        self.refresh_glow()
             
             # --- Text Update Logic (SYNCED) ---
             # If track changed, we want to update text ONLY when art is ready or timeout
@@ -2354,179 +2834,159 @@ class MediaWidget(tk.Tk):
             # Binary state check
             is_sh_active = bool(shuffle)
             is_lp_active = (repeat is not None and int(repeat) > 0)
-            scale = self.current_height / 125.0
 
             # Dynamic text truncation (respecting artwork width)
-            # Use cached art_w or fallback to square assumption
-            current_art_w = getattr(self, 'last_art_w', self.current_height * 0.8)
-            padding = max(10, self.current_height * 0.12)
-            right_margin = 35 * scale
-            end_margin = 25 * scale
-            available_w = self.current_width - (padding + current_art_w + right_margin + end_margin)
-            max_text_width = available_w - 20 # Extra safety buffer
-            
-            def truncate_for_width(text, font, max_w):
-                if font.measure(text) <= max_w: return text
-                while font.measure(text + "...") > max_w and len(text) > 0:
-                    text = text[:-1]
-                return text + "..."
-
-            final_title = truncate_for_width(title, self.font_title, max_text_width)
-            final_artist = truncate_for_width(artist, self.font_artist, max_text_width)
-            
-            if final_artist.endswith("..."):
-                 self.canvas.tag_bind(self.artist_id, "<Enter>", lambda e: self.schedule_tooltip(artist, e))
-                 self.canvas.tag_bind(self.artist_id, "<Leave>", self.cancel_tooltip)
-            else:
-                 self.canvas.tag_bind(self.artist_id, "<Enter>", lambda e: self.canvas.config(cursor=""))
-                 self.canvas.tag_bind(self.artist_id, "<Leave>", lambda e: None)
+            max_text_width = self.layout.text_max_w
+            
+            final_title = self.fit_label("title", title, max_text_width)
+            final_artist = self.fit_label("artist", artist, max_text_width)
+            
+            # The tooltip reads artist_full when shown, so only a flip needs new bindings
+            self.title_full = title
+            self.artist_full = artist
+            truncated = final_artist != artist
+            if truncated != self.artist_truncated:
+                self.artist_truncated = truncated
+                if truncated:
+                    self.canvas.tag_bind("artist_label", "<Enter>", lambda e: self.schedule_tooltip(self.artist_full, e))
+                    self.canvas.tag_bind("artist_label", "<Leave>", self.cancel_tooltip)
+                else:
+                    self.canvas.tag_bind("artist_label", "<Enter>", lambda e: self.set_cursor(""))
+                    self.canvas.tag_bind("artist_label", "<Leave>", lambda e: None)
 
             # --- Fade Transitions ---
-            self.fade_text(self.title_id, final_title)
-            self.fade_text(self.artist_id, final_artist)
+            self.fade_text("title", final_title)
+            self.fade_text("artist", final_artist)
 
-            self.canvas.itemconfig(self.lbl_total_time, text=self.format_time(end))
-            if hasattr(self, 'lbl_total_time_shadow'):
-                self.canvas.itemconfig(self.lbl_total_time_shadow, text=self.format_time(end))
+            total_str = self.format_time(end)
+            overlay = self.volume_overlay_active()
+            if not overlay:
+                self.set_label("total_time", total_str)
             
             self.update_play_pause_ui(status)
             
             if not self.dragging_slider:
-                self.canvas.itemconfig(self.lbl_curr_time, text=self.format_time(pos))
-                if hasattr(self, 'lbl_curr_time_shadow'):
-                    self.canvas.itemconfig(self.lbl_curr_time_shadow, text=self.format_time(pos))
+                curr_str = self.format_time(pos)
                 
-                # FIX: Unpack coordinates from self.bar_coords
-                try:
-                    bx1, by, bx2, _ = self.bar_coords
-                except:
-                    bx1, by, bx2 = 0, 0, 0
-
-                width = bx2 - bx1
                 self.last_ratio = 0
                 if pos is not None and end is not None and end > 0:
                     self.last_ratio = pos / end
                 
-                new_x = bx1 + (width * self.last_ratio)
-                
-                self.canvas.coords(self.bar_val_id, bx1, by, new_x, by)
-                dot_r = 5.0 * (self.height / 125)
-                self.canvas.coords(self.dot_id, new_x-dot_r, by-dot_r, new_x+dot_r, by+dot_r)
-
-            # Logic moved to cache block above
-            # if thumb_stream:
-            #    self.run_task(lambda: self.fetch_thumbnail_bytes(thumb_stream))
-            # elif not hasattr(self, 'last_pil_img'):
-            #    self.canvas.itemconfig(self.art_id, state="hidden")
+                if overlay:
+                    # Volume owns the progress area; restored from here when it ends
+                    self.overlay_stash = (curr_str, total_str)
+                else:
+                    self.set_label("curr_time", curr_str)
+                    if self.show_progress:
+                        L = self.layout
+                        new_x = L.bar_x_at(self.last_ratio)
+                        self.scene.coords("bar_val", L.bar_x1, L.bar_y, new_x, L.bar_y)
+                        self.scene.coords("dot", new_x-L.dot_r, L.bar_y-L.dot_r, new_x+L.dot_r, L.bar_y+L.dot_r)
         except Exception as e:
             print(f"DEBUG: update_media_state error: {e}")
             import traceback
             traceback.print_exc()
             sys.stdout.flush()
 
-    def update_play_pause_ui(self, status, text_x=None, ctrl_y=None):
+    def update_play_pause_ui(self, status):
         # status: 4 for playing (show pause icon), else show play icon
-        scale = self.current_height / 125
-        padding = max(10, self.current_height * 0.12)
-
-        if text_x is None:
-             # Use cached art_w or fallback to square assumption
-             current_art_w = getattr(self, 'last_art_w', self.current_height - (padding * 2.2))
-             right_margin = 35 * scale
-             art_end_x = padding + current_art_w + right_margin
-             text_x = art_end_x + (self.current_width - art_end_x - (25 * scale)) // 2
-        
-        if ctrl_y is None:
-            if self.show_progress and self.show_controls:
-                ctrl_y = self.current_height * 0.64
-            elif self.show_controls:
-                ctrl_y = self.current_height * 0.75
-            else:
-                ctrl_y = -100
-            
-        # We ensure play/pause items exist
-        if not hasattr(self, 'pause_id_1'):
-            self.pause_id_1 = self.canvas.create_line(0,0,0,0, tags=("btn_play", "play_icon", "expanded_ui"))
-            self.pause_id_2 = self.canvas.create_line(0,0,0,0, tags=("btn_play", "play_icon", "expanded_ui"))
-            self.play_id = self.canvas.create_polygon(0,0,0,0, tags=("btn_play", "play_icon", "expanded_ui"))
+        s = self.scene
+        L = self.layout
+        visible = self.show_controls and THEMES[self.current_theme_name]["show_timeline"]
 
         if status == 4: # Playing -> Show Pause
-            w = 5.5 * scale 
-            h = 8.5 * scale 
-            sep = 6.0 * scale 
-            self.canvas.itemconfig(self.play_id, state="hidden")
-            self.canvas.itemconfig(self.pause_id_1, state="normal", width=int(w), fill=self.fg_color, capstyle=tk.ROUND)
-            self.canvas.itemconfig(self.pause_id_2, state="normal", width=int(w), fill=self.fg_color, capstyle=tk.ROUND)
-            self.canvas.coords(self.pause_id_1, text_x - sep, ctrl_y - h, text_x - sep, ctrl_y + h)
-            self.canvas.coords(self.pause_id_2, text_x + sep, ctrl_y - h, text_x + sep, ctrl_y + h)
+            pause_a, pause_b = L.pause_points()
+            w = int(5.5 * L.scale)
+            s.show("play", False)
+            s.config("pause_1", state="normal" if visible else "hidden", width=w, fill=self.fg_color)
+            s.config("pause_2", state="normal" if visible else "hidden", width=w, fill=self.fg_color)
+            s.coords("pause_1", *pause_a)
+            s.coords("pause_2", *pause_b)
         else: # Paused -> Show Play
-            s = 9.5 * scale
-            line_w = int(2.5 * scale)
-            self.canvas.itemconfig(self.pause_id_1, state="hidden")
-            self.canvas.itemconfig(self.pause_id_2, state="hidden")
-            self.canvas.itemconfig(self.play_id, state="normal", fill=self.fg_color, outline=self.fg_color, width=line_w)
-            self.canvas.coords(self.play_id, text_x - s/1.5, ctrl_y - s, text_x - s/1.5, ctrl_y + s, text_x + s, ctrl_y)
-    async def fetch_thumbnail_bytes(self, stream):
-        try:
-            from winrt.windows.storage import streams
-            from winrt.windows.security.cryptography import CryptographicBuffer as crypto
-            
-            reader = streams.DataReader(stream)
-            await reader.load_async(stream.size)
-            ibuffer = reader.read_buffer(stream.size)
-            arr = crypto.copy_to_byte_array(ibuffer)
-            data = bytes(arr) 
-            self.after(0, self.update_art_image, data)
-        except Exception:
-            pass
-
-
-
-    def apply_glow_bg(self, glow_img):
+            s.show("pause_1", False)
+            s.show("pause_2", False)
+            s.config("play", state="normal" if visible else "hidden", fill=self.fg_color, outline=self.fg_color, width=int(2.5 * L.scale))
+            s.coords("play", *L.play_points())
+
+    def apply_glow_result(self, glow_img, color, seq):
+        if seq != self.glow_seq:
+            return # Superseded by a newer size or a stretched stand-in
+        self.apply_glow_bg(glow_img, color)
+        if glow_img is not None:
+            # Low priority: once this one is on screen, get the other mode ready too
+            self.scheduler.add("glow_prerender", self.prerender_glows, GLOW_PRERENDER_DELAY_MS,
+                               delay=GLOW_PRERENDER_DELAY_MS)
+
+    def apply_glow_bg(self, glow_img, color=None):
         if not self.running: return
+        if color:
+            self.island_color = color
+        self.glow_img = glow_img
         if glow_img:
-            self.tk_glow_bg = ImageTk.PhotoImage(glow_img)
-            self.canvas.itemconfig(self.bg_img_id, image=self.tk_glow_bg)
-            # Ensure background stays at bottom
-            self.canvas.tag_lower(self.bg_img_id)
-            self.canvas.tag_lower(self.bg_id)
+            self.tk_glow_bg = self.image_slots.update("glow", glow_img)
+            self.scene.config("bg_img", image=self.tk_glow_bg)
             
             # Hide solid rect to show glow
-            self.canvas.itemconfig(self.bg_id, state="hidden")
+            self.scene.show("bg", False)
         else:
-            self.canvas.itemconfig(self.bg_img_id, image="")
-            self.canvas.itemconfig(self.bg_id, state="normal", fill=self.island_color)
-
-    def update_art_image(self, data):
+            self.tk_glow_bg = None
+            self.scene.config("bg_img", image="")
+            self.scene.config("bg", state="normal", fill=self.island_color)
+
+    def load_art(self, data):
+        """Hands album art bytes to the image pool; update_art_image applies the result."""
+        self.art_seq += 1
+        self.art_inflight = True
+        known = self.art_digest if hasattr(self, 'last_pil_img') else None
+        self.image_pool.submit(self.decode_art, data, self.art_seq, known)
+
+    @timed("decode_art")
+    def decode_art(self, data, seq, known=None):
+        # Image pool thread: PIL only, no Tk and no widget state
+        digest = hashlib.md5(data).hexdigest()
+        if digest == known:
+            # Same picture again (the periodic forced refresh): keep the decoded image,
+            # so the glow cache, keyed on that object, stays warm
+            self.bridge.post(self.update_art_image, None, None, seq, digest, key="art")
+            return
+        try:
+            img = Image.open(io.BytesIO(data))
+            img.load()
+            # Small copy for draft frames so in-motion resamples stay cheap
+            draft = img.copy()
+            draft.thumbnail((256, 256), FINAL_FILTER)
+        except Exception as e:
+            print(f"ERROR: Failed to decode album art: {e}")
+            img = draft = None
+        self.bridge.post(self.update_art_image, img, draft, seq, digest, key="art")
+
+    def update_art_image(self, img, draft, seq, digest=None):
+        if seq != self.art_seq:
+            return # A newer track (or a clear) superseded this decode
+        self.art_inflight = False
+        if digest is not None and digest == self.art_digest and hasattr(self, 'last_pil_img'):
+            return # Unchanged art
         try:
-            self.is_fetching_art = False
-            self.last_pil_img = Image.open(io.BytesIO(data))
-            self.last_drawn_size = -1 
-            self.last_drawn_w = -1
+            if img is None:
+                self.scene.show("placeholder", True)
+                return
+            self.last_pil_img = img
+            self.art_draft_src = draft
+            self.art_digest = digest
+            self.art_policy.invalidate()
             self.update_ui_animation() 
-            if hasattr(self, 'placeholder_id_rect'):
-                 self.canvas.itemconfig(self.placeholder_id_rect, state="hidden")
             
             # --- Ambilight Trigger ---
-            # Enforce mode-specific dimensions for the glow generation
-            # to prevent "ghosting" of the previous mode's size during transitions
-            if self.mode == "island":
-                w, h = self.island_width, self.island_height
-                r = self.island_border_radius
-            else:
-                w, h = self.width, self.height # In normal mode, width/height are authoritative
-                r = self.normal_border_radius
-                
-            self.loop.run_in_executor(None, lambda: self.async_process_background(self.last_pil_img, w, h, r))
+            self.refresh_glow(force=True)
                  
         except Exception as e:
             print(f"Update art failed: {e}")
             pass
 
-    def async_process_background(self, img, w, h, r):
+    def async_process_background(self, img, w, h, r, seq):
         try:
             if not getattr(self, 'ambilight_enabled', True):
-                self.after(0, self.apply_glow_bg, None)
+                self.bridge.post(self.apply_glow_result, None, None, seq, key="glow")
                 return
 
             # --- Adaptive Ambilight Phase 1 ---
@@ -2539,128 +2999,62 @@ class MediaWidget(tk.Tk):
             darkened_rgb = tuple(int(c * 0.2) for c in dominant_rgb)
             hex_color = '#{:02x}{:02x}{:02x}'.format(*darkened_rgb)
             
-            # Apply this color to the window background (or acrylic tint)
-            # Update the solid background fallback color
-            self.island_color = hex_color
-            
+            # The solid background fallback color is applied with the glow on the
+            # Tk thread; widget state is never written from the pool
             img_copy = img.copy()
-            glow = self.create_glow_background(img_copy, w, h, r)
-            self.after(0, self.apply_glow_bg, glow)
+            glow = self.create_glow_background(img_copy, w, h, r, source=img)
+            self.bridge.post(self.apply_glow_result, glow, hex_color, seq, key="glow")
         except Exception as e:
             print(f"Async glow error: {e}")
-            self.after(0, self.apply_glow_bg, None)
+            self.bridge.post(self.apply_glow_result, None, None, seq, key="glow")
 
-    def create_glow_background(self, img, w, h, r):
+    @timed("create_glow_background")
+    def create_glow_background(self, img, w, h, r, source=None):
         """Create a blurred ambilight background and blend with pure black based on intensity."""
-        from PIL import ImageFilter, ImageDraw, ImageEnhance
-        
-        # Resize album art to fill the background
-        img_resized = img.resize((w, h), Image.Resampling.LANCZOS)
-       
-        # Apply heavy blur for glow effect
-        blurred = img_resized.filter(ImageFilter.GaussianBlur(radius=50))
-        
-        # Reduce brightness to ensure text readability even at 100%
-        # Cap maximum brightness at 70% of original to prevent washing out text
-        intensity = getattr(self, 'ambilight_intensity', 0.7)
-        max_brightness = 0.7  # Never go above 70% brightness
-        brightness_factor = intensity * max_brightness
-        
-        enhancer = ImageEnhance.Brightness(blurred)
-        dimmed_glow = enhancer.enhance(brightness_factor)
-        
-        # Create base pure black image
-        base = Image.new("RGB", (w, h), "#000000")
-        
-        # Blend dimmed glow with black (this is now redundant but kept for smoothness)
-        blended = Image.blend(base, dimmed_glow, intensity)
-        
-        # Add a subtle darkening overlay in the text area (right 55% of widget)
-        # This creates better contrast for text regardless of intensity
-        overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        text_area_start = int(w * 0.40)  # Start slightly earlier to cover more text area
-        # Create gradient from transparent to dark (increased opacity for readability)
-        for i in range(text_area_start, w):
-            # Gradual increase from 0 to 75% opacity (0 to 190 in 0-255 scale)
-            opacity = int(190 * ((i - text_area_start) / (w - text_area_start)))
-            overlay_draw.rectangle([i, 0, i+1, h], fill=(0, 0, 0, opacity))
-        
-        blended_rgba = blended.convert("RGBA")
-        blended_rgba = Image.alpha_composite(blended_rgba, overlay)
-        
-        # Create rounded mask
-        mask = Image.new("L", (w, h), 0)
-        draw = ImageDraw.Draw(mask)
-        draw.rounded_rectangle([0, 0, w-1, h-1], radius=r, fill=255)
-        
-        # Create final result with rounded corners by compositing over transparent key color
-        result = Image.new("RGBA", (w, h), (0, 0, 0, 255))
-        blended_rgba = blended.convert("RGBA")
-        blended_rgba.putalpha(mask)
-        
-        # Composite the masked glow over the window's transparency key color
-        # This ensures the corners outside the mask become transparent
-        bg_color = getattr(self, 'bg_key', "#000001")
-        if bg_color.startswith('#'):
-             # Parse hex manually if needed, or use Image.new support
-             pass
-             
-        final = Image.new("RGB", (w, h), bg_color)
-        final.paste(blended_rgba, (0, 0), blended_rgba)
-        
-        return final
+        return self.glow_cache.exact(img, w, h, r, getattr(self, 'ambilight_intensity', 0.7), self.bg_key, source=source)
+
+    def slide_label(self, name, out):
+        """Half of fade_text: slide out and hold (pending skip), or back in with the same text."""
+        prop_dy = name + "_dy"
+        set_dy = lambda v: setattr(self, prop_dy, v)
+        if out:
+            self.timeline.animate(("fade", name), getattr(self, prop_dy, 0), -10, 0.1, set_dy, easing=ease_in_quad)
+        else:
+            self.timeline.animate(("fade", name), 10, 0, 0.1, set_dy, easing=ease_out_cubic)
 
-    def fade_text(self, item_id, new_text):
+    def fade_text(self, name, new_text):
         """Pure vertical scroll transition without color flicker."""
         if not hasattr(self, 'fade_targets'): self.fade_targets = {}
         
         # If we are already animating to this exact text, DO NOT restart the animation
         # (This prevents flickering during rapid updates)
-        if self.fade_targets.get(item_id) == new_text:
+        if self.fade_targets.get(name) == new_text:
             return
             
-        current_text = self.canvas.itemcget(item_id, "text")
-        if current_text == new_text: 
+        if self.label_text[name] == new_text: 
             return
         
         # New target text
-        self.fade_targets[item_id] = new_text
+        self.fade_targets[name] = new_text
         
-        if not hasattr(self, 'fade_jobs'): self.fade_jobs = {}
-        prop_dy = "title_dy" if item_id == self.title_id else "artist_dy"
+        prop_dy = name + "_dy"
+        key = ("fade", name)
+        set_dy = lambda v: setattr(self, prop_dy, v)
         
-        if item_id in self.fade_jobs:
-            self.after_cancel(self.fade_jobs[item_id])
-            
-        steps = 8
-        delay = 12 # Total ~200ms transition
+        def swap_text():
+            # Swaps text and shadow together (or re-bakes the sprite)
+            self.set_label(name, new_text)
+            # Slide IN (Up from bottom)
+            self.timeline.animate(key, 10, 0, 0.1, set_dy, easing=ease_out_cubic)
         
-        def animate(step, phase):
-            t = step / steps
-            
-            if phase == 0:
-                # Slide OUT (Up)
-                setattr(self, prop_dy, -(10 * t))
-                if step < steps:
-                    self.fade_jobs[item_id] = self.after(delay, lambda: animate(step + 1, 0))
-                else:
-                    self.canvas.itemconfig(item_id, text=new_text)
-                    # Sync Shadow Text
-                    shadow_id = self.title_shadow_id if item_id == self.title_id else self.artist_shadow_id
-                    self.canvas.itemconfig(shadow_id, text=new_text)
-                    animate(0, 1)
-            else:
-                # Slide IN (Up from bottom)
-                setattr(self, prop_dy, 10 - (10 * t))
-                if step < steps:
-                    self.fade_jobs[item_id] = self.after(delay, lambda: animate(step + 1, 1))
-                else:
-                    setattr(self, prop_dy, 0)
-                    if item_id in self.fade_jobs: del self.fade_jobs[item_id]
+        # Already slid out by an optimistic skip: swap straight away
+        if getattr(self, prop_dy, 0) <= -10 and not self.timeline.is_animating(key):
+            swap_text()
+            return
+
+        # Slide OUT (Up), ~200ms total transition, restarted from wherever we are
+        self.timeline.animate(key, getattr(self, prop_dy, 0), -10, 0.1, set_dy, easing=ease_in_quad, on_done=swap_text)
 
-        animate(0, 0)
-            
 if __name__ == "__main__":
     # --- Single Instance Check ---
     # Create a named mutex. If it already exists, GetLastError returns 183.